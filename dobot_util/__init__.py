@@ -1 +1,6 @@
-from .api import Dobot, DobotError
+from .api import Dobot, DobotError, FeedbackRing
+from .telemetry import TelemetryHub, TelemetrySample
+from .kinematics import solve_ik_batch, IKBatch, IKFailure
+from .metrics import command_metrics
+from .pool import ManagedDobot, DobotUnavailable
+from .aio import AsyncDobot, BlockingDobot
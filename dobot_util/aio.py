@@ -0,0 +1,517 @@
+import asyncio
+import logging as log
+import socket
+import threading
+import time
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from . import commands
+from .api import Movement
+from .metrics import command_metrics
+from .types import (
+    CommandTiming, DobotError, RobotMode, JointSelection,
+    MOVEMENT_PORT, DASHBOARD_PORT, REALTIME_FEEDBACK_PORT, FeedbackType,
+)
+from .util import DobotSocketConnection
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+class AsyncDobot:
+    """
+    asyncio counterpart of Dobot: the same dashboard / movement / feedback
+    surface (method names, arguments and return values), with every
+    command a coroutine, on asyncio streams instead of blocking sockets.
+
+        robot = await AsyncDobot.connect("192.168.1.6")
+        await robot.dashboard.enable()
+        await robot.movement.joint_mov_j([0, 0, 200, 0])
+        await robot.movement.sync()
+        async for packet in robot.feedback.packets():
+            ...
+
+    Every connection is pipelined by construction: send() writes a command
+    and returns a future for its reply, and one reader task per port
+    resolves replies in wire order, so any number of coroutines can share
+    a port without a lock and without waiting on each other's round trips.
+    Command strings come from commands.py, shared with the blocking Dobot.
+
+    BlockingDobot wraps one of these on a background event loop for code
+    that isn't async.
+    """
+
+    def __init__(self, dashboard: "AsyncDashboard", movement: "AsyncMovement", feedback: "AsyncFeedback"):
+        self.dashboard = dashboard
+        self.movement = movement
+        self.feedback = feedback
+
+    @classmethod
+    async def connect(cls, ip: str) -> "AsyncDobot":
+        """Open all three ports concurrently (greeting drains overlap)."""
+        conns = (AsyncMovement(ip), AsyncFeedback(ip), AsyncDashboard(ip))
+        results = await asyncio.gather(*(c.open() for c in conns), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            for c in conns:
+                await c.close()
+            raise errors[0]
+        movement, feedback, dashboard = conns
+        return cls(dashboard, movement, feedback)
+
+    async def close(self) -> None:
+        for conn in (self.movement, self.feedback, self.dashboard):
+            await conn.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+# ---------------------------------------------------------------------------
+# Connection
+# ---------------------------------------------------------------------------
+
+class AsyncConnection:
+    """
+    One Dobot port over asyncio streams.  Reply framing, parsing and
+    metrics are the same as DobotSocketConnection's (including its
+    greeting drain timings); only the I/O is different.
+    """
+
+    def __init__(self, ip: str, port: int, consume_greeting: bool = True):
+        self.ip = ip
+        self.port = port
+        self.consume_greeting = consume_greeting
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.remote_closed = False
+        self._pending = deque()            # (cmd, future, sent_at) in wire order
+        self._reader_task = None
+
+    async def open(self, timeout: float = 10.0) -> "AsyncConnection":
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.ip, self.port, limit=1 << 20), timeout
+        )
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.consume_greeting:
+            await self._drain_greeting()
+            self._reader_task = asyncio.ensure_future(self._read_replies())
+        log.debug("Async connection established on port %s", self.port)
+        return self
+
+    async def _drain_greeting(self) -> None:
+        wait = DobotSocketConnection.GREETING_TIMEOUT
+        try:
+            while True:
+                chunk = await asyncio.wait_for(self.reader.read(4096), wait)
+                if not chunk:
+                    break
+                wait = DobotSocketConnection.GREETING_IDLE
+        except asyncio.TimeoutError:
+            pass
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    def send(self, cmd: str) -> asyncio.Future:
+        """
+        Write *cmd* now and return a future resolving to its CommandTiming.
+        Not a coroutine: commands hit the wire in the order send() is
+        called, which is what keeps replies matched to their futures.
+        """
+        future = asyncio.get_running_loop().create_future()
+        if self.writer is None or self.writer.is_closing() or self.remote_closed:
+            future.set_exception(ConnectionError(f"Port {self.port} is not connected"))
+            return future
+        self._pending.append((cmd, future, time.perf_counter()))
+        self.writer.write(cmd.encode("utf-8"))
+        log.debug('Sent command (async): "%s"', cmd)
+        return future
+
+    async def send_command(self, cmd: str, timeout: Optional[float] = None) -> Tuple[Optional[DobotError], str]:
+        """(error, return_value), like DobotSocketConnection.send_command."""
+        timing = await asyncio.wait_for(asyncio.shield(self.send(cmd)), timeout)
+        return (timing.error, timing.value)
+
+    async def send_many(self, cmds: List[str], timeout: Optional[float] = None) -> List[CommandTiming]:
+        """Write every command back-to-back, then await all replies."""
+        futures = [self.send(cmd) for cmd in cmds]
+        return list(await asyncio.wait_for(asyncio.gather(*futures), timeout))
+
+    async def _read_replies(self) -> None:
+        try:
+            while True:
+                raw = await self.reader.readuntil(b";")
+                replied_at = time.perf_counter()
+                response = raw.decode("utf-8", errors="replace").strip()
+                if not self._pending:
+                    log.warning('Unsolicited reply dropped: "%s"', response)
+                    continue
+                cmd, future, sent_at = self._pending.popleft()
+                error, value = DobotSocketConnection._parse_response(response)
+                command_metrics.record(cmd, replied_at - sent_at, error)
+                if not future.done():
+                    future.set_result(CommandTiming(cmd, error, value, sent_at, replied_at))
+        except asyncio.IncompleteReadError:
+            self.remote_closed = True
+            self._fail_pending(ConnectionError("Socket closed by remote"))
+        except asyncio.CancelledError:
+            self._fail_pending(ConnectionError("Connection closed"))
+            raise
+        except OSError as exc:
+            self._fail_pending(exc)
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        pending, self._pending = self._pending, deque()
+        for _cmd, future, _sent_at in pending:
+            if not future.done():
+                future.set_exception(exc)
+
+    async def close(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except (asyncio.CancelledError, ConnectionError):
+                pass
+            self._reader_task = None
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _error_only(self, cmd: str) -> Optional[DobotError]:
+        opt_error, _ = await self.send_command(cmd)
+        return opt_error
+
+
+# ---------------------------------------------------------------------------
+# Movement (port 30003)
+# ---------------------------------------------------------------------------
+
+class AsyncMovement(AsyncConnection):
+
+    SAFE_LIMITS = Movement.SAFE_LIMITS
+
+    def __init__(self, ip: str):
+        super().__init__(ip, MOVEMENT_PORT)
+
+    async def set_digital_output_queued(self, index: int, val: int) -> Optional[DobotError]:
+        opt_error = await self._error_only(commands.digital_output(index, val))
+        if opt_error is not None:
+            log.error("Queued DO error DO(%d)=%d: %s", index, val, opt_error)
+        return opt_error
+
+    async def joint_mov_j(self, joints: list) -> Optional[DobotError]:
+        return await self._error_only(commands.joint_mov_j(joints))
+
+    async def joint_mov_j_many(self, joint_list: list) -> List[CommandTiming]:
+        return await self.send_many([commands.joint_mov_j(j) for j in joint_list])
+
+    async def joint_to_joint_move(self, joints: list) -> Optional[DobotError]:
+        return await self.joint_mov_j(joints)
+
+    async def move_joint(self, joints: list) -> Optional[DobotError]:
+        return await self._error_only(commands.mov_j(joints))
+
+    async def move_joint_io(self, x, y, z, rx, ry, rz, io_ports: list) -> Optional[DobotError]:
+        return await self._error_only(commands.mov_j_io(x, y, z, rx, ry, rz, io_ports))
+
+    async def move_linear(self, points: list) -> Optional[DobotError]:
+        return await self._error_only(commands.mov_l(points))
+
+    async def move_linear_io(self, x, y, z, rx, ry, rz, io_ports: list) -> Optional[DobotError]:
+        return await self._error_only(commands.mov_l_io(x, y, z, rx, ry, rz, io_ports))
+
+    async def move_arc(self, x, y, z, rx, ry, rz, x2, y2, z2, rx2, ry2, rz2) -> Optional[DobotError]:
+        return await self._error_only(commands.arc(x, y, z, rx, ry, rz, x2, y2, z2, rx2, ry2, rz2))
+
+    async def relative_move_joint(self, offx, offy, offz, offrx, offry, offrz, user_index: int) -> Optional[DobotError]:
+        return await self._error_only(commands.rel_mov_j_user(offx, offy, offz, offrx, offry, offrz, user_index))
+
+    async def relative_linear_joint(self, offx, offy, offz, offrx, offry, offrz, user_index: int) -> Optional[DobotError]:
+        return await self._error_only(commands.rel_mov_l_user(offx, offy, offz, offrx, offry, offrz, user_index))
+
+    async def relative_joint_motion(self, off1, off2, off3, off4, off5, off6) -> Optional[DobotError]:
+        return await self._error_only(commands.rel_joint_mov_j(off1, off2, off3, off4, off5, off6))
+
+    async def move_jog(self, joint: JointSelection) -> Optional[DobotError]:
+        return await self._error_only(commands.move_jog(joint))
+
+    async def safe_move_jog(self, cmd: str, current_joints: list) -> Optional[DobotError]:
+        """Movement.safe_move_jog: jog, unless that axis is already at its
+        limit in that direction (then stop instead)."""
+        if not cmd or cmd.lower() == "stop":
+            return await self._error_only(commands.move_jog())
+        axis_key  = cmd[:2].upper()
+        direction = cmd[2] if len(cmd) > 2 else "+"
+        axis_idx  = int(axis_key[1]) - 1
+        low, high = self.SAFE_LIMITS.get(axis_key, (-999, 999))
+        if not current_joints or len(current_joints) <= axis_idx:
+            log.warning("Jog skipped — live telemetry not yet available (joints=%s)", current_joints)
+            return None
+        current_val = current_joints[axis_idx]
+        if (direction == "+" and current_val >= high) or (direction == "-" and current_val <= low):
+            log.warning("Safety trigger: %s at %.2f, jog blocked.", axis_key, current_val)
+            await self._error_only(commands.move_jog())
+            return None
+        return await self._error_only(commands.move_jog(cmd))
+
+    async def sync(self) -> Optional[DobotError]:
+        """Resolves once every queued motion command has completed — other
+        coroutines keep running meanwhile."""
+        return await self._error_only(commands.SYNC)
+
+
+# ---------------------------------------------------------------------------
+# Dashboard (port 29999)
+# ---------------------------------------------------------------------------
+
+class AsyncDashboard(AsyncConnection):
+
+    def __init__(self, ip: str):
+        super().__init__(ip, DASHBOARD_PORT)
+
+    # Robot control
+    async def turn_on(self):
+        return await self._error_only(commands.POWER_ON)
+
+    async def enable(self):
+        return await self._error_only(commands.ENABLE_ROBOT)
+
+    async def enable_with_load(self, weight: float = 0.0, cx: float = 0.0, cy: float = 0.0, cz: float = 0.0):
+        return await self._error_only(commands.enable_robot_with_load(weight, cx, cy, cz))
+
+    async def disable(self):
+        return await self._error_only(commands.DISABLE_ROBOT)
+
+    async def reset(self):
+        return await self._error_only(commands.RESET_ROBOT)
+
+    async def emergency_stop(self):
+        return await self._error_only(commands.EMERGENCY_STOP)
+
+    async def clear_error(self):
+        return await self._error_only(commands.CLEAR_ERROR)
+
+    async def pause(self):
+        return await self._error_only(commands.PAUSE)
+
+    async def continue_motion(self):
+        return await self._error_only(commands.CONTINUE)
+
+    # Status queries
+    async def robot_mode(self):
+        opt_error, ret_val = await self.send_command(commands.ROBOT_MODE)
+        if opt_error:
+            return opt_error
+        try:
+            return RobotMode(int(ret_val))
+        except (ValueError, TypeError) as exc:
+            log.error("Could not parse RobotMode response '%s': %s", ret_val, exc)
+            return DobotError.FAIL_TO_GET
+
+    async def get_error_id(self):
+        opt_error, ret_val = await self.send_command(commands.GET_ERROR_ID)
+        log.info("Error IDs: %s", ret_val)
+        return opt_error
+
+    async def get_angle(self):
+        return await self._floats(commands.GET_ANGLE)
+
+    async def get_pose(self, user: int = 0, tool: int = 0):
+        return await self._floats(commands.get_pose(user, tool))
+
+    async def _floats(self, cmd: str):
+        opt_error, ret_val = await self.send_command(cmd)
+        if opt_error:
+            return opt_error
+        try:
+            return [float(v.strip()) for v in ret_val.split(',') if v.strip()]
+        except ValueError:
+            return DobotError.FAIL_TO_GET
+
+    # I/O
+    async def get_digital_input(self, index: int):
+        opt_error, ret_val = await self.send_command(commands.digital_input(index))
+        try:
+            return int(ret_val)
+        except (ValueError, TypeError):
+            return opt_error
+
+    async def set_digital_output(self, index: int, val: int):
+        return await self._error_only(commands.digital_output(index, val))
+
+    # Speed / acceleration settings
+    async def set_linear_accel(self, rate: int):
+        return await self._error_only(commands.acc_l(rate))
+
+    async def set_joint_accel(self, rate: int):
+        return await self._error_only(commands.acc_j(rate))
+
+    async def set_linear_velocity(self, rate: int):
+        return await self._error_only(commands.speed_l(rate))
+
+    async def set_joint_velocity(self, rate: int):
+        return await self._error_only(commands.speed_j(rate))
+
+    async def set_speedfactor(self, ratio: int):
+        return await self._error_only(commands.speed_factor(ratio))
+
+    async def set_arc_params(self, index: int):
+        return await self._error_only(commands.arch(index))
+
+    async def set_continuous_path(self, ratio: int):
+        return await self._error_only(commands.cp(ratio))
+
+    async def set_user(self, index: int):
+        return await self._error_only(commands.user(index))
+
+    async def set_tool(self, index: int):
+        return await self._error_only(commands.tool(index))
+
+    async def set_payload(self, weight: float, inertia: float = 0.0):
+        return await self._error_only(commands.set_payload(weight, inertia))
+
+    # Script control
+    async def run_script(self, name: str):
+        return await self._error_only(commands.run_script(name))
+
+    async def stop_script(self):
+        return await self._error_only(commands.STOP_SCRIPT)
+
+    async def pause_script(self):
+        return await self._error_only(commands.PAUSE_SCRIPT)
+
+    async def continue_script(self):
+        return await self._error_only(commands.CONTINUE_SCRIPT)
+
+
+# ---------------------------------------------------------------------------
+# Feedback (port 30004)
+# ---------------------------------------------------------------------------
+
+class AsyncFeedback(AsyncConnection):
+    """
+    The 1440-byte real-time stream.  get_feedback() awaits one packet;
+    packets() iterates forever; publish_to(hub) feeds a TelemetryHub from
+    the event loop (no ring or pump thread needed).
+    """
+
+    PACKET_SIZE = 1440
+
+    def __init__(self, ip: str):
+        super().__init__(ip, REALTIME_FEEDBACK_PORT, consume_greeting=False)
+
+    async def get_feedback(self, timeout: Optional[float] = 0.5):
+        """One packet as a FeedbackType array, or None on timeout / EOF."""
+        try:
+            data = await asyncio.wait_for(self.reader.readexactly(self.PACKET_SIZE), timeout)
+        except asyncio.TimeoutError:
+            return None
+        except asyncio.IncompleteReadError:
+            self.remote_closed = True
+            return None
+        return np.frombuffer(data, dtype=FeedbackType)
+
+    async def packets(self):
+        """Async iterator over every packet until the stream closes."""
+        while True:
+            try:
+                data = await self.reader.readexactly(self.PACKET_SIZE)
+            except asyncio.IncompleteReadError:
+                self.remote_closed = True
+                return
+            yield np.frombuffer(data, dtype=FeedbackType)
+
+    async def publish_to(self, hub) -> None:
+        """Publish every packet to *hub* (TelemetryHub.publish) as it
+        arrives.  Subscriber callbacks then run on the event loop, so they
+        must be as quick as the hub already requires."""
+        async for record in self.packets():
+            hub.publish(record, time.monotonic())
+
+
+# ---------------------------------------------------------------------------
+# Blocking facade
+# ---------------------------------------------------------------------------
+
+class _BlockingPort:
+    """Calls the wrapped async connection's coroutine methods from any
+    thread, blocking on the result; plain attributes pass straight through."""
+
+    def __init__(self, owner: "BlockingDobot", conn: AsyncConnection):
+        self._owner = owner
+        self._conn = conn
+
+    def __getattr__(self, name):
+        attr = getattr(self._conn, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return self._owner.run(attr(*args, **kwargs))
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+
+class BlockingDobot:
+    """
+    The blocking Dobot surface as a thin wrapper over AsyncDobot: one event
+    loop on a daemon thread owns all three connections, and every method
+    call is submitted to it and waited on.  Blocking callers and coroutines
+    scheduled with submit() share the same connections and the same loop.
+
+        robot = BlockingDobot("192.168.1.6")
+        robot.dashboard.enable()                      # blocks
+        fut = robot.submit(robot.aio.movement.sync()) # concurrent.futures.Future
+
+    dobot_util.Dobot itself still runs on its own DobotSocketConnection
+    stack: ManagedDobot's per-link reconnects and FeedbackRing's recv_into
+    reader are built on those sockets. Both clients send the same
+    commands.py strings; this is the drop-in for code that wants the
+    asyncio transport without going async.
+    """
+
+    def __init__(self, ip: str, connect_timeout: Optional[float] = 30.0):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="dobot-aio-loop", daemon=True)
+        self._thread.start()
+        try:
+            self.aio: AsyncDobot = self.run(AsyncDobot.connect(ip), timeout=connect_timeout)
+        except BaseException:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            raise
+        self.dashboard = _BlockingPort(self, self.aio.dashboard)
+        self.movement = _BlockingPort(self, self.aio.movement)
+        self.feedback = _BlockingPort(self, self.aio.feedback)
+
+    def submit(self, coro):
+        """Schedule *coro* on the loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run *coro* on the loop and block for its result."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BlockingDobot called from its own event loop; await robot.aio instead")
+        return self.submit(coro).result(timeout)
+
+    def close(self) -> None:
+        try:
+            self.run(self.aio.close(), timeout=5.0)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
@@ -1,9 +1,12 @@
 import socket
+import threading
+import time
 import logging as log
-from typing import Optional
-from .util import DobotSocketConnection, Simulator, clamp
+from typing import List, Optional
+from . import commands
+from .util import DobotSocketConnection, Simulator
 from .types import (
-    DobotError, IOPort, RobotMode, JointSelection, URDF,
+    CommandTiming, DobotError, IOPort, RobotMode, JointSelection, URDF,
     MOVEMENT_PORT, DASHBOARD_PORT, REALTIME_FEEDBACK_PORT, FeedbackType,
 )
 
@@ -62,14 +65,7 @@ class Movement(DobotSocketConnection):
     # ------------------------------------------------------------------
 
     def set_digital_output_queued(self, index: int, val: int) -> Optional[DobotError]:
-        index = clamp(index, 1, 20)
-        val   = clamp(val,   0,  1)
-        if index >= 17:
-            tool_index = index - 16
-            cmd = f"ToolDO({tool_index}, {val})"
-        else:
-            cmd = f"DO({index}, {val})"
-        opt_error, _ = self.send_command(cmd)
+        opt_error, _ = self.send_command(commands.digital_output(index, val))
         if opt_error is not None:
             log.error("Queued DO error DO(%d)=%d: %s", index, val, opt_error)
         return opt_error
@@ -80,18 +76,25 @@ class Movement(DobotSocketConnection):
 
     def joint_mov_j(self, joints: list) -> Optional[DobotError]:
         """JointMovJ — move to target joint angles in joint-interpolation mode."""
-        inner = ', '.join(map(str, joints))
-        opt_error, _ = self.send_command(f"JointMovJ({inner})")
+        opt_error, _ = self.send_command(commands.joint_mov_j(joints))
         return opt_error
 
+    def joint_mov_j_many(self, joint_list: list) -> List[CommandTiming]:
+        """
+        Queue one JointMovJ per entry of *joint_list* in a single pipelined
+        burst (see DobotSocketConnection.send_many).  Returns the per-command
+        CommandTiming list; check each .error, since the controller rejects
+        points individually.
+        """
+        return self.send_many([commands.joint_mov_j(j) for j in joint_list])
+
     def joint_to_joint_move(self, joints: list) -> Optional[DobotError]:
         """Alias of joint_mov_j kept for backward compatibility."""
         return self.joint_mov_j(joints)
 
     def move_joint(self, joints: list) -> Optional[DobotError]:
         """MovJ — move to Cartesian target via joint interpolation."""
-        inner = ', '.join(str(j) for j in joints)
-        opt_error, _ = self.send_command(f"MovJ({inner})")
+        opt_error, _ = self.send_command(commands.mov_j(joints))
         return opt_error
 
     def move_joint_io(
@@ -101,11 +104,7 @@ class Movement(DobotSocketConnection):
         io_ports: list,
     ) -> Optional[DobotError]:
         """MovJIO."""
-        cmd = f"MovJIO({x}, {y}, {z}, {rx}, {ry}, {rz}"
-        for p in io_ports:
-            cmd += f",{{{p.mode}, {p.distance}, {p.index}, {p.status}}}"
-        cmd += ")"
-        opt_error, _ = self.send_command(cmd)
+        opt_error, _ = self.send_command(commands.mov_j_io(x, y, z, rx, ry, rz, io_ports))
         return opt_error
 
     # ------------------------------------------------------------------
@@ -114,8 +113,7 @@ class Movement(DobotSocketConnection):
 
     def move_linear(self, points: list) -> Optional[DobotError]:
         """MovL."""
-        inner = ', '.join(str(p) for p in points)
-        opt_error, _ = self.send_command(f"MovL({inner})")
+        opt_error, _ = self.send_command(commands.mov_l(points))
         return opt_error
 
     def move_linear_io(
@@ -125,11 +123,7 @@ class Movement(DobotSocketConnection):
         io_ports: list,
     ) -> Optional[DobotError]:
         """MovLIO."""
-        cmd = f"MovLIO({x}, {y}, {z}, {rx}, {ry}, {rz}"
-        for p in io_ports:
-            cmd += f",{{{p.mode}, {p.distance}, {p.index}, {p.status}}}"
-        cmd += ")"
-        opt_error, _ = self.send_command(cmd)
+        opt_error, _ = self.send_command(commands.mov_l_io(x, y, z, rx, ry, rz, io_ports))
         return opt_error
 
     # ------------------------------------------------------------------
@@ -142,7 +136,7 @@ class Movement(DobotSocketConnection):
         x2: float, y2: float, z2: float, rx2: float, ry2: float, rz2: float,
     ) -> Optional[DobotError]:
         opt_error, _ = self.send_command(
-            f"Arc({x}, {y}, {z}, {rx}, {ry}, {rz}, {x2}, {y2}, {z2}, {rx2}, {ry2}, {rz2})"
+            commands.arc(x, y, z, rx, ry, rz, x2, y2, z2, rx2, ry2, rz2)
         )
         return opt_error
 
@@ -157,9 +151,8 @@ class Movement(DobotSocketConnection):
         user_index: int,
     ) -> Optional[DobotError]:
         """RelMovJUser."""
-        user_index = clamp(user_index, 0, 9)
         opt_error, _ = self.send_command(
-            f"RelMovJUser({offx}, {offy}, {offz}, {offrx}, {offry}, {offrz}, {user_index})"
+            commands.rel_mov_j_user(offx, offy, offz, offrx, offry, offrz, user_index)
         )
         return opt_error
 
@@ -170,9 +163,8 @@ class Movement(DobotSocketConnection):
         user_index: int,
     ) -> Optional[DobotError]:
         """RelMovLUser."""
-        user_index = clamp(user_index, 0, 9)
         opt_error, _ = self.send_command(
-            f"RelMovLUser({offx}, {offy}, {offz}, {offrx}, {offry}, {offrz}, {user_index})"
+            commands.rel_mov_l_user(offx, offy, offz, offrx, offry, offrz, user_index)
         )
         return opt_error
 
@@ -183,7 +175,7 @@ class Movement(DobotSocketConnection):
     ) -> Optional[DobotError]:
         """RelJointMovJ."""
         opt_error, _ = self.send_command(
-            f"RelJointMovJ({off1}, {off2}, {off3}, {off4}, {off5}, {off6})"
+            commands.rel_joint_mov_j(off1, off2, off3, off4, off5, off6)
         )
         return opt_error
 
@@ -193,7 +185,7 @@ class Movement(DobotSocketConnection):
 
     def move_jog(self, joint: JointSelection) -> Optional[DobotError]:
         """MoveJog with a typed JointSelection."""
-        opt_error, _ = self.send_command(f"MoveJog({joint})")
+        opt_error, _ = self.send_command(commands.move_jog(joint))
         return opt_error
 
     def safe_move_jog(self, cmd: str, current_joints: list) -> Optional[DobotError]:
@@ -205,7 +197,7 @@ class Movement(DobotSocketConnection):
         Pass cmd="stop" or cmd="" to send a stop unconditionally.
         """
         if not cmd or cmd.lower() == "stop":
-            opt_error, _ = self.send_command("MoveJog()")
+            opt_error, _ = self.send_command(commands.move_jog())
             return opt_error
 
         # Parse e.g. "J1+" → axis_key="J1", direction="+"
@@ -222,7 +214,7 @@ class Movement(DobotSocketConnection):
                 log.warning(
                     "Safety trigger: %s at %.2f, jog blocked.", axis_key, current_val
                 )
-                self.send_command("MoveJog()")   # force stop
+                self.send_command(commands.move_jog())   # force stop
                 return None
         else:
             log.warning(
@@ -231,7 +223,7 @@ class Movement(DobotSocketConnection):
             )
             return None
 
-        opt_error, _ = self.send_command(f"MoveJog({cmd})")
+        opt_error, _ = self.send_command(commands.move_jog(cmd))
         return opt_error
 
     # ------------------------------------------------------------------
@@ -244,7 +236,7 @@ class Movement(DobotSocketConnection):
         Essential when you need to guarantee the robot has reached its target
         before firing a claw, reading a sensor, or queuing the next move.
         """
-        opt_error, _ = self.send_command("Sync()")
+        opt_error, _ = self.send_command(commands.SYNC, timeout=None)
         return opt_error
 
 
@@ -262,7 +254,7 @@ class Dashboard(DobotSocketConnection):
     # ------------------------------------------------------------------
 
     def turn_on(self) -> Optional[DobotError]:
-        opt_error, _ = self.send_command("PowerOn()")
+        opt_error, _ = self.send_command(commands.POWER_ON)
         return opt_error
 
     def enable(self) -> Optional[DobotError]:
@@ -273,7 +265,7 @@ class Dashboard(DobotSocketConnection):
         If your application needs to specify the load weight explicitly, call
         enable_with_load() instead.
         """
-        opt_error, _ = self.send_command("EnableRobot()")
+        opt_error, _ = self.send_command(commands.ENABLE_ROBOT)
         return opt_error
 
     def enable_with_load(
@@ -290,20 +282,20 @@ class Dashboard(DobotSocketConnection):
         update — some versions require explicit load parameters.
         """
         opt_error, _ = self.send_command(
-            f"EnableRobot({weight}, {cx}, {cy}, {cz})"
+            commands.enable_robot_with_load(weight, cx, cy, cz)
         )
         return opt_error
 
     def disable(self) -> Optional[DobotError]:
-        opt_error, _ = self.send_command("DisableRobot()")
+        opt_error, _ = self.send_command(commands.DISABLE_ROBOT)
         return opt_error
 
     def reset(self) -> Optional[DobotError]:
-        opt_error, _ = self.send_command("ResetRobot()")
+        opt_error, _ = self.send_command(commands.RESET_ROBOT)
         return opt_error
 
     def emergency_stop(self) -> Optional[DobotError]:
-        opt_error, _ = self.send_command("EmergencyStop()")
+        opt_error, _ = self.send_command(commands.EMERGENCY_STOP)
         return opt_error
 
     def clear_error(self) -> Optional[DobotError]:
@@ -312,16 +304,16 @@ class Dashboard(DobotSocketConnection):
         After clearing, call continue_script() to restart the motion queue
         if it was paused by the alarm.
         """
-        opt_error, _ = self.send_command("ClearError()")
+        opt_error, _ = self.send_command(commands.CLEAR_ERROR)
         return opt_error
 
     def pause(self) -> Optional[DobotError]:
-        opt_error, _ = self.send_command("Pause()")
+        opt_error, _ = self.send_command(commands.PAUSE)
         return opt_error
 
     def continue_motion(self) -> Optional[DobotError]:
         """Continue() — resumes motion paused by Pause()."""
-        opt_error, _ = self.send_command("Continue()")
+        opt_error, _ = self.send_command(commands.CONTINUE)
         return opt_error
 
     # ------------------------------------------------------------------
@@ -339,7 +331,7 @@ class Dashboard(DobotSocketConnection):
             9  = ERROR   (has uncleared alarms)
             10 = PAUSE
         """
-        opt_error, ret_val = self.send_command("RobotMode()")
+        opt_error, ret_val = self.send_command(commands.ROBOT_MODE)
         if opt_error:
             return opt_error
         try:
@@ -349,13 +341,13 @@ class Dashboard(DobotSocketConnection):
             return DobotError.FAIL_TO_GET
 
     def get_error_id(self):
-        opt_error, ret_val = self.send_command("GetErrorID()")
+        opt_error, ret_val = self.send_command(commands.GET_ERROR_ID)
         log.info("Error IDs: %s", ret_val)
         return opt_error
 
     def get_angle(self):
         """GetAngle() — returns joint positions as a list of floats, or DobotError."""
-        opt_error, ret_val = self.send_command("GetAngle()")
+        opt_error, ret_val = self.send_command(commands.GET_ANGLE)
         if opt_error:
             return opt_error
         try:
@@ -365,7 +357,7 @@ class Dashboard(DobotSocketConnection):
 
     def get_pose(self, user: int = 0, tool: int = 0):
         """GetPose() — returns Cartesian pose [X, Y, Z, R], or DobotError."""
-        opt_error, ret_val = self.send_command(f"GetPose(User={user},Tool={tool})")
+        opt_error, ret_val = self.send_command(commands.get_pose(user, tool))
         if opt_error:
             return opt_error
         try:
@@ -378,8 +370,7 @@ class Dashboard(DobotSocketConnection):
     # ------------------------------------------------------------------
 
     def get_digital_input(self, index: int):
-        index = clamp(index, 1, 32)
-        opt_error, ret_val = self.send_command(f"DI({index})")
+        opt_error, ret_val = self.send_command(commands.digital_input(index))
         try:
             return int(ret_val)
         except (ValueError, TypeError):
@@ -398,13 +389,7 @@ class Dashboard(DobotSocketConnection):
         return -1 in states where the robot isn't fully accepting instant IO.
         Keeping DO() here matches the original tested behaviour.
         """
-        index = clamp(index, 1, 20)
-        val   = clamp(val,   0,  1)
-        if index >= 17:
-            tool_index = index - 16
-            opt_error, _ = self.send_command(f"ToolDO({tool_index}, {val})")
-        else:
-            opt_error, _ = self.send_command(f"DO({index}, {val})")
+        opt_error, _ = self.send_command(commands.digital_output(index, val))
         return opt_error
 
     # ------------------------------------------------------------------
@@ -412,52 +397,45 @@ class Dashboard(DobotSocketConnection):
     # ------------------------------------------------------------------
 
     def set_linear_accel(self, rate: int) -> Optional[DobotError]:
-        rate = clamp(rate, 1, 100)
-        opt_error, _ = self.send_command(f"AccL({rate})")
+        opt_error, _ = self.send_command(commands.acc_l(rate))
         return opt_error
 
     def set_joint_accel(self, rate: int) -> Optional[DobotError]:
-        rate = clamp(rate, 1, 100)
-        opt_error, _ = self.send_command(f"AccJ({rate})")
+        opt_error, _ = self.send_command(commands.acc_j(rate))
         return opt_error
 
     def set_linear_velocity(self, rate: int) -> Optional[DobotError]:
-        rate = clamp(rate, 1, 100)
-        opt_error, _ = self.send_command(f"SpeedL({rate})")
+        opt_error, _ = self.send_command(commands.speed_l(rate))
         return opt_error
 
     def set_joint_velocity(self, rate: int) -> Optional[DobotError]:
-        rate = clamp(rate, 1, 100)
-        opt_error, _ = self.send_command(f"SpeedJ({rate})")
+        opt_error, _ = self.send_command(commands.speed_j(rate))
         return opt_error
 
     def set_speedfactor(self, ratio: int) -> Optional[DobotError]:
-        ratio = clamp(ratio, 1, 100)
-        opt_error, _ = self.send_command(f"SpeedFactor({ratio})")
+        opt_error, _ = self.send_command(commands.speed_factor(ratio))
         return opt_error
 
     def set_arc_params(self, index: int) -> Optional[DobotError]:
-        index = clamp(index, 0, 9)
-        opt_error, _ = self.send_command(f"Arch({index})")
+        opt_error, _ = self.send_command(commands.arch(index))
         return opt_error
 
     def set_continuous_path(self, ratio: int) -> Optional[DobotError]:
-        ratio = clamp(ratio, 1, 100)
-        opt_error, _ = self.send_command(f"CP({ratio})")
+        """CP(ratio) — blend ratio between consecutive queued moves. 0 turns
+        blending off (the controller default: stop exactly at each point)."""
+        opt_error, _ = self.send_command(commands.cp(ratio))
         return opt_error
 
     def set_user(self, index: int) -> Optional[DobotError]:
-        index = clamp(index, 0, 9)
-        opt_error, _ = self.send_command(f"User({index})")
+        opt_error, _ = self.send_command(commands.user(index))
         return opt_error
 
     def set_tool(self, index: int) -> Optional[DobotError]:
-        index = clamp(index, 0, 9)
-        opt_error, _ = self.send_command(f"Tool({index})")
+        opt_error, _ = self.send_command(commands.tool(index))
         return opt_error
 
     def set_payload(self, weight: float, inertia: float = 0.0) -> Optional[DobotError]:
-        opt_error, _ = self.send_command(f"SetPayLoad({weight}, {inertia})")
+        opt_error, _ = self.send_command(commands.set_payload(weight, inertia))
         return opt_error
 
     # ------------------------------------------------------------------
@@ -465,19 +443,19 @@ class Dashboard(DobotSocketConnection):
     # ------------------------------------------------------------------
 
     def run_script(self, name: str) -> Optional[DobotError]:
-        opt_error, _ = self.send_command(f"RunScript({name})")
+        opt_error, _ = self.send_command(commands.run_script(name))
         return opt_error
 
     def stop_script(self) -> Optional[DobotError]:
-        opt_error, _ = self.send_command("StopScript()")
+        opt_error, _ = self.send_command(commands.STOP_SCRIPT)
         return opt_error
 
     def pause_script(self) -> Optional[DobotError]:
-        opt_error, _ = self.send_command("PauseScript()")
+        opt_error, _ = self.send_command(commands.PAUSE_SCRIPT)
         return opt_error
 
     def continue_script(self) -> Optional[DobotError]:
-        opt_error, _ = self.send_command("ContinueScript()")
+        opt_error, _ = self.send_command(commands.CONTINUE_SCRIPT)
         return opt_error
 
 
@@ -525,3 +503,205 @@ class Feedback(DobotSocketConnection):
 
 
 
+
+
+class FeedbackRing:
+    """
+    Allocation-free reader for the 30004 stream.
+
+    Packets are recv_into()'d straight into a preallocated FeedbackType
+    array holding the last *seconds* of telemetry (1250 packets for the
+    default 10 s at 8 ms), so the steady-state read loop never builds a
+    bytes object.  latest() and window()/since() return numpy *views* into
+    that memory — no copy — so any number of consumers can share the same
+    history.
+
+    Every packet is written twice, at slot i and at slot i + capacity.
+    That mirror costs one 1440-byte memcpy per packet but means the last k
+    packets are always one contiguous slice, however the ring has wrapped,
+    so a time window is a plain view rather than a concatenation.
+
+    Views stay valid until the ring laps them (capacity packets later);
+    .copy() anything that has to outlive that.
+    """
+
+    def __init__(self, feedback: Feedback, seconds: float = 10.0, period: float = 0.008):
+        self.feedback = feedback
+        self.capacity = max(2, int(round(seconds / period)))
+        self._records = np.zeros(2 * self.capacity, dtype=FeedbackType)
+        self._bytes = self._records.view(np.uint8)
+        self._arrival = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._len_field = self._records['len']
+        self._packet = Feedback.PACKET_SIZE
+        self._fill = 0        # bytes of the in-progress packet already received
+        self._count = 0       # complete packets received so far
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    # ------------------------------------------------------------------
+    # Reader
+    # ------------------------------------------------------------------
+
+    def read_next(self) -> bool:
+        """
+        Receive into the next slot until one full packet has arrived.
+        Returns True when a packet was completed, False on timeout (the
+        partial packet is kept and resumed on the next call, so the
+        1440-byte boundary is never lost).
+        """
+        slot = self._count % self.capacity
+        start = slot * self._packet
+        view = memoryview(self._bytes[start:start + self._packet])
+        try:
+            while self._fill < self._packet:
+                n = self.feedback.socket.recv_into(view[self._fill:])
+                if n == 0:
+                    raise ConnectionError("Feedback socket closed by remote")
+                self._fill += n
+        except socket.timeout:
+            return False
+
+        mirror = start + self.capacity * self._packet
+        self._bytes[mirror:mirror + self._packet] = self._bytes[start:start + self._packet]
+        now = time.monotonic()
+        self._arrival[slot] = now
+        self._arrival[slot + self.capacity] = now
+        self._fill = 0
+
+        if self._len_field[slot] != self._packet:
+            log.warning("Feedback packet length field is %d, expected %d",
+                        self._len_field[slot], self._packet)
+
+        with self._cond:
+            self._count += 1
+            self._cond.notify_all()
+        return True
+
+    def start(self) -> "FeedbackRing":
+        """Run read_next() on a daemon thread.  Returns self for chaining."""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="dobot-feedback-ring", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._running = False
+
+    def rebind(self, feedback: Feedback) -> None:
+        """
+        Continue the same ring (same history, count and consumers) from a
+        new Feedback connection — used after a reconnect.  Stops the
+        reader, drops any half-received packet from the old socket, and
+        restarts the reader if it had been running.
+        """
+        was_running = self._thread is not None
+        self._running = False
+        thread = self._thread
+        try:
+            self.feedback.close()      # wakes a reader blocked in recv_into
+        except Exception:
+            pass
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2.0)
+        self._thread = None
+        self.feedback = feedback
+        self._fill = 0
+        if was_running:
+            self.start()
+
+    @property
+    def last_arrival(self) -> Optional[float]:
+        """time.monotonic() of the newest packet, or None before the first."""
+        count = self._count
+        if count == 0:
+            return None
+        return float(self._arrival[(count - 1) % self.capacity])
+
+    def _run(self) -> None:
+        while self._running:
+            try:
+                self.read_next()
+            except Exception as exc:
+                if self._running:
+                    log.warning("Feedback ring read error: %s", exc)
+                self._running = False
+        if self._thread is threading.current_thread():
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Consumers
+    # ------------------------------------------------------------------
+
+    @property
+    def count(self) -> int:
+        """Total packets received since the ring was created."""
+        return self._count
+
+    def wait_for_packet(self, after: int, timeout: Optional[float] = None) -> int:
+        """
+        Block until count > *after* (or *timeout* passes) and return the
+        current count.  Lets consumers wake per packet instead of polling.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._count > after, timeout=timeout)
+            return self._count
+
+    def latest(self):
+        """
+        View of the newest complete packet as a 1-element FeedbackType
+        array (same shape get_feedback() returns), or None before the first
+        packet.
+        """
+        n = self._count
+        if n == 0:
+            return None
+        slot = (n - 1) % self.capacity
+        return self._records[slot:slot + 1]
+
+    def window(self, packets: int):
+        """View of the last *packets* packets, oldest first."""
+        records, _ = self._window(packets, self._count)
+        return records
+
+    def since(self, seconds: float):
+        """View of every packet that arrived within the last *seconds*."""
+        records, arrival = self._window(self.capacity - 1, self._count)
+        first = int(np.searchsorted(arrival, time.monotonic() - seconds, side="left"))
+        return records[first:]
+
+    def at(self, timestamp: float):
+        """
+        View of the newest packet that had arrived by *timestamp* (a host
+        time.monotonic() value) as a 1-element FeedbackType array, or None
+        if every packet still held arrived after it.
+        """
+        records, arrival = self._window(self.capacity - 1, self._count)
+        i = int(np.searchsorted(arrival, timestamp, side="right")) - 1
+        if i < 0:
+            return None
+        return records[i:i + 1]
+
+    def arrival_times(self, packets: int):
+        """Host time.monotonic() arrival stamps matching window(packets)."""
+        _, arrival = self._window(packets, self._count)
+        return arrival
+
+    def packets_after(self, after: int):
+        """
+        (records, arrival_times, count) for every packet received after
+        packet number *after*, read against a single snapshot of count so
+        the views line up exactly even while new packets keep arriving.
+        At most capacity - 1 packets are returned if the caller fell behind.
+        """
+        n = self._count
+        records, arrival = self._window(n - after, n)
+        return records, arrival, n
+
+    def _window(self, packets: int, n: int):
+        # The slot currently being filled is the oldest one in a full ring,
+        # so at most capacity - 1 packets are ever exposed.
+        k = max(0, min(int(packets), n, self.capacity - 1))
+        end = (n - 1) % self.capacity + self.capacity + 1 if n else 0
+        return self._records[end - k:end], self._arrival[end - k:end]
@@ -0,0 +1,158 @@
+"""
+Command strings for the Dashboard (29999) and Movement (30003) ports.
+
+The one place the wire format lives: api.py (blocking sockets) and aio.py
+(asyncio streams) both build every command here, so the two clients can
+only differ in how they send it, never in what they send.  Arguments are
+clamped to the ranges the controller accepts, as before.
+"""
+
+from .util import clamp
+
+
+# ---------------------------------------------------------------------------
+# Movement (port 30003)
+# ---------------------------------------------------------------------------
+
+def _args(values) -> str:
+    return ', '.join(str(v) for v in values)
+
+
+def joint_mov_j(joints: list) -> str:
+    return f"JointMovJ({_args(joints)})"
+
+
+def mov_j(joints: list) -> str:
+    return f"MovJ({_args(joints)})"
+
+
+def mov_l(points: list) -> str:
+    return f"MovL({_args(points)})"
+
+
+def _io_move(name: str, x, y, z, rx, ry, rz, io_ports: list) -> str:
+    cmd = f"{name}({x}, {y}, {z}, {rx}, {ry}, {rz}"
+    for p in io_ports:
+        cmd += f",{{{p.mode}, {p.distance}, {p.index}, {p.status}}}"
+    return cmd + ")"
+
+
+def mov_j_io(x, y, z, rx, ry, rz, io_ports: list) -> str:
+    return _io_move("MovJIO", x, y, z, rx, ry, rz, io_ports)
+
+
+def mov_l_io(x, y, z, rx, ry, rz, io_ports: list) -> str:
+    return _io_move("MovLIO", x, y, z, rx, ry, rz, io_ports)
+
+
+def arc(x, y, z, rx, ry, rz, x2, y2, z2, rx2, ry2, rz2) -> str:
+    return f"Arc({x}, {y}, {z}, {rx}, {ry}, {rz}, {x2}, {y2}, {z2}, {rx2}, {ry2}, {rz2})"
+
+
+def rel_mov_j_user(offx, offy, offz, offrx, offry, offrz, user_index: int) -> str:
+    return f"RelMovJUser({offx}, {offy}, {offz}, {offrx}, {offry}, {offrz}, {clamp(user_index, 0, 9)})"
+
+
+def rel_mov_l_user(offx, offy, offz, offrx, offry, offrz, user_index: int) -> str:
+    return f"RelMovLUser({offx}, {offy}, {offz}, {offrx}, {offry}, {offrz}, {clamp(user_index, 0, 9)})"
+
+
+def rel_joint_mov_j(off1, off2, off3, off4, off5, off6) -> str:
+    return f"RelJointMovJ({off1}, {off2}, {off3}, {off4}, {off5}, {off6})"
+
+
+def move_jog(joint="") -> str:
+    """MoveJog(J1+) etc.; no argument = stop jogging."""
+    return f"MoveJog({joint})"
+
+
+SYNC = "Sync()"
+
+
+# ---------------------------------------------------------------------------
+# Shared (both ports accept the queued DO commands)
+# ---------------------------------------------------------------------------
+
+def digital_output(index: int, val: int) -> str:
+    """DO(index, val), or ToolDO(index - 16, val) for indices 17-20."""
+    index = clamp(index, 1, 20)
+    val   = clamp(val,   0,  1)
+    if index >= 17:
+        return f"ToolDO({index - 16}, {val})"
+    return f"DO({index}, {val})"
+
+
+# ---------------------------------------------------------------------------
+# Dashboard (port 29999)
+# ---------------------------------------------------------------------------
+
+POWER_ON        = "PowerOn()"
+ENABLE_ROBOT    = "EnableRobot()"
+DISABLE_ROBOT   = "DisableRobot()"
+RESET_ROBOT     = "ResetRobot()"
+EMERGENCY_STOP  = "EmergencyStop()"
+CLEAR_ERROR     = "ClearError()"
+PAUSE           = "Pause()"
+CONTINUE        = "Continue()"
+ROBOT_MODE      = "RobotMode()"
+GET_ERROR_ID    = "GetErrorID()"
+GET_ANGLE       = "GetAngle()"
+STOP_SCRIPT     = "StopScript()"
+PAUSE_SCRIPT    = "PauseScript()"
+CONTINUE_SCRIPT = "ContinueScript()"
+
+
+def enable_robot_with_load(weight: float = 0.0, cx: float = 0.0, cy: float = 0.0, cz: float = 0.0) -> str:
+    return f"EnableRobot({weight}, {cx}, {cy}, {cz})"
+
+
+def get_pose(user: int = 0, tool: int = 0) -> str:
+    return f"GetPose(User={user},Tool={tool})"
+
+
+def digital_input(index: int) -> str:
+    return f"DI({clamp(index, 1, 32)})"
+
+
+def acc_l(rate: int) -> str:
+    return f"AccL({clamp(rate, 1, 100)})"
+
+
+def acc_j(rate: int) -> str:
+    return f"AccJ({clamp(rate, 1, 100)})"
+
+
+def speed_l(rate: int) -> str:
+    return f"SpeedL({clamp(rate, 1, 100)})"
+
+
+def speed_j(rate: int) -> str:
+    return f"SpeedJ({clamp(rate, 1, 100)})"
+
+
+def speed_factor(ratio: int) -> str:
+    return f"SpeedFactor({clamp(ratio, 1, 100)})"
+
+
+def arch(index: int) -> str:
+    return f"Arch({clamp(index, 0, 9)})"
+
+
+def cp(ratio: int) -> str:
+    return f"CP({clamp(ratio, 0, 100)})"
+
+
+def user(index: int) -> str:
+    return f"User({clamp(index, 0, 9)})"
+
+
+def tool(index: int) -> str:
+    return f"Tool({clamp(index, 0, 9)})"
+
+
+def set_payload(weight: float, inertia: float = 0.0) -> str:
+    return f"SetPayLoad({weight}, {inertia})"
+
+
+def run_script(name: str) -> str:
+    return f"RunScript({name})"
@@ -0,0 +1,145 @@
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+import numpy as np
+
+
+# Dobot M1 Pro geometry and joint limits (main.Ikinematics solves its
+# single points through solve_ik_batch, so these are the only copy).
+L1 = 200.0  # Length of first arm segment
+L2 = 200.0  # Length of second arm segment
+
+J1_MIN, J1_MAX = -85.0, 85.0
+J2_MIN, J2_MAX = -135.0, 135.0
+Z_MIN, Z_MAX = 5.0, 245.0
+
+
+class IKFailure(IntEnum):
+    """Why solve_ik_batch() rejected a point. Checked in the same order the
+    original scalar main.Ikinematics raised, so a point gets the reason it
+    always got."""
+    OK               = 0
+    COORDINATE_CHECK = 1   # non-strict mode only: X/Y outside the joint-limit box
+    OUT_OF_REACH     = 2
+    NO_ELBOW         = 3   # strict mode only: neither elbow solution within limits
+    J1_LIMIT         = 4
+    J2_LIMIT         = 5
+    Z_RANGE          = 6
+
+
+@dataclass
+class IKBatch:
+    """
+    Result of solve_ik_batch() for N points.
+
+    joints - (N, 4) float64 [j1, j2, z, r]; NaN on rows that failed
+    valid  - (N,) bool
+    reason - (N,) uint8 IKFailure codes (IKFailure.OK where valid)
+    """
+    joints: np.ndarray
+    valid:  np.ndarray
+    reason: np.ndarray
+    # Unmasked angles, kept only so message() can quote them.
+    raw_j1: np.ndarray = field(default=None, repr=False)
+    raw_j2: np.ndarray = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.valid)
+
+    @property
+    def all_valid(self) -> bool:
+        return bool(self.valid.all())
+
+    def first_invalid(self) -> int:
+        """Index of the first rejected point, or -1 if every point solved."""
+        bad = np.flatnonzero(~self.valid)
+        return int(bad[0]) if len(bad) else -1
+
+    def message(self, i: int, points=None) -> str:
+        """Human-readable reason for row *i*, worded like Ikinematics'
+        ValueErrors. *points* (the array passed in) adds the coordinates."""
+        code = IKFailure(int(self.reason[i]))
+        where = ""
+        if points is not None:
+            p = np.asarray(points, dtype=np.float64)[i]
+            where = f" ({p[0]:g}, {p[1]:g})"
+        if code == IKFailure.OK:
+            return "OK"
+        if code == IKFailure.COORDINATE_CHECK:
+            return f"Target{where} blocked by X/Y coordinate check (reverted mode)"
+        if code == IKFailure.OUT_OF_REACH:
+            return f"Target{where} position out of reach"
+        if code == IKFailure.NO_ELBOW:
+            return f"No valid joint configurations within limits for{where}"
+        if code == IKFailure.J1_LIMIT:
+            return f"J1 angle ({self.raw_j1[i]:.1f}°) exceeds hardware limit"
+        if code == IKFailure.J2_LIMIT:
+            return f"J2 angle ({self.raw_j2[i]:.1f}°) exceeds hardware limit"
+        return f"Z height{where} out of range"
+
+
+def solve_ik_batch(points, strict: bool = True, z: float = 200.0, r: float = 0.0) -> IKBatch:
+    """
+    Vectorised inverse kinematics for many (x, y[, z, r]) targets at once.
+
+    points is an (N, 2) array of robot-frame x, y (z and r then come from
+    the keyword defaults) or (N, 4) of x, y, z, r. strict mirrors
+    main.STRICT_JOINT_CHECKING: True tries the flipped elbow for every
+    point whose primary solution is outside the joint limits; False applies
+    the old X/Y coordinate box instead. Never raises for an unreachable
+    point — check .valid / .reason — so validating a 10k-point path is a
+    handful of array ops rather than 10k Python calls and exceptions.
+    """
+    pts = np.asarray(points, dtype=np.float64)
+    if pts.ndim == 1:
+        pts = pts.reshape(1, -1)
+    if pts.ndim != 2 or pts.shape[1] not in (2, 4):
+        raise ValueError(f"points must be (N, 2) or (N, 4), got {pts.shape}")
+    n = len(pts)
+    x, y = pts[:, 0], pts[:, 1]
+    if pts.shape[1] == 4:
+        zs, rs = pts[:, 2], pts[:, 3]
+    else:
+        zs, rs = np.full(n, float(z)), np.full(n, float(r))
+
+    reason = np.zeros(n, dtype=np.uint8)
+
+    def fail(mask, code):
+        # Only the first failing check is recorded, like the scalar raise.
+        reason[(reason == IKFailure.OK) & mask] = code
+
+    if not strict:
+        fail(~((J1_MIN <= x) & (x <= J1_MAX) & (J2_MIN <= y) & (y <= J2_MAX)), IKFailure.COORDINATE_CHECK)
+
+    D = (x * x + y * y - L1 ** 2 - L2 ** 2) / (2 * L1 * L2)
+    fail(np.abs(D) > 1, IKFailure.OUT_OF_REACH)
+    D = np.clip(D, -1.0, 1.0)
+    s = np.sqrt(1.0 - D * D)
+    base = np.arctan2(y, x)
+
+    theta2 = np.arctan2(s, D)
+    theta1 = base - np.arctan2(L2 * np.sin(theta2), L1 + L2 * np.cos(theta2))
+    j1, j2 = np.degrees(theta1), np.degrees(theta2)
+
+    def in_limits(a1, a2):
+        return (J1_MIN <= a1) & (a1 <= J1_MAX) & (J2_MIN <= a2) & (a2 <= J2_MAX)
+
+    if strict:
+        flip = ~in_limits(j1, j2)
+        if flip.any():
+            theta2_alt = np.arctan2(-s, D)
+            theta1_alt = base - np.arctan2(L2 * np.sin(theta2_alt), L1 + L2 * np.cos(theta2_alt))
+            j1_alt, j2_alt = np.degrees(theta1_alt), np.degrees(theta2_alt)
+            use_alt = flip & in_limits(j1_alt, j2_alt)
+            j1 = np.where(use_alt, j1_alt, j1)
+            j2 = np.where(use_alt, j2_alt, j2)
+            fail(flip & ~use_alt, IKFailure.NO_ELBOW)
+
+    fail(~((J1_MIN <= j1) & (j1 <= J1_MAX)), IKFailure.J1_LIMIT)
+    fail(~((J2_MIN <= j2) & (j2 <= J2_MAX)), IKFailure.J2_LIMIT)
+    fail(~((Z_MIN <= zs) & (zs <= Z_MAX)), IKFailure.Z_RANGE)
+
+    valid = reason == IKFailure.OK
+    joints = np.column_stack((j1, j2, zs, rs))
+    joints[~valid] = np.nan
+    return IKBatch(joints=joints, valid=valid, reason=reason, raw_j1=j1, raw_j2=j2)
@@ -0,0 +1,284 @@
+import csv
+import json
+import os
+import threading
+import time
+import logging as log
+from typing import Dict, Optional
+
+
+# Histogram layout (HDR-style log-linear buckets over integer microseconds):
+# values below 2*_SUB are exact; above that each power of two is split into
+# _SUB equal buckets, so any recorded value is within 1/_SUB (~3%) of its
+# bucket's bounds, from 1 us up to far past any sane command latency.
+_SUB_BITS = 5
+_SUB = 1 << _SUB_BITS                 # 32 sub-buckets per octave
+_LINEAR = 2 * _SUB                    # 0..63 us recorded exactly
+_OCTAVES = 32
+_BUCKETS = _LINEAR + _OCTAVES * _SUB
+
+
+def _bucket_index(us: int) -> int:
+    if us < _LINEAR:
+        return max(us, 0)
+    shift = us.bit_length() - (_SUB_BITS + 1)
+    return min(_LINEAR + (shift - 1) * _SUB + (us >> shift) - _SUB, _BUCKETS - 1)
+
+
+def _bucket_upper(index: int) -> int:
+    """Highest value (us) that lands in bucket *index*."""
+    if index < _LINEAR:
+        return index
+    shift = (index - _LINEAR) // _SUB + 1
+    sub = (index - _LINEAR) % _SUB + _SUB
+    return ((sub + 1) << shift) - 1
+
+
+def command_name(cmd: str) -> str:
+    """'JointMovJ(1, 2, 3, 4)' -> 'JointMovJ'"""
+    return cmd.split("(", 1)[0].strip() or cmd.strip()
+
+
+class LatencyHistogram:
+    """
+    Counts of latencies in log-linear buckets (see _bucket_index), plus
+    count/sum/min/max. record() is a couple of integer ops and a list
+    increment — no allocation, no lock; merge() combines histograms.
+    """
+
+    __slots__ = ("buckets", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self):
+        self.buckets = [0] * _BUCKETS
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def record(self, us: int) -> None:
+        self.buckets[_bucket_index(us)] += 1
+        self.count += 1
+        self.total_us += us
+        if self.min_us is None or us < self.min_us:
+            self.min_us = us
+        if us > self.max_us:
+            self.max_us = us
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if not other.count:
+            return
+        mine = self.buckets
+        for i, n in enumerate(other.buckets):
+            if n:
+                mine[i] += n
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency (ms) at or below which *pct* percent of samples fall —
+        reported as the bucket's upper bound, i.e. never understated."""
+        if not self.count:
+            return None
+        rank = max(1, int(round(pct / 100.0 * self.count)))
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_upper(i), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def summary(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": self.total_us / self.count / 1000.0,
+            "min_ms": self.min_us / 1000.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "p999_ms": self.percentile(99.9),
+            "max_ms": self.max_us / 1000.0,
+        }
+
+
+class _CommandStats:
+    __slots__ = ("histogram", "errors")
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors: Dict[str, int] = {}
+
+
+def _merge_into(merged: Dict[str, _CommandStats], shard: Dict[str, _CommandStats]) -> None:
+    for name, stats in list(shard.items()):
+        into = merged.get(name)
+        if into is None:
+            into = merged[name] = _CommandStats()
+        into.histogram.merge(stats.histogram)
+        for code, n in list(stats.errors.items()):
+            into.errors[code] = into.errors.get(code, 0) + n
+
+
+class CommandMetrics:
+    """
+    Per-command round-trip latency histograms and error counts for every
+    command sent through DobotSocketConnection (blocking or pipelined).
+
+    Each thread records into its own shard, so the hot path takes no lock
+    and never contends with another sender or with a reader; snapshot()
+    merges the shards on demand. A snapshot taken while a command is
+    being recorded may miss that one sample — fine for monitoring.
+    Shards of threads that have exited are folded into one retained base
+    (whenever a thread registers a shard or the shards are merged), so
+    main.py's thread-per-action style keeps the shard list as short as
+    the number of live senders.
+
+        from dobot_util.metrics import command_metrics
+        command_metrics.snapshot()            # {"JointMovJ": {...}, ...}
+        command_metrics.dump("cmds.json")     # or .csv
+        command_metrics.start_periodic_dump("cmds.csv", interval=60)
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self._local = threading.local()
+        self._shards = []                  # (thread, shard) per live sender
+        self._base: Dict[str, _CommandStats] = {}   # folded shards of exited threads
+        self._shards_lock = threading.Lock()
+        self._generation = 0
+        self._dump_thread = None
+        self._dump_stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None or self._local.generation != self._generation:
+            shard = {}
+            self._local.shard = shard
+            self._local.generation = self._generation
+            with self._shards_lock:
+                self._fold_dead()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _fold_dead(self) -> None:
+        # caller holds _shards_lock; an exited thread never writes again
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                _merge_into(self._base, shard)
+        self._shards = live
+
+    def record(self, cmd: str, latency_s: float, error=None) -> None:
+        """Record one reply for *cmd* (a full command string or a bare
+        name). *error* is the DobotError (or None for success)."""
+        if not self.enabled:
+            return
+        name = command_name(cmd)
+        shard = self._shard()
+        stats = shard.get(name)
+        if stats is None:
+            stats = shard[name] = _CommandStats()
+        stats.histogram.record(int(latency_s * 1_000_000))
+        if error is not None:
+            key = getattr(error, "name", str(error))
+            stats.errors[key] = stats.errors.get(key, 0) + 1
+
+    def reset(self) -> None:
+        """Start counting from zero. Threads pick up a fresh shard on their
+        next record()."""
+        with self._shards_lock:
+            self._generation += 1
+            self._shards = []
+            self._base = {}
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def merged(self) -> Dict[str, _CommandStats]:
+        merged: Dict[str, _CommandStats] = {}
+        with self._shards_lock:
+            self._fold_dead()
+            _merge_into(merged, self._base)
+            shards = [shard for _thread, shard in self._shards]
+        for shard in shards:
+            _merge_into(merged, shard)
+        return merged
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        stats = self.merged().get(name)
+        return stats.histogram if stats is not None else LatencyHistogram()
+
+    def snapshot(self) -> Dict[str, dict]:
+        """{command name: {count, mean/min/p50/p90/p99/p999/max ms,
+        total_ms, errors: {code name: count}}}, busiest command first."""
+        out = {}
+        for name, stats in self.merged().items():
+            summary = stats.histogram.summary()
+            summary["total_ms"] = stats.histogram.total_us / 1000.0
+            summary["errors"] = dict(stats.errors)
+            out[name] = summary
+        return dict(sorted(out.items(), key=lambda kv: -kv[1]["total_ms"]))
+
+    # ------------------------------------------------------------------
+    # Dumping
+    # ------------------------------------------------------------------
+
+    _CSV_FIELDS = ("timestamp", "command", "count", "errors", "total_ms", "mean_ms",
+                   "min_ms", "p50_ms", "p90_ms", "p99_ms", "p999_ms", "max_ms")
+
+    def dump(self, path: str) -> None:
+        """Write the current snapshot to *path* — JSON (overwritten) if it
+        ends in .json, otherwise appended as CSV rows (one per command,
+        all sharing one timestamp) so periodic dumps build a time series."""
+        snap = self.snapshot()
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+        if path.lower().endswith(".json"):
+            tmp = path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({"timestamp": stamp, "commands": snap}, f, indent=2)
+            os.replace(tmp, path)
+            return
+        new_file = not os.path.exists(path)
+        with open(path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self._CSV_FIELDS, extrasaction="ignore")
+            if new_file:
+                writer.writeheader()
+            for name, row in snap.items():
+                writer.writerow({**row, "timestamp": stamp, "command": name,
+                                 "errors": sum(row["errors"].values())})
+
+    def start_periodic_dump(self, path: str, interval: float = 60.0) -> None:
+        """dump(path) every *interval* seconds on a daemon thread."""
+        self.stop_periodic_dump()
+        self._dump_stop.clear()
+
+        def loop():
+            while not self._dump_stop.wait(interval):
+                try:
+                    self.dump(path)
+                except OSError as e:
+                    log.warning("Command metrics dump to %s failed: %s", path, e)
+
+        self._dump_thread = threading.Thread(target=loop, name="dobot-metrics-dump", daemon=True)
+        self._dump_thread.start()
+
+    def stop_periodic_dump(self) -> None:
+        if self._dump_thread is not None:
+            self._dump_stop.set()
+            self._dump_thread.join(timeout=5.0)
+            self._dump_thread = None
+
+
+# The process-wide instance every DobotSocketConnection records into.
+command_metrics = CommandMetrics()
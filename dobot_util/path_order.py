@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+# Nominal full-speed joint rates used to turn joint deltas into seconds:
+# [J1 deg/s, J2 deg/s, J3(Z) mm/s, J4 deg/s] (the same figures the
+# simulated controller integrates at).  Only the *relative* rates matter
+# for choosing an order; the absolute ones only scale the reported times.
+DEFAULT_JOINT_SPEED = (120.0, 120.0, 200.0, 240.0)
+
+
+def travel_time_matrix(joints, joint_speed: Sequence[float] = DEFAULT_JOINT_SPEED) -> np.ndarray:
+    """
+    (n, n) estimated seconds between every pair of joint targets.
+
+    JointMovJ moves all joints together and they arrive together, so a
+    move takes as long as its slowest joint: max over axes of
+    |delta| / speed (a speed-weighted Chebyshev distance).
+    """
+    q = np.asarray(joints, dtype=np.float64).reshape(len(joints), -1)
+    speed = np.asarray(joint_speed, dtype=np.float64)[:q.shape[1]]
+    return (np.abs(q[:, None, :] - q[None, :, :]) / speed).max(axis=2)
+
+
+def route_time(order: Sequence[int], matrix: np.ndarray) -> float:
+    order = np.asarray(order, dtype=np.int64)
+    if len(order) < 2:
+        return 0.0
+    return float(matrix[order[:-1], order[1:]].sum())
+
+
+def _nearest_neighbour(start: int, nodes: List[int], matrix: np.ndarray) -> List[int]:
+    path, current = [], start
+    remaining = np.array(nodes, dtype=np.int64)
+    while len(remaining):
+        k = int(np.argmin(matrix[current, remaining]))
+        current = int(remaining[k])
+        path.append(current)
+        remaining = np.delete(remaining, k)
+    return path
+
+
+def _two_opt(path: List[int], matrix: np.ndarray, fixed_end: Optional[int], max_passes: int) -> List[int]:
+    """
+    2-opt on path[1:] (path[0] is the fixed start), optionally followed by
+    a fixed end node.  Each step scans every segment reversal starting at
+    position i in one vectorised expression and applies the best one.
+    """
+    route = np.array(path + ([fixed_end] if fixed_end is not None else []), dtype=np.int64)
+    last = len(route) - (2 if fixed_end is not None else 1)   # last movable position
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, last):
+            a, b = route[i - 1], route[i]
+            j = np.arange(i + 1, last + 1)
+            c = route[j]
+            after = np.minimum(j + 1, len(route) - 1)
+            has_next = (j + 1) < len(route)
+            d = route[after]
+            # Reversing route[i..j] swaps edges (a,b) + (c,d) for (a,c) + (b,d).
+            delta = (matrix[a, c] - matrix[a, b]
+                     + np.where(has_next, matrix[b, d] - matrix[c, d], 0.0))
+            k = int(np.argmin(delta))
+            if delta[k] < -1e-9:
+                route[i:j[k] + 1] = route[i:j[k] + 1][::-1].copy()
+                improved = True
+        if not improved:
+            break
+    return route[:len(path)].tolist()
+
+
+@dataclass
+class PathOrder:
+    order: List[int]             # new position -> original index
+    before_s: float              # estimated travel time in the original order
+    after_s: float               # ... and in the new one
+
+    @property
+    def saved_s(self) -> float:
+        return self.before_s - self.after_s
+
+    @property
+    def changed(self) -> bool:
+        return self.order != sorted(self.order)
+
+
+def optimize_order(
+    joints,
+    claws: Optional[Sequence[int]] = None,
+    joint_speed: Sequence[float] = DEFAULT_JOINT_SPEED,
+    max_passes: int = 50,
+) -> PathOrder:
+    """
+    Reorder joint targets to cut total estimated travel time, keeping the
+    claw sequence intact.
+
+    *claws* (one state per point) splits the points into runs of equal
+    claw state.  The first point of every run is where the claw actually
+    fires (the pick or the place), so it stays put, as does the order of
+    the runs; the rest of each run is free to move within the run.  Each
+    run's free points are ordered by nearest neighbour from the run's
+    first point, then improved with 2-opt, with the next run's first point
+    as the fixed end.  With no *claws*, only point 0 is fixed.
+    """
+    n = len(joints)
+    if n < 3:
+        order = list(range(n))
+        matrix = travel_time_matrix(joints, joint_speed) if n else np.zeros((0, 0))
+        t = route_time(order, matrix)
+        return PathOrder(order, t, t)
+
+    matrix = travel_time_matrix(joints, joint_speed)
+    claws = list(claws) if claws is not None else [0] * n
+    anchors = [i for i in range(n) if i == 0 or claws[i] != claws[i - 1]]
+
+    order = []
+    for r, start in enumerate(anchors):
+        stop = anchors[r + 1] if r + 1 < len(anchors) else n
+        free = list(range(start + 1, stop))
+        fixed_end = anchors[r + 1] if r + 1 < len(anchors) else None
+        path = [start] + _nearest_neighbour(start, free, matrix)
+        if len(free) >= 2:
+            path = _two_opt(path, matrix, fixed_end, max_passes)
+        order.extend(path)
+
+    before = route_time(range(n), matrix)
+    after = route_time(order, matrix)
+    if after >= before:
+        order, after = list(range(n)), before
+    return PathOrder(order, before, after)
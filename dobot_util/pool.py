@@ -0,0 +1,341 @@
+import logging as log
+import threading
+import time
+from typing import Callable, Optional
+
+from .api import Dashboard, Feedback, FeedbackRing, Movement
+from .types import RobotMode, URDF
+
+
+# Link states, as passed to on_state_change and exposed as ManagedDobot.state.
+CONNECTING = "connecting"
+UP = "up"
+DOWN = "down"
+CLOSED = "closed"
+
+# Outage policies for commands issued while the link is down.
+HOLD = "hold"    # block until the link is back (up to hold_timeout)
+FAIL = "fail"    # raise DobotUnavailable immediately
+
+
+class DobotUnavailable(ConnectionError):
+    """
+    A command couldn't be sent because the controller link is down — raised
+    straight away under the "fail" policy, after hold_timeout under "hold",
+    or when the link drops while the command is in flight (in which case it
+    may or may not have reached the controller, so it is never retried).
+    """
+
+
+def default_handshake(dashboard: Dashboard, enable_timeout: float = 5.0) -> None:
+    """
+    The boot sequence every (re)connect replays: clear alarms, clear any
+    pause state, enable the motors — then poll RobotMode() until the
+    controller actually reports ENABLE instead of sleeping a flat 3 s.
+    Gives up waiting (with a warning) after *enable_timeout*.
+    """
+    dashboard.clear_error()
+    dashboard.continue_motion()
+    dashboard.enable()
+    mode = None
+    deadline = time.monotonic() + enable_timeout
+    while time.monotonic() < deadline:
+        mode = dashboard.robot_mode()
+        if mode in (RobotMode.ENABLE, RobotMode.RUNNING):
+            return
+        time.sleep(0.1)
+    log.warning("Robot still not enabled %.1fs after EnableRobot() (mode: %s)", enable_timeout, mode)
+
+
+class _LinkProxy:
+    """
+    Stands in for ManagedDobot.dashboard / .movement.  Method calls are
+    routed to whichever connection is current when the call is made
+    (waiting out or failing fast on an outage, per the owner's policy);
+    plain attributes are read from the current connection as-is.
+    """
+
+    def __init__(self, owner: "ManagedDobot", role: str):
+        self._owner = owner
+        self._role = role
+
+    def __getattr__(self, name):
+        attr = getattr(self._owner._links[self._role], name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            generation, links = self._owner._acquire(f"{self._role}.{name}")
+            conn = links[self._role]
+            try:
+                result = getattr(conn, name)(*args, **kwargs)
+            except OSError as exc:
+                self._owner._link_lost(generation, f"{self._role}.{name} failed: {exc}")
+                raise DobotUnavailable(f"{self._role} link dropped during {name}(): {exc}") from exc
+            if conn.remote_closed:
+                # The reply (if any) was parsed from a dead socket - don't
+                # hand the caller a value like -1 as if it were real.
+                self._owner._link_lost(generation, f"{self._role} socket closed by controller")
+                raise DobotUnavailable(f"{self._role} link closed by the controller during {name}()")
+            return result
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+    def __repr__(self):
+        return f"<{self._role} link of {self._owner!r}>"
+
+
+class ManagedDobot:
+    """
+    Drop-in for Dobot (same .dashboard / .movement / .feedback attributes)
+    that survives the controller link dropping mid-session.
+
+    The feedback stream is the health probe: the controller sends a packet
+    every 8 ms, so more than *silence_timeout* without one — or any socket
+    error on a command — means the link is gone.  A monitor thread then
+    closes all three sockets and reconnects in the background with
+    exponential backoff (*backoff_initial* doubling up to *backoff_max*),
+    replays *handshake* (default_handshake: clear error / continue /
+    enable) on the fresh dashboard connection, and marks the link up again.
+
+    .movement is always pipelined (see DobotSocketConnection), so it can
+    be used from several threads at once - e.g. send_async() a stop from a
+    watchdog while the GUI thread is jogging.
+
+    .feedback_ring is one persistent FeedbackRing that is re-pointed at
+    each new feedback socket, so a TelemetryHub attached to it carries on
+    across reconnects without being re-attached.
+
+    Commands issued while the link is down follow *policy*:
+        "hold" - wait for the reconnect, up to *hold_timeout* seconds, then
+                 raise DobotUnavailable
+        "fail" - raise DobotUnavailable immediately
+    A command that was in flight when the link dropped raises
+    DobotUnavailable too and is not replayed — re-sending a move the
+    controller may already have queued is the caller's decision.
+
+    *on_state_change(state, detail)* is called (from a background thread)
+    on every transition between "connecting", "up", "down" and "closed".
+
+    The initial connect happens in the constructor and raises like Dobot()
+    does if the controller can't be reached.
+    """
+
+    def __init__(
+        self,
+        ip: str,
+        urdf_file: Optional[URDF] = None,
+        policy: str = HOLD,
+        hold_timeout: float = 30.0,
+        silence_timeout: float = 1.0,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 10.0,
+        handshake: Optional[Callable[[Dashboard], None]] = default_handshake,
+        on_state_change: Optional[Callable[[str, str], None]] = None,
+        ring_seconds: float = 10.0,
+        logging: bool = False,
+        log_name: str = "output.log",
+        log_level=log.DEBUG,
+    ):
+        if policy not in (HOLD, FAIL):
+            raise ValueError(f"policy must be {HOLD!r} or {FAIL!r}, not {policy!r}")
+        if logging:
+            log.basicConfig(filename=log_name, level=log_level)
+
+        self.ip = ip
+        self.urdf_file = urdf_file
+        self.policy = policy
+        self.hold_timeout = hold_timeout
+        self.silence_timeout = silence_timeout
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.handshake = handshake
+        self.on_state_change = on_state_change
+        self.reconnects = 0
+
+        self.state = CONNECTING
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._closing = False
+        self._generation = 0
+        self._up_since = 0.0
+        self._links = {}
+
+        self.dashboard = _LinkProxy(self, "dashboard")
+        self.movement = _LinkProxy(self, "movement")
+
+        self._connect()
+        self.feedback_ring = FeedbackRing(self._links["feedback"], seconds=ring_seconds).start()
+        self._set_state(UP, "connected")
+
+        self._monitor_thread = threading.Thread(target=self._monitor, name="dobot-link-monitor", daemon=True)
+        self._monitor_thread.start()
+
+    # ------------------------------------------------------------------
+    # Public
+    # ------------------------------------------------------------------
+
+    @property
+    def feedback(self) -> Feedback:
+        """The current raw feedback connection (changes on reconnect)."""
+        return self._links["feedback"]
+
+    @property
+    def connected(self) -> bool:
+        return self.state == UP
+
+    def wait_until_connected(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self.state in (UP, CLOSED), timeout=timeout) and self.state == UP
+
+    def close(self) -> None:
+        with self._cond:
+            self._closing = True
+        self._wake.set()
+        self.feedback_ring.stop()
+        self._close_links(self._links)
+        self._set_state(CLOSED, "closed")
+
+    def __repr__(self):
+        return f"ManagedDobot({self.ip!r}, state={self.state!r})"
+
+    # ------------------------------------------------------------------
+    # Command gating
+    # ------------------------------------------------------------------
+
+    def _acquire(self, what: str):
+        """(generation, links) to send *what* on, per the outage policy."""
+        with self._cond:
+            if self.state != UP and self.policy == HOLD:
+                log.info("Holding %s until the robot link is back", what)
+                self._cond.wait_for(lambda: self.state in (UP, CLOSED), timeout=self.hold_timeout)
+            if self.state != UP:
+                raise DobotUnavailable(f"Robot link is {self.state}; {what} not sent")
+            return self._generation, self._links
+
+    def _link_lost(self, generation: int, reason: str) -> None:
+        """Mark the link down — unless *generation* is already stale, i.e.
+        the failure came from a connection that has since been replaced."""
+        with self._cond:
+            if generation != self._generation or self.state != UP:
+                return
+        self._set_state(DOWN, reason)
+        self._wake.set()
+
+    def _set_state(self, state: str, detail: str) -> None:
+        with self._cond:
+            if self.state == CLOSED or self.state == state:
+                return
+            self.state = state
+            if state == UP:
+                self._up_since = time.monotonic()
+            self._cond.notify_all()
+        (log.warning if state == DOWN else log.info)("Robot link %s: %s", state, detail)
+        if self.on_state_change is not None:
+            try:
+                self.on_state_change(state, detail)
+            except Exception as exc:
+                log.error("on_state_change callback failed: %s", exc)
+
+    # ------------------------------------------------------------------
+    # Connecting
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> None:
+        """Open all three ports in parallel (each pays its own greeting
+        drain), run the handshake, then swap the new links in."""
+        factories = {
+            "dashboard": lambda: Dashboard(self.ip),
+            "movement": lambda: self._open_movement(),
+            "feedback": lambda: Feedback(self.ip),
+        }
+        links, errors = {}, []
+
+        def open_link(role):
+            try:
+                links[role] = factories[role]()
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=open_link, args=(role,), daemon=True) for role in factories]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        try:
+            if errors:
+                raise errors[0]
+            if self.handshake is not None:
+                self.handshake(links["dashboard"])
+        except Exception:
+            self._close_links(links)
+            raise
+
+        with self._cond:
+            old, self._links = self._links, links
+            self._generation += 1
+        self._close_links(old)
+
+    def _open_movement(self) -> Movement:
+        # Pipelined from the start (before any other thread can reach it):
+        # the GUI jogs on it while e.g. the hard-deck watchdog may send a
+        # stop from the telemetry thread, and in pipelined mode every reply
+        # is matched to the command that was written, whichever thread
+        # sent it.
+        movement = Movement(self.ip, self.urdf_file)
+        movement.enable_pipelining()
+        return movement
+
+    @staticmethod
+    def _close_links(links: dict) -> None:
+        for conn in links.values():
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Health monitor
+    # ------------------------------------------------------------------
+
+    def _silence(self) -> float:
+        """Seconds since the last feedback packet (or since the link came
+        up, if no packet has arrived on it yet)."""
+        last = self.feedback_ring.last_arrival or 0.0
+        return time.monotonic() - max(last, self._up_since)
+
+    def _monitor(self) -> None:
+        backoff = self.backoff_initial
+        while not self._closing:
+            if self.state == UP:
+                silent = self._silence()
+                if silent > self.silence_timeout:
+                    with self._cond:
+                        generation = self._generation
+                    self._link_lost(generation, f"no feedback for {silent:.1f}s")
+                    continue
+                self._wake.wait(self.silence_timeout / 4)
+                self._wake.clear()
+                continue
+
+            self._wake.clear()
+            self.feedback_ring.stop()
+            self._close_links(self._links)     # wakes anything blocked on the dead sockets
+            self._set_state(CONNECTING, f"reconnecting to {self.ip}")
+            try:
+                self._connect()
+            except Exception as exc:
+                if self._closing:
+                    return
+                self._set_state(DOWN, f"reconnect failed: {exc}; retrying in {backoff:.1f}s")
+                self._wake.wait(backoff)
+                backoff = min(backoff * 2, self.backoff_max)
+                continue
+            if self._closing:
+                self._close_links(self._links)
+                return
+
+            self.feedback_ring.rebind(self._links["feedback"])
+            self.feedback_ring.start()
+            self.reconnects += 1
+            backoff = self.backoff_initial
+            self._set_state(UP, f"reconnected (#{self.reconnects})")
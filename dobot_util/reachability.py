@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging as log
+import math
+import os
+from typing import Callable, Optional
+
+import numpy as np
+
+from . import kinematics
+
+
+_CACHE_DIR = os.path.join(os.path.dirname(__file__), "reachability_cache")
+
+# Bumped whenever the rasterisation itself changes, so stale caches built
+# by older code are never loaded.
+_FORMAT_VERSION = 1
+
+_TAN_85 = np.tan(np.radians(85))
+_TAN_100 = np.tan(np.radians(100))
+
+
+def workspace_outline(px, py):
+    """
+    The Arm tab's drawn workspace (what main.is_inside used to evaluate
+    per click), vectorised. Works in PLOT coordinates — robot x = py,
+    robot y = -px — on scalars or arrays alike.
+    """
+    px = np.asarray(px, dtype=np.float64)
+    py = np.asarray(py, dtype=np.float64)
+    r_squared = px * px + py * py
+    region1 = (153**2 <= r_squared) & (r_squared <= 400**2) & (np.abs(px) <= _TAN_85 * py)
+    region2 = (((200 - px)**2 + (200 / _TAN_85 - py)**2 <= 200**2)
+               & (py <= -_TAN_100 * (px - 153) + 200 / _TAN_85))
+    region3 = (((200 + px)**2 + (200 / _TAN_85 - py)**2 <= 200**2)
+               & (py <= _TAN_100 * (px + 153) + 200 / _TAN_85))
+    return region1 | region2 | region3
+
+
+class ReachabilityGrid:
+    """
+    A precomputed plot-frame raster of where the arm can go: the workspace
+    outline AND the IK joint limits (same rules as solve_ik_batch, incl.
+    the STRICT_JOINT_CHECKING elbow flip), at *resolution* mm per cell.
+
+    Stored as a packed bitmask (np.packbits — 1 bit per cell, ~100 KB for
+    900 x 900 mm at 1 mm) and cached on disk under reachability_cache/,
+    keyed by a hash of every parameter that shapes it, so it's only
+    rebuilt when a limit, the arm geometry or the resolution changes.
+
+    A cell is marked reachable only if all four of its corners are, so a
+    lookup errs on the side of rejecting points within one cell of the
+    boundary rather than accepting ones just outside it.
+
+    Z isn't rasterised: reachability in X/Y doesn't depend on height on
+    this arm, so the Z range and the hard deck (read fresh from
+    *floor_provider* on every lookup, since it can change at any time)
+    are applied as a plain comparison instead of invalidating the grid.
+    """
+
+    def __init__(self, resolution: float = 1.0, extent: float = 450.0, strict: bool = True,
+                 floor_provider: Optional[Callable[[], Optional[float]]] = None):
+        self.resolution = float(resolution)
+        self.extent = float(extent)
+        self.strict = bool(strict)
+        self.floor_provider = floor_provider
+        self.size = int(np.ceil(2 * self.extent / self.resolution))
+        self.origin = -self.extent
+        self._packed = None
+        self._mask = None
+
+    # ------------------------------------------------------------------
+    # Building / caching
+    # ------------------------------------------------------------------
+
+    def params(self) -> dict:
+        """Everything the raster depends on; its hash is the cache key."""
+        return {
+            "version": _FORMAT_VERSION,
+            "resolution": self.resolution,
+            "extent": self.extent,
+            "strict": self.strict,
+            "L1": kinematics.L1, "L2": kinematics.L2,
+            "J1": [kinematics.J1_MIN, kinematics.J1_MAX],
+            "J2": [kinematics.J2_MIN, kinematics.J2_MAX],
+        }
+
+    def cache_key(self) -> str:
+        blob = json.dumps(self.params(), sort_keys=True).encode()
+        return hashlib.sha1(blob).hexdigest()[:16]
+
+    def _cache_path(self) -> str:
+        return os.path.join(_CACHE_DIR, f"reach_{self.cache_key()}.npz")
+
+    def load_or_build(self) -> "ReachabilityGrid":
+        """Load the cached raster for these parameters, building (and
+        caching) it first if there isn't one. Returns self."""
+        path = self._cache_path()
+        if os.path.exists(path):
+            try:
+                with np.load(path) as data:
+                    packed = data["packed"]
+                if packed.shape == (self.size, (self.size + 7) // 8):
+                    self._packed = packed
+                    return self
+            except (OSError, KeyError, ValueError) as e:
+                log.warning("Ignoring unreadable reachability cache %s: %s", path, e)
+        self.build()
+        try:
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            tmp = path + ".tmp.npz"
+            np.savez_compressed(tmp, packed=self._packed,
+                                params=np.array(json.dumps(self.params())))
+            os.replace(tmp, path)
+        except OSError as e:
+            log.warning("Couldn't cache reachability grid: %s", e)
+        return self
+
+    def build(self) -> "ReachabilityGrid":
+        """Rasterise from scratch (ignores the cache)."""
+        corners = self.origin + self.resolution * np.arange(self.size + 1)
+        PX, PY = np.meshgrid(corners, corners)   # rows = py, cols = px
+        ok = workspace_outline(PX, PY)
+        ik = kinematics.solve_ik_batch(np.column_stack((PY.ravel(), -PX.ravel())), strict=self.strict)
+        ok &= ik.valid.reshape(ok.shape)
+        cells = ok[:-1, :-1] & ok[1:, :-1] & ok[:-1, 1:] & ok[1:, 1:]
+        self._packed = np.packbits(cells, axis=1)
+        self._mask = None
+        return self
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _cell(self, px, py):
+        col = np.floor((np.asarray(px, dtype=np.float64) - self.origin) / self.resolution).astype(np.int64)
+        row = np.floor((np.asarray(py, dtype=np.float64) - self.origin) / self.resolution).astype(np.int64)
+        return row, col
+
+    def contains_xy(self, px, py):
+        """Plot-frame X/Y reachability only (no Z check). Scalars or arrays."""
+        if isinstance(px, (int, float)) and isinstance(py, (int, float)):
+            # Plain-Python path for single clicks — numpy's per-call
+            # overhead would dwarf the lookup itself.
+            col = math.floor((px - self.origin) / self.resolution)
+            row = math.floor((py - self.origin) / self.resolution)
+            if not (0 <= row < self.size and 0 <= col < self.size):
+                return False
+            return bool((self._packed[row, col >> 3] >> (7 - (col & 7))) & 1)
+        row, col = self._cell(px, py)
+        inside = (row >= 0) & (row < self.size) & (col >= 0) & (col < self.size)
+        r = np.where(inside, row, 0)
+        c = np.where(inside, col, 0)
+        bits = (self._packed[r, c >> 3] >> (7 - (c & 7))) & 1
+        result = inside & (bits == 1)
+        return bool(result) if result.ndim == 0 else result
+
+    def z_ok(self, z):
+        """Z within the arm's travel and at/above the current hard deck."""
+        floor = self.floor_provider() if self.floor_provider is not None else None
+        if isinstance(z, (int, float)):
+            return (kinematics.Z_MIN <= z <= kinematics.Z_MAX) and (floor is None or z >= floor)
+        z = np.asarray(z, dtype=np.float64)
+        ok = (kinematics.Z_MIN <= z) & (z <= kinematics.Z_MAX)
+        if floor is not None:
+            ok &= z >= floor
+        return bool(ok) if ok.ndim == 0 else ok
+
+    def contains(self, px, py, z=None):
+        """X/Y reachability, plus the Z range/hard deck when *z* is given."""
+        result = self.contains_xy(px, py)
+        if z is None:
+            return result
+        if isinstance(result, bool):
+            return result and self.z_ok(z)
+        return result & self.z_ok(z)
+
+    # ------------------------------------------------------------------
+    # Plotting
+    # ------------------------------------------------------------------
+
+    def mask(self) -> np.ndarray:
+        """Unpacked (size, size) bool raster, rows = plot y. Cached."""
+        if self._mask is None:
+            self._mask = np.unpackbits(self._packed, axis=1, count=self.size).astype(bool)
+        return self._mask
+
+    def cell_centres(self) -> np.ndarray:
+        """Plot coordinate of each row/column centre, for contourf/imshow."""
+        return self.origin + self.resolution * (np.arange(self.size) + 0.5)
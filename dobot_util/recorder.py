@@ -0,0 +1,402 @@
+"""
+Telemetry flight recorder: keeps a rolling on-disk history of selected
+feedback fields, and replays it through a TelemetryHub.
+
+File format (.dtr), all integers little-endian:
+
+    b"DTREC1\\n"  u32 n  n bytes of JSON  {"fields": [[name, dtype, shape], ...],
+                                           "created": epoch seconds, ...}
+    then any number of chunks:
+    b"CHNK"  u32 h  u64 p  h bytes of JSON  {"rows": n, "first": t, "last": t,
+                                             "columns": [[name, nbytes], ...]}
+                           p bytes         the columns' zlib blobs, in order
+
+Each column holds one field for every row of the chunk (plus "arrival",
+the time.monotonic() each packet was received), byte-shuffled before
+compression — byte k of every value stored together — which is what lets
+slowly-changing float64 telemetry compress well.  A crash can only ever
+truncate the last chunk, and readers stop cleanly at a truncated one.
+
+    python -m dobot_util.recorder info telemetry_recordings/telemetry_20260101_120000.dtr
+    python -m dobot_util.recorder export some.dtr out.csv
+"""
+
+import glob
+import json
+import logging as log
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .types import FeedbackType
+
+
+MAGIC = b"DTREC1\n"
+CHUNK_MAGIC = b"CHNK"
+EXTENSION = ".dtr"
+
+# Joints / TCP pose / currents / temperatures / mode and status bits.
+DEFAULT_FIELDS = (
+    "time_stamp", "robot_mode", "digital_input_bits", "digital_output_bits",
+    "q_actual", "qd_actual", "q_target", "tool_vector_actual", "TCP_speed_actual",
+    "i_actual", "i_target", "motor_temperatures", "joint_modes", "speed_scaling",
+    "enable_status", "brake_status", "running_status", "error_status", "jog_status",
+    "pause_cmd_flag", "run_queued_cmd",
+)
+
+
+def _shuffle(column: np.ndarray) -> bytes:
+    raw = np.ascontiguousarray(column).view(np.uint8)
+    itemsize = column.dtype.itemsize
+    return raw.reshape(-1, itemsize).T.tobytes()
+
+
+def _unshuffle(blob: bytes, dtype: np.dtype, rows: int) -> np.ndarray:
+    itemsize = dtype.itemsize
+    raw = np.frombuffer(blob, dtype=np.uint8).reshape(itemsize, rows).T
+    return np.ascontiguousarray(raw).view(dtype).reshape(rows)
+
+
+def _column_dtype(field: str) -> np.dtype:
+    """Storage dtype for one row of *field*: scalar or sub-array as-is."""
+    base, _offset = FeedbackType.fields[field][:2]
+    return np.dtype(base.base) if base.shape == () else np.dtype((base.base, base.shape))
+
+
+class TelemetryRecorder:
+    """
+    Records selected FeedbackType *fields* of every packet published on a
+    TelemetryHub into .dtr files under *directory*.
+
+    The subscriber callback (on the hub's pump thread) does one 1440-byte
+    copy into the current chunk buffer and nothing else.  A full chunk
+    (*chunk_seconds* of packets) is handed to a writer thread through a
+    queue of at most *queue_chunks* chunks; field selection, compression
+    and disk I/O all happen there.  If the disk falls so far behind that
+    the queue is full, the chunk is dropped and counted in chunks_dropped
+    rather than ever blocking the feedback path.
+
+    A new file is started at every *rotate_seconds* boundary (hourly by
+    default), and after each write the oldest .dtr files in *directory*
+    are deleted until the total is under *max_bytes*.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+        chunk_seconds: float = 10.0,
+        rotate_seconds: float = 3600.0,
+        max_bytes: int = 2 * 1024 ** 3,
+        queue_chunks: int = 8,
+        compression_level: int = 6,
+        period: float = 0.008,
+    ):
+        unknown = [f for f in fields if f not in FeedbackType.names]
+        if unknown:
+            raise ValueError(f"Not FeedbackType fields: {unknown}")
+        self.directory = directory
+        self.fields = tuple(fields)
+        self.chunk_rows = max(1, int(round(chunk_seconds / period)))
+        self.rotate_seconds = rotate_seconds
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.period = period
+
+        self.packets_recorded = 0
+        self.chunks_written = 0
+        self.chunks_dropped = 0
+        self.bytes_written = 0
+        self.current_path = None
+
+        self._queue = queue.Queue(maxsize=queue_chunks)
+        self._lock = threading.Lock()
+        self._buf, self._raw, self._arrival, self._rows = self._new_buffer()
+        self._sub = None
+        self._file = None
+        self._file_deadline = 0.0
+        self._writer = threading.Thread(target=self._write_loop, name="telemetry-recorder", daemon=True)
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Recording (hub thread)
+    # ------------------------------------------------------------------
+
+    def attach(self, hub) -> "TelemetryRecorder":
+        """Record every packet *hub* publishes.  Returns self."""
+        self._sub = hub.subscribe(lambda s: self.record(s.record, s.arrival), name="telemetry recorder")
+        return self
+
+    def detach(self) -> None:
+        if self._sub is not None:
+            self._sub.cancel()
+            self._sub = None
+
+    def _new_buffer(self):
+        buf = np.empty(self.chunk_rows, dtype=FeedbackType)
+        # Rows are copied in as raw bytes: a plain 1440-byte memcpy is
+        # about twice as fast as numpy's structured-record assignment.
+        raw = buf.view(np.uint8).reshape(self.chunk_rows, FeedbackType.itemsize)
+        return buf, raw, np.empty(self.chunk_rows, dtype=np.float64), 0
+
+    def record(self, record, arrival: float) -> None:
+        """Append one 1-element FeedbackType record."""
+        with self._lock:
+            i = self._rows
+            self._raw[i] = record.view(np.uint8)
+            self._arrival[i] = arrival
+            self._rows = i + 1
+            self.packets_recorded += 1
+            if self._rows == self.chunk_rows:
+                self._hand_off()
+
+    def _hand_off(self) -> None:
+        """Queue the current buffer for writing and start a new one.
+        Caller holds _lock."""
+        chunk = (self._buf, self._arrival, self._rows)
+        self._buf, self._raw, self._arrival, self._rows = self._new_buffer()
+        try:
+            self._queue.put_nowait(chunk)
+        except queue.Full:
+            self.chunks_dropped += 1
+            log.warning("Telemetry recorder queue full; dropped %d packets", chunk[2])
+
+    def flush(self, timeout: Optional[float] = 10.0) -> None:
+        """Write out the partial chunk and wait for the writer to catch up."""
+        with self._lock:
+            if self._rows:
+                self._hand_off()
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self) -> None:
+        self.detach()
+        self.flush()
+        self._queue.put(None)
+        self._writer.join(timeout=10.0)
+
+    # ------------------------------------------------------------------
+    # Writing (writer thread)
+    # ------------------------------------------------------------------
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if isinstance(item, threading.Event):
+                if self._file is not None:
+                    self._file.flush()
+                item.set()
+                continue
+            try:
+                self._write_chunk(*item)
+                self._enforce_cap()
+            except OSError as e:
+                log.error("Telemetry recorder write failed: %s", e)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        os.makedirs(self.directory, exist_ok=True)
+        now = time.time()
+        self.current_path = os.path.join(
+            self.directory, time.strftime("telemetry_%Y%m%d_%H%M%S", time.localtime(now)) + EXTENSION
+        )
+        self._file_deadline = (now // self.rotate_seconds + 1) * self.rotate_seconds
+        header = json.dumps({
+            "fields": [[f, _column_dtype(f).base.str, list(_column_dtype(f).shape)] for f in self.fields],
+            "created": now,
+            "period": self.period,
+            "shuffle": True,
+        }).encode()
+        self._file = open(self.current_path, "ab")
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def _write_chunk(self, buf, arrival, rows) -> None:
+        if self._file is None or time.time() >= self._file_deadline:
+            self._open_file()
+        blobs, columns = [], []
+        for name in self.fields + ("arrival",):
+            column = arrival[:rows] if name == "arrival" else buf[name][:rows]
+            blob = zlib.compress(_shuffle(column), self.compression_level)
+            blobs.append(blob)
+            columns.append([name, len(blob)])
+        header = json.dumps({
+            "rows": rows, "first": float(arrival[0]), "last": float(arrival[rows - 1]), "columns": columns,
+        }).encode()
+        payload = b"".join(blobs)
+        self._file.write(CHUNK_MAGIC + struct.pack("<IQ", len(header), len(payload)) + header + payload)
+        self._file.flush()
+        self.chunks_written += 1
+        self.bytes_written += 16 + len(header) + len(payload)
+
+    def _enforce_cap(self) -> None:
+        files = sorted(glob.glob(os.path.join(self.directory, "*" + EXTENSION)), key=os.path.getmtime)
+        total = sum(os.path.getsize(p) for p in files)
+        for path in files:
+            if total <= self.max_bytes or path == self.current_path:
+                continue
+            size = os.path.getsize(path)
+            os.remove(path)
+            total -= size
+            log.info("Telemetry recorder removed %s to stay under %d bytes", path, self.max_bytes)
+
+
+# ---------------------------------------------------------------------------
+# Reading / replay
+# ---------------------------------------------------------------------------
+
+class TelemetryRecording:
+    """Read side of a .dtr file: iterate chunks as {field: column} dicts."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a telemetry recording")
+            (n,) = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(n))
+            self._data_start = f.tell()
+        self.fields = [name for name, _dtype, _shape in self.header["fields"]]
+        self._dtypes = {
+            name: np.dtype((np.dtype(dtype), tuple(shape))) if shape else np.dtype(dtype)
+            for name, dtype, shape in self.header["fields"]
+        }
+        self._dtypes["arrival"] = np.dtype(np.float64)
+
+    def chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        with open(self.path, "rb") as f:
+            f.seek(self._data_start)
+            while True:
+                head = f.read(16)
+                if len(head) < 16 or head[:4] != CHUNK_MAGIC:
+                    return
+                h, p = struct.unpack("<IQ", head[4:])
+                meta = f.read(h)
+                payload = f.read(p)
+                if len(meta) < h or len(payload) < p:
+                    log.warning("%s: truncated final chunk ignored", self.path)
+                    return
+                meta = json.loads(meta)
+                rows, out, offset = meta["rows"], {}, 0
+                for name, size in meta["columns"]:
+                    blob = zlib.decompress(payload[offset:offset + size])
+                    offset += size
+                    dtype = self._dtypes[name]
+                    column = _unshuffle(blob, np.dtype(dtype.base), rows * max(1, int(np.prod(dtype.shape))))
+                    out[name] = column.reshape((rows,) + dtype.shape)
+                yield out
+
+    def load(self) -> Dict[str, np.ndarray]:
+        """Every chunk concatenated: {field: array with one row per packet}."""
+        parts: Dict[str, List[np.ndarray]] = {}
+        for chunk in self.chunks():
+            for name, column in chunk.items():
+                parts.setdefault(name, []).append(column)
+        return {name: np.concatenate(cols) for name, cols in parts.items()}
+
+    def records(self) -> Iterator[tuple]:
+        """(FeedbackType array, arrival column) per chunk, with the recorded
+        fields filled in and everything else zero."""
+        for chunk in self.chunks():
+            rows = len(chunk["arrival"])
+            records = np.zeros(rows, dtype=FeedbackType)
+            records["len"] = FeedbackType.itemsize
+            for name in self.fields:
+                records[name] = chunk[name]
+            yield records, chunk["arrival"]
+
+
+def replay(paths, hub, speed: Optional[float] = 1.0, stop: Optional[threading.Event] = None) -> int:
+    """
+    Publish the recordings in *paths* (one path or a list, played in
+    order) through *hub*, paced by the recorded arrival times divided by
+    *speed* — 1.0 is real time, 4.0 four times faster, None/0 as fast as
+    possible.  Subscribers see fresh time.monotonic() arrivals, so their
+    rate limits behave as they would live.  Returns packets published;
+    set *stop* to end early.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    published = 0
+    origin = None        # (recorded arrival, wall clock) of the first packet
+    for path in paths:
+        for records, arrivals in TelemetryRecording(path).records():
+            for i in range(len(records)):
+                if stop is not None and stop.is_set():
+                    return published
+                if speed:
+                    if origin is None:
+                        origin = (arrivals[i], time.monotonic())
+                    due = origin[1] + (arrivals[i] - origin[0]) / speed
+                    delay = due - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    elif delay < -1.0:
+                        # A gap in the recording (or a slow subscriber):
+                        # re-anchor rather than burst to catch up.
+                        origin = (arrivals[i], time.monotonic())
+                hub.publish(records[i:i + 1])
+                published += 1
+    return published
+
+
+def _info(path: str) -> None:
+    rec = TelemetryRecording(path)
+    rows = chunks = 0
+    first = last = None
+    for chunk in rec.chunks():
+        chunks += 1
+        rows += len(chunk["arrival"])
+        first = chunk["arrival"][0] if first is None else first
+        last = chunk["arrival"][-1]
+    created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(rec.header["created"]))
+    span = (last - first) if rows else 0.0
+    size = os.path.getsize(path)
+    print(f"{path}\n  created {created}, {chunks} chunks, {rows} packets over {span:.1f} s")
+    print(f"  {size / 1024:.1f} KiB on disk ({size / max(rows, 1):.1f} bytes/packet vs 1440 raw)")
+    print(f"  fields: {', '.join(rec.fields)}")
+
+
+def _export_csv(path: str, out: str) -> None:
+    data = TelemetryRecording(path).load()
+    columns, names = [], []
+    for name, column in data.items():
+        flat = column.reshape(len(column), -1)
+        columns.append(flat)
+        names += [name] if flat.shape[1] == 1 else [f"{name}[{k}]" for k in range(flat.shape[1])]
+    np.savetxt(out, np.hstack([c.astype(np.float64) for c in columns]), delimiter=",",
+               header=",".join(names), comments="", fmt="%.6f")
+    print(f"Wrote {sum(len(c) for c in columns[:1])} rows to {out}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect telemetry flight recordings (.dtr).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_info = sub.add_parser("info", help="summarise one or more recordings")
+    p_info.add_argument("paths", nargs="+")
+    p_export = sub.add_parser("export", help="write a recording out as CSV")
+    p_export.add_argument("path")
+    p_export.add_argument("out")
+    args = parser.parse_args()
+    if args.command == "info":
+        for p in args.paths:
+            _info(p)
+    else:
+        _export_csv(args.path, args.out)
@@ -0,0 +1,559 @@
+import math
+import random
+import socket
+import socketserver
+import threading
+import time
+import logging as log
+from collections import deque
+from typing import Optional, Sequence
+
+import numpy as np
+
+from . import kinematics
+from .types import (
+    DobotError, RobotMode, FeedbackType,
+    MOVEMENT_PORT, DASHBOARD_PORT, REALTIME_FEEDBACK_PORT,
+)
+
+
+# Same limits the real controller enforces on JointMovJ (J3 is Z, in mm).
+_JOINT_LIMITS = (
+    (kinematics.J1_MIN, kinematics.J1_MAX),
+    (kinematics.J2_MIN, kinematics.J2_MAX),
+    (kinematics.Z_MIN, kinematics.Z_MAX),
+    (-358.0, 358.0),
+)
+
+def _split_commands(buf: bytes):
+    """
+    Pull complete "Name(args)" commands off the front of *buf*. The
+    protocol has no command terminator (see DobotSocketConnection.
+    send_command), so a command ends at the ')' that balances its first
+    '('. Returns (commands, unconsumed_bytes).
+    """
+    cmds = []
+    text = buf.decode("utf-8", errors="replace")
+    pos = 0
+    while True:
+        open_at = text.find("(", pos)
+        if open_at < 0:
+            break
+        depth = 0
+        end = -1
+        for i in range(open_at, len(text)):
+            if text[i] == "(":
+                depth += 1
+            elif text[i] == ")":
+                depth -= 1
+                if depth == 0:
+                    end = i
+                    break
+        if end < 0:
+            break
+        cmds.append(text[pos:end + 1].strip(" \t\r\n;"))
+        pos = end + 1
+    return cmds, text[pos:].encode("utf-8")
+
+
+def _parse_args(cmd: str):
+    """'JointMovJ(1, 2, 3, 4)' -> ('JointMovJ', ['1', '2', '3', '4'])"""
+    name, _, rest = cmd.partition("(")
+    inner = rest[:-1] if rest.endswith(")") else rest
+    args = [a.strip() for a in inner.split(",") if a.strip()]
+    return name.strip(), args
+
+
+class SimulatedController:
+    """
+    A local stand-in for the M1 Pro controller, speaking the same TCP
+    protocol on the same three ports, so dobot_util.Dobot (and main.py)
+    can be driven end to end without the arm.
+
+      29999 dashboard - EnableRobot, RobotMode, GetAngle/GetPose, DO/ToolDO,
+                        CP, SpeedFactor, ClearError, ResetRobot, ... replied
+                        to as "ErrorID,{value},Cmd();"
+      30003 movement  - JointMovJ / MovJ / MovL are queued and executed in
+                        order; Sync() replies only once the queue has
+                        drained (blocking that connection, like the real
+                        controller); MoveJog(J1+) ... MoveJog() jogs.
+      30004 feedback  - one real 1440-byte FeedbackType packet per *period*
+                        (8 ms by default) to every connected client.
+
+    Motion is integrated at *joint_speed* ([J1, J2 deg/s, J3 mm/s, J4
+    deg/s], scaled by SpeedFactor) with all joints arriving together, and
+    the packets carry q_actual / qd_actual / q_target / tool_vector_actual
+    / running_status / robot_mode / digital_output_bits to match.
+
+    Fault injection, all off by default:
+      latency, latency_jitter - seconds every reply is held back (like
+                                network delay: pipelined commands overlap it)
+      error_rate              - fraction of commands answered with
+                                COMMAND_ERROR (-10000) and not executed
+      drop_rate               - fraction of feedback packets never sent
+                                (1.0 = a silent, black-holed link)
+      disconnect_clients()    - drop every open connection at once
+
+    Pass port 0 for any port to let the OS pick (read the bound ports back
+    from .ports after start()); Dobot itself always uses the standard
+    ports, so run those when connecting the real client.
+
+    Anything the simulator doesn't implement is answered with
+    COMMAND_ERROR rather than silently accepted.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        dashboard_port: int = DASHBOARD_PORT,
+        movement_port: int = MOVEMENT_PORT,
+        feedback_port: int = REALTIME_FEEDBACK_PORT,
+        joint_speed: Sequence[float] = (120.0, 120.0, 200.0, 240.0),
+        period: float = 0.008,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        start_enabled: bool = False,
+        initial_joints: Sequence[float] = (0.0, 0.0, 200.0, 0.0),
+        greeting: bytes = b"Dobot simulated controller ready\r\n",
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self._requested_ports = {
+            "dashboard": dashboard_port, "movement": movement_port, "feedback": feedback_port,
+        }
+        self.ports = {}
+        self.joint_speed = np.asarray(joint_speed, dtype=np.float64)
+        self.period = period
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.greeting = greeting
+        self._rng = random.Random(seed)
+
+        self._lock = threading.Condition()
+        self.q = np.asarray(initial_joints, dtype=np.float64).copy()
+        self.qd = np.zeros(4)
+        self._target = None
+        self._queue = deque()
+        self._jog = None                 # (axis index, +1/-1) while jogging
+        self.mode = RobotMode.ENABLE if start_enabled else RobotMode.DISABLED
+        self.speed_factor = 100
+        self.cp_ratio = 0
+        self.do_bits = 0
+        self.paused = False
+
+        self.commands_handled = 0
+        self.packets_sent = 0
+        self.packets_dropped = 0
+
+        self._servers = []
+        self._feedback_clients = []
+        self._command_clients = []
+        self._threads = []
+        self._running = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> "SimulatedController":
+        sim = self
+
+        class _CommandHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sim._serve_commands(self.request, self.server.role)
+
+        class _FeedbackHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                sim._serve_feedback(self.request)
+
+        class _Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self._running = True
+        for role, port in self._requested_ports.items():
+            handler = _FeedbackHandler if role == "feedback" else _CommandHandler
+            server = _Server((self.host, port), handler)
+            server.role = role
+            self.ports[role] = server.server_address[1]
+            self._servers.append(server)
+            t = threading.Thread(target=server.serve_forever, name=f"sim-{role}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+        t = threading.Thread(target=self._physics_loop, name="sim-physics", daemon=True)
+        t.start()
+        self._threads.append(t)
+        log.info("Simulated controller listening on %s %s", self.host, self.ports)
+        return self
+
+    def stop(self) -> None:
+        self._running = False
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+        with self._lock:
+            for conn in self._feedback_clients:
+                try:
+                    conn.close()
+                except OSError:
+                    pass
+            self._feedback_clients = []
+            self._lock.notify_all()
+
+    def disconnect_clients(self) -> None:
+        """Drop every client connection on every port (the servers keep
+        listening) — a network blip, as far as the client can tell."""
+        with self._lock:
+            conns = self._feedback_clients + self._command_clients
+            self._feedback_clients = []
+            self._command_clients = []
+        for conn in conns:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+                conn.close()
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Motion
+    # ------------------------------------------------------------------
+
+    @property
+    def busy(self) -> bool:
+        with self._lock:
+            return self._target is not None or bool(self._queue) or self._jog is not None
+
+    def _physics_loop(self) -> None:
+        next_tick = time.perf_counter()
+        while self._running:
+            with self._lock:
+                self._step(self.period)
+                packet = self._build_packet()
+                clients = list(self._feedback_clients)
+            for conn in clients:
+                if self.drop_rate and self._rng.random() < self.drop_rate:
+                    self.packets_dropped += 1
+                    continue
+                try:
+                    conn.sendall(packet)
+                    self.packets_sent += 1
+                except OSError:
+                    with self._lock:
+                        if conn in self._feedback_clients:
+                            self._feedback_clients.remove(conn)
+            next_tick += self.period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()   # fell behind; don't burst to catch up
+
+    def _step(self, dt: float) -> None:
+        """Advance the arm by dt seconds. Caller holds _lock."""
+        speed = self.joint_speed * (self.speed_factor / 100.0)
+        previous = self.q.copy()
+        if self.paused or self.mode in (RobotMode.DISABLED, RobotMode.ERROR):
+            pass
+        elif self._jog is not None:
+            axis, sign = self._jog
+            lo, hi = _JOINT_LIMITS[axis]
+            self.q[axis] = min(hi, max(lo, self.q[axis] + sign * speed[axis] * dt))
+        else:
+            if self._target is None and self._queue:
+                self._target = self._queue.popleft()
+            if self._target is not None:
+                delta = self._target - self.q
+                # Synchronised joint interpolation: the slowest joint sets
+                # the pace and the others are scaled to arrive with it.
+                duration = float(np.max(np.abs(delta) / speed))
+                if duration <= dt:
+                    self.q = self._target.copy()
+                    self._target = None
+                else:
+                    self.q = self.q + delta * (dt / duration)
+        self.qd = (self.q - previous) / dt
+        if self.mode in (RobotMode.ENABLE, RobotMode.RUNNING):
+            self.mode = RobotMode.RUNNING if self._moving() else RobotMode.ENABLE
+        self._lock.notify_all()
+
+    def _moving(self) -> bool:
+        return self._target is not None or bool(self._queue) or self._jog is not None
+
+    def _cartesian(self):
+        j1, j2 = math.radians(self.q[0]), math.radians(self.q[1])
+        x = kinematics.L1 * math.cos(j1) + kinematics.L2 * math.cos(j1 + j2)
+        y = kinematics.L1 * math.sin(j1) + kinematics.L2 * math.sin(j1 + j2)
+        return [x, y, self.q[2], self.q[0] + self.q[1] + self.q[3]]
+
+    def _build_packet(self) -> bytes:
+        rec = np.zeros(1, dtype=FeedbackType)
+        r = rec[0]
+        r['len'] = FeedbackType.itemsize
+        r['robot_mode'] = int(self.mode)
+        r['time_stamp'] = int(time.time() * 1000)
+        r['digital_output_bits'] = self.do_bits
+        r['speed_scaling'] = self.speed_factor
+        r['q_actual'][:4] = self.q
+        r['qd_actual'][:4] = self.qd
+        target = self._target if self._target is not None else self.q
+        r['q_target'][:4] = target
+        r['tool_vector_actual'][:4] = self._cartesian()
+        r['enable_status'] = 0 if self.mode == RobotMode.DISABLED else 1
+        r['running_status'] = 1 if self._moving() else 0
+        r['error_status'] = 1 if self.mode == RobotMode.ERROR else 0
+        r['jog_status'] = 1 if self._jog is not None else 0
+        r['pause_cmd_flag'] = 1 if self.paused else 0
+        r['velocity_ratio'] = self.speed_factor
+        return rec.tobytes()
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    def _serve_feedback(self, conn: socket.socket) -> None:
+        with self._lock:
+            self._feedback_clients.append(conn)
+        # The physics thread does the sending; just hold the connection
+        # open until the client goes away.
+        try:
+            while self._running and conn.recv(1024):
+                pass
+        except OSError:
+            pass
+
+    def _serve_commands(self, conn: socket.socket, role: str) -> None:
+        # Injected latency delays each reply's *delivery*, not the
+        # processing of the next command — i.e. it behaves like network
+        # round-trip time, which pipelined senders can overlap — so
+        # replies go through a per-connection writer that releases each
+        # one at its due time, in order.
+        outbox = deque()
+        outbox_cond = threading.Condition()
+        closed = []
+
+        def writer():
+            while True:
+                with outbox_cond:
+                    outbox_cond.wait_for(lambda: outbox or closed)
+                    if not outbox:
+                        return
+                    due, data = outbox[0]
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                with outbox_cond:
+                    outbox.popleft()
+                try:
+                    conn.sendall(data)
+                except OSError:
+                    return
+
+        writer_thread = threading.Thread(target=writer, name=f"sim-{role}-writer", daemon=True)
+        writer_thread.start()
+        with self._lock:
+            self._command_clients.append(conn)
+        last_due = 0.0
+        try:
+            if self.greeting:
+                conn.sendall(self.greeting)
+            buf = b""
+            while self._running:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    return
+                cmds, buf = _split_commands(buf + chunk)
+                for cmd in cmds:
+                    reply = self._execute(cmd, role)
+                    due = time.perf_counter()
+                    if self.latency or self.latency_jitter:
+                        due += self.latency + self._rng.uniform(0.0, self.latency_jitter)
+                    last_due = max(due, last_due)   # replies never overtake each other
+                    with outbox_cond:
+                        outbox.append((last_due, reply.encode("utf-8")))
+                        outbox_cond.notify()
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                if conn in self._command_clients:
+                    self._command_clients.remove(conn)
+            with outbox_cond:
+                closed.append(True)
+                outbox_cond.notify()
+            writer_thread.join(timeout=1.0)
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    def _execute(self, cmd: str, role: str) -> str:
+        self.commands_handled += 1
+        name, args = _parse_args(cmd)
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return self._reply(DobotError.COMMAND_ERROR, "", cmd)
+        handler = getattr(self, f"_cmd_{name}", None)
+        if handler is None:
+            log.debug("Simulator: unsupported command %r", cmd)
+            return self._reply(DobotError.COMMAND_ERROR, "", cmd)
+        try:
+            error, value = handler(args)
+        except (ValueError, IndexError):
+            error, value = DobotError.PARAMETER_NUM_ERROR, ""
+        return self._reply(error, value, cmd)
+
+    @staticmethod
+    def _reply(error: Optional[DobotError], value: str, cmd: str) -> str:
+        return f"{0 if error is None else int(error)},{{{value}}},{cmd};"
+
+    def _enqueue(self, joints) -> Optional[DobotError]:
+        joints = np.asarray(joints, dtype=np.float64)
+        for value, (lo, hi) in zip(joints, _JOINT_LIMITS):
+            if not lo <= value <= hi:
+                return DobotError.PARAMETER_RANGE_INCORRECT
+        with self._lock:
+            if self.mode not in (RobotMode.ENABLE, RobotMode.RUNNING):
+                return DobotError.COMMAND_ERROR
+            self._queue.append(joints)
+        return None
+
+    # --- movement port -------------------------------------------------
+
+    def _cmd_JointMovJ(self, args):
+        return self._enqueue([float(a) for a in args[:4]]), ""
+
+    def _cmd_MovJ(self, args):
+        x, y, z = (float(a) for a in args[:3])
+        r = float(args[3]) if len(args) > 3 else 0.0
+        ik = kinematics.solve_ik_batch([[x, y, z, r]])
+        if not ik.valid[0]:
+            return DobotError.PARAMETER_RANGE_INCORRECT, ""
+        j1, j2, z, r_tool = ik.joints[0]
+        # The pose's R is the tool angle; J4 is what's left after J1 + J2.
+        return self._enqueue([j1, j2, z, r_tool - j1 - j2]), ""
+
+    # MovL is executed as joint interpolation to the same pose — fine for
+    # timing/throughput work, not a straight-line path check.
+    _cmd_MovL = _cmd_MovJ
+
+    def _cmd_Sync(self, args):
+        with self._lock:
+            self._lock.wait_for(lambda: not self._running or not self._moving())
+        return None, ""
+
+    def _cmd_MoveJog(self, args):
+        with self._lock:
+            if not args:
+                self._jog = None
+                return None, ""
+            axis = args[0].upper()
+            if len(axis) < 3 or not axis.startswith("J") or axis[2] not in "+-":
+                return DobotError.FIRST_PARAM_INCORRECT, ""
+            if self.mode not in (RobotMode.ENABLE, RobotMode.RUNNING):
+                return DobotError.COMMAND_ERROR, ""
+            self._jog = (int(axis[1]) - 1, 1.0 if axis[2] == "+" else -1.0)
+        return None, ""
+
+    # --- dashboard port ------------------------------------------------
+
+    def _cmd_EnableRobot(self, args):
+        with self._lock:
+            if self.mode != RobotMode.ERROR:
+                self.mode = RobotMode.ENABLE
+        return None, ""
+
+    def _cmd_DisableRobot(self, args):
+        with self._lock:
+            self.mode = RobotMode.DISABLED
+            self._queue.clear()
+            self._target = None
+            self._jog = None
+        return None, ""
+
+    def _cmd_ClearError(self, args):
+        with self._lock:
+            if self.mode == RobotMode.ERROR:
+                self.mode = RobotMode.ENABLE
+        return None, ""
+
+    def _cmd_ResetRobot(self, args):
+        with self._lock:
+            self._queue.clear()
+            self._target = None
+            self._jog = None
+        return None, ""
+
+    def _cmd_EmergencyStop(self, args):
+        with self._lock:
+            self._queue.clear()
+            self._target = None
+            self._jog = None
+            self.mode = RobotMode.ERROR
+        return None, ""
+
+    def _cmd_Pause(self, args):
+        self.paused = True
+        return None, ""
+
+    def _cmd_Continue(self, args):
+        self.paused = False
+        return None, ""
+
+    def _cmd_RobotMode(self, args):
+        return None, str(int(self.mode))
+
+    def _cmd_GetErrorID(self, args):
+        return None, "[[],[],[],[],[],[],[]]"
+
+    def _cmd_GetAngle(self, args):
+        with self._lock:
+            return None, ",".join(f"{v:.4f}" for v in list(self.q) + [0.0, 0.0])
+
+    def _cmd_GetPose(self, args):
+        with self._lock:
+            return None, ",".join(f"{v:.4f}" for v in self._cartesian() + [0.0, 0.0])
+
+    def _cmd_DO(self, args):
+        index, value = int(args[0]), int(args[1])
+        with self._lock:
+            if value:
+                self.do_bits |= 1 << (index - 1)
+            else:
+                self.do_bits &= ~(1 << (index - 1))
+        return None, ""
+
+    _cmd_DOExecute = _cmd_DO
+
+    def _cmd_ToolDO(self, args):
+        return self._cmd_DO([int(args[0]) + 16, args[1]])
+
+    def _cmd_DI(self, args):
+        int(args[0])
+        return None, "0"
+
+    def _cmd_SpeedFactor(self, args):
+        self.speed_factor = max(1, min(100, int(args[0])))
+        return None, ""
+
+    def _cmd_CP(self, args):
+        self.cp_ratio = max(0, min(100, int(args[0])))
+        return None, ""
+
+    def _accept(self, args):
+        return None, ""
+
+    _cmd_AccJ = _cmd_AccL = _cmd_SpeedJ = _cmd_SpeedL = _accept
+    _cmd_User = _cmd_Tool = _cmd_SetPayLoad = _cmd_Arch = _cmd_PowerOn = _accept
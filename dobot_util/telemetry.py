@@ -0,0 +1,275 @@
+import threading
+import time
+import logging as log
+from collections import deque
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from .api import FeedbackRing
+
+
+class TelemetrySample:
+    """
+    One feedback packet as handed to subscribers.
+
+    record is a 1-element FeedbackType *view* (into the FeedbackRing when
+    fed from the socket), so building a sample copies nothing; joints and
+    cartesian are converted to plain lists only when first asked for.
+    """
+
+    __slots__ = ("record", "arrival", "seq", "_joints", "_cartesian")
+
+    def __init__(self, record, arrival: float, seq: int):
+        self.record = record
+        self.arrival = arrival
+        self.seq = seq
+        self._joints = None
+        self._cartesian = None
+
+    @property
+    def joints(self) -> list:
+        """[J1, J2, J3(Z), J4] from q_actual."""
+        if self._joints is None:
+            self._joints = self.record[0]['q_actual'][:4].tolist()
+        return self._joints
+
+    @property
+    def cartesian(self) -> list:
+        """[X, Y, Z, R] from tool_vector_actual."""
+        if self._cartesian is None:
+            self._cartesian = self.record[0]['tool_vector_actual'][:4].tolist()
+        return self._cartesian
+
+
+class Subscription:
+    """
+    A consumer registered with TelemetryHub.subscribe().
+
+    Delivery rules, checked per packet:
+      max_rate_hz - at most this many callbacks per second (None = every
+                    packet).
+      deadband    - only deliver when some value in *fields* moved by more
+                    than this since the last delivery (None = always).
+    A change that arrives inside the rate-limit window is not lost: it is
+    delivered on the first packet after the window, even if that packet
+    alone would not pass the deadband.
+    """
+
+    def __init__(
+        self,
+        hub: "TelemetryHub",
+        callback: Callable[[TelemetrySample], None],
+        max_rate_hz: Optional[float] = None,
+        deadband: Optional[float] = None,
+        fields: Sequence[str] = ("q_actual", "tool_vector_actual"),
+        name: str = "",
+    ):
+        self._hub = hub
+        self.callback = callback
+        self.min_interval = 1.0 / max_rate_hz if max_rate_hz else 0.0
+        self.deadband = deadband
+        self.fields = tuple(fields)
+        self.name = name or getattr(callback, "__name__", "subscriber")
+        self.delivered = 0
+        self._last_time = float("-inf")
+        self._last_values = None
+        self._dirty = False
+
+    def cancel(self) -> None:
+        self._hub.unsubscribe(self)
+
+    def _changed(self, record) -> bool:
+        if self.deadband is None:
+            return True
+        if self._last_values is None:
+            return True
+        for field, last in zip(self.fields, self._last_values):
+            if np.max(np.abs(record[0][field] - last)) > self.deadband:
+                return True
+        return False
+
+    def _remember(self, record) -> None:
+        if self.deadband is None:
+            return
+        if self._last_values is None:
+            self._last_values = [np.array(record[0][f], dtype=np.float64) for f in self.fields]
+        else:
+            for field, last in zip(self.fields, self._last_values):
+                np.copyto(last, record[0][field])
+
+    def _offer(self, sample: TelemetrySample) -> None:
+        self._dirty = self._dirty or self._changed(sample.record)
+        if not self._dirty or sample.arrival - self._last_time < self.min_interval:
+            return
+        self._dirty = False
+        self._last_time = sample.arrival
+        self._remember(sample.record)
+        self.delivered += 1
+        try:
+            self.callback(sample)
+        except Exception as exc:
+            log.warning("Telemetry subscriber %s raised: %s", self.name, exc)
+
+
+class TelemetryHub:
+    """
+    Fans the 30004 feedback stream out to any number of consumers, each
+    with its own rate limit / deadband (see Subscription), at the
+    controller's native 8 ms packet rate.
+
+    attach(ring) starts a pump thread that publishes every packet the
+    FeedbackRing receives — including ones that arrived while the pump
+    was busy, so slow callbacks delay delivery rather than drop samples
+    (unless they fall a whole ring's worth, ~10 s, behind).
+    publish() is also public so a recording can be replayed through the
+    same subscribers without a robot attached.
+
+    Callbacks run on the pump thread and must be quick; GUI consumers
+    should hand off to their own thread (e.g. tkinter's root.after).
+    """
+
+    # Samples kept for wait_for_sample(): ~0.5 s of packets, so a waiter
+    # that falls a few packets behind still sees every one of them.
+    RECENT_SAMPLES = 64
+
+    def __init__(self):
+        self._subs = []
+        self._subs_lock = threading.Lock()
+        self._latest = None
+        self._recent = deque(maxlen=self.RECENT_SAMPLES)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._ring = None
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Sources
+    # ------------------------------------------------------------------
+
+    def attach(self, ring: FeedbackRing) -> "TelemetryHub":
+        """Start publishing every packet *ring* receives.  Returns self."""
+        self._ring = ring
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._pump, name="dobot-telemetry-hub", daemon=True)
+            self._thread.start()
+        return self
+
+    def _pump(self) -> None:
+        seen = self._ring.count
+        while True:
+            self._ring.wait_for_packet(seen, timeout=1.0)
+            records, arrivals, count = self._ring.packets_after(seen)
+            if count - seen > len(records):
+                log.warning("Telemetry hub fell %d packets behind; skipped the oldest",
+                            count - seen - len(records))
+            for i in range(len(records)):
+                self.publish(records[i:i + 1], float(arrivals[i]))
+            seen = count
+
+    def publish(self, record, arrival: Optional[float] = None) -> TelemetrySample:
+        """Deliver one 1-element FeedbackType record to every subscriber."""
+        sample = TelemetrySample(record, time.monotonic() if arrival is None else arrival, self._seq + 1)
+        with self._cond:
+            self._seq = sample.seq
+            self._latest = sample
+            self._recent.append(sample)
+            self._cond.notify_all()
+        with self._subs_lock:
+            subs = list(self._subs)
+        for sub in subs:
+            sub._offer(sample)
+        return sample
+
+    # ------------------------------------------------------------------
+    # Consumers
+    # ------------------------------------------------------------------
+
+    def subscribe(
+        self,
+        callback: Callable[[TelemetrySample], None],
+        max_rate_hz: Optional[float] = None,
+        deadband: Optional[float] = None,
+        fields: Sequence[str] = ("q_actual", "tool_vector_actual"),
+        name: str = "",
+    ) -> Subscription:
+        sub = Subscription(self, callback, max_rate_hz, deadband, fields, name)
+        with self._subs_lock:
+            self._subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._subs_lock:
+            if sub in self._subs:
+                self._subs.remove(sub)
+
+    def latest(self) -> Optional[TelemetrySample]:
+        """Newest sample, or None before the first packet."""
+        return self._latest
+
+    def wait_for_sample(self, after_seq: int, timeout: Optional[float] = None) -> Optional[TelemetrySample]:
+        """
+        Block until a sample newer than *after_seq* is published and return
+        the *next* one (seq after_seq + 1) - not the newest - so a caller
+        walking the stream sees every packet. If that one has already
+        dropped out of the last RECENT_SAMPLES, the oldest still held is
+        returned instead; its seq shows the gap.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > after_seq, timeout=timeout)
+            if self._seq <= after_seq:
+                return None
+            oldest = self._recent[0].seq
+            return self._recent[max(0, after_seq + 1 - oldest)]
+
+    def wait_for_arrival(
+        self,
+        target: Sequence[float],
+        tolerance=0.2,
+        velocity_threshold: float = 0.5,
+        timeout: float = 10.0,
+        settle_packets: int = 2,
+    ) -> Optional[TelemetrySample]:
+        """
+        Block until the arm has settled at *target* ([J1, J2, J3(Z), J4],
+        same units as q_actual), judged purely from the feedback stream —
+        so unlike Movement.sync() it doesn't tie up the command socket, and
+        it returns on the packet the arm settles rather than after a fixed
+        padding sleep.
+
+        Settled means, for *settle_packets* consecutive packets:
+          - every q_actual[:4] within *tolerance* of target (a scalar, or
+            one value per joint — degrees for J1/J2/J4, mm for J3)
+          - every |qd_actual[:4]| at or below *velocity_threshold*
+          - running_status == 0 (the controller isn't executing a move)
+
+        Packets are walked one by one (see wait_for_sample); if the waiter
+        falls so far behind that some are no longer held, the streak starts
+        over rather than counting packets that weren't seen.
+
+        Returns the sample that completed the settle, or None if that
+        didn't happen within *timeout* seconds (including when no feedback
+        is arriving at all).
+        """
+        target = np.asarray(target, dtype=np.float64)[:4]
+        tol = np.broadcast_to(np.asarray(tolerance, dtype=np.float64), target.shape)
+        deadline = time.monotonic() + timeout
+        seq = self._seq - 1 if self._latest is not None else self._seq  # judge the newest packet first
+        streak = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            sample = self.wait_for_sample(seq, remaining)
+            if sample is None:
+                return None
+            if sample.seq != seq + 1:
+                streak = 0
+            seq = sample.seq
+            rec = sample.record[0]
+            settled = (np.all(np.abs(rec['q_actual'][:4] - target) <= tol)
+                       and np.all(np.abs(rec['qd_actual'][:4]) <= velocity_threshold)
+                       and rec['running_status'] == 0)
+            streak = streak + 1 if settled else 0
+            if streak >= settle_packets:
+                return sample
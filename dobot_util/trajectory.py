@@ -0,0 +1,180 @@
+import json
+import logging as log
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import List, Sequence, Union
+
+import numpy as np
+
+from . import kinematics
+from .api import Movement
+
+
+# Default simplification tolerance per joint: [J1 deg, J2 deg, J3(Z) mm,
+# J4 deg] — how far the replayed path may stray from the taught one.
+DEFAULT_TOLERANCE = (0.5, 0.5, 1.0, 1.0)
+
+
+def simplify_path(points, tolerance: Union[float, Sequence[float]] = DEFAULT_TOLERANCE) -> List[int]:
+    """
+    Douglas-Peucker in joint space: indices of the points to keep so that
+    every dropped point lies within *tolerance* of the straight joint-space
+    segment between its kept neighbours.
+
+    *tolerance* is per axis (or one value for all); coordinates are divided
+    by it first, so the test is a unit distance in "tolerances" — a
+    degree and a millimetre don't have to be commensurable.  The ends are
+    always kept.  Iterative (no recursion limit), with each split's
+    distances computed in one vectorised pass.
+    """
+    p = np.asarray(points, dtype=np.float64)
+    n = len(p)
+    if n <= 2:
+        return list(range(n))
+    p = p / np.broadcast_to(np.asarray(tolerance, dtype=np.float64), p.shape[1:])
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        seg = p[b] - p[a]
+        rel = p[a + 1:b] - p[a]
+        seg_len2 = float(seg @ seg)
+        if seg_len2 == 0.0:
+            dist2 = (rel * rel).sum(axis=1)
+        else:
+            t = np.clip(rel @ seg / seg_len2, 0.0, 1.0)
+            off = rel - t[:, None] * seg
+            dist2 = (off * off).sum(axis=1)
+        k = int(np.argmax(dist2))
+        if dist2[k] > 1.0:
+            split = a + 1 + k
+            keep[split] = True
+            stack.append((a, split))
+            stack.append((split, b))
+    return np.flatnonzero(keep).tolist()
+
+
+@dataclass
+class Trajectory:
+    """A named, simplified taught path: joint waypoints [J1, J2, J3, J4]."""
+    name: str
+    waypoints: List[List[float]]
+    tolerance: List[float] = field(default_factory=lambda: list(DEFAULT_TOLERANCE))
+    samples: int = 0                 # feedback samples it was simplified from
+    duration_s: float = 0.0          # how long the teaching session took
+    created: str = ""
+
+    def limit_violations(self) -> List[str]:
+        """Waypoints outside the arm's joint limits, as messages."""
+        limits = [(kinematics.J1_MIN, kinematics.J1_MAX), (kinematics.J2_MIN, kinematics.J2_MAX),
+                  (kinematics.Z_MIN, kinematics.Z_MAX), Movement.SAFE_LIMITS["J4"]]
+        problems = []
+        for i, wp in enumerate(self.waypoints):
+            for axis, (value, (lo, hi)) in enumerate(zip(wp, limits)):
+                if not lo <= value <= hi:
+                    problems.append(f"waypoint {i + 1}: J{axis + 1} = {value:.1f} outside [{lo}, {hi}]")
+        return problems
+
+    @staticmethod
+    def file_name(name: str) -> str:
+        return re.sub(r"[^\w\-]+", "_", name.strip()) + ".json"
+
+    def save(self, directory: str, overwrite: bool = False) -> str:
+        """Write to *directory*/file_name(name). Raises FileExistsError if
+        that file exists (another trajectory with this name - or one that
+        maps to the same file name) unless *overwrite*."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self.file_name(self.name))
+        if not overwrite and os.path.exists(path):
+            raise FileExistsError(f"A trajectory is already saved as {os.path.basename(path)}")
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(asdict(self), f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "Trajectory":
+        with open(path) as f:
+            return cls(**json.load(f))
+
+
+def list_trajectories(directory: str) -> List[str]:
+    """Names of the trajectories saved in *directory*, sorted."""
+    if not os.path.isdir(directory):
+        return []
+    names = []
+    for entry in sorted(os.listdir(directory)):
+        if entry.endswith(".json"):
+            try:
+                names.append(Trajectory.load(os.path.join(directory, entry)).name)
+            except (OSError, ValueError, TypeError) as e:
+                log.warning("Skipping unreadable trajectory %s: %s", entry, e)
+    return names
+
+
+class TeachSession:
+    """
+    Samples the arm's joints off a TelemetryHub for as long as it runs —
+    every packet, so nothing between two jogs is missed — and turns the
+    result into a simplified Trajectory.
+
+        session = TeachSession(telemetry_hub).start()
+        ... jog ...
+        trajectory = session.finish("left shelf view")
+    """
+
+    def __init__(self, hub, tolerance: Union[float, Sequence[float]] = DEFAULT_TOLERANCE):
+        self.hub = hub
+        self.tolerance = tolerance
+        self._samples = []
+        self._lock = threading.Lock()
+        self._sub = None
+        self._started = None
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._samples)
+
+    def start(self) -> "TeachSession":
+        self._started = time.monotonic()
+        latest = self.hub.latest()
+        if latest is not None:
+            self._samples.append(latest.joints)
+        self._sub = self.hub.subscribe(self._on_sample, name="teach session")
+        return self
+
+    def _on_sample(self, sample) -> None:
+        with self._lock:
+            self._samples.append(sample.joints)
+
+    def cancel(self) -> None:
+        if self._sub is not None:
+            self._sub.cancel()
+            self._sub = None
+
+    def finish(self, name: str) -> Trajectory:
+        """Stop sampling and simplify.  Raises ValueError if the arm never
+        reported a position."""
+        self.cancel()
+        with self._lock:
+            samples = np.asarray(self._samples, dtype=np.float64)
+        if len(samples) == 0:
+            raise ValueError("No telemetry was received while teaching.")
+        keep = simplify_path(samples[:, :4], self.tolerance)
+        tolerance = np.broadcast_to(np.asarray(self.tolerance, dtype=np.float64), (4,))
+        return Trajectory(
+            name=name,
+            waypoints=np.round(samples[keep, :4], 3).tolist(),
+            tolerance=tolerance.tolist(),
+            samples=len(samples),
+            duration_s=round(time.monotonic() - self._started, 2),
+            created=time.strftime("%Y-%m-%d %H:%M:%S"),
+        )
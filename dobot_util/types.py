@@ -2,6 +2,7 @@ import logging as log
 from enum import IntEnum
 import numpy as np
 from dataclasses import dataclass
+from typing import Optional
 from strenum import StrEnum
 
 
@@ -40,6 +41,21 @@ class IOPort:
         return max(lo, min(val, hi))
 
 
+@dataclass
+class CommandTiming:
+    """One command's reply plus when it went out and when its reply came
+    back (time.perf_counter() seconds), as returned by send_many()."""
+    cmd:        str
+    error:      Optional[DobotError]
+    value:      str
+    sent_at:    float
+    replied_at: float
+
+    @property
+    def latency_ms(self) -> float:
+        return (self.replied_at - self.sent_at) * 1000.0
+
+
 class RobotMode(IntEnum):
     INIT        = 1
     BRAKE_OPEN  = 2
@@ -1,7 +1,12 @@
 import socket
+import threading
+import time
 import logging as log
-from typing import Optional, Tuple
-from .types import DobotError, URDF
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import List, Optional, Tuple
+from .types import CommandTiming, DobotError, URDF
+from .metrics import command_metrics
 
 # Try importing ikpy; if not installed the Simulator class is simply unavailable
 try:
@@ -11,6 +16,17 @@ except ImportError:
     _IKPY_AVAILABLE = False
 
 
+def _command_name(cmd: str) -> str:
+    return cmd.split("(", 1)[0].strip()
+
+
+def _reply_name(response: str) -> str:
+    """Command name a reply echoes ("0,{5},RobotMode();" -> "RobotMode"),
+    or "" if it doesn't echo one."""
+    tail = response.rpartition("},")[2]
+    return _command_name(tail) if "(" in tail else ""
+
+
 class DobotSocketConnection:
     """
     Low-level TCP/IP socket wrapper for a single Dobot port.
@@ -38,9 +54,45 @@ class DobotSocketConnection:
     5. Unknown error IDs no longer raise an unhandled ValueError.  They are
        mapped to DobotError.FAIL_TO_GET and logged so the caller can decide
        what to do.
+
+    6. Bytes received after a reply's ';' are kept in a receive buffer for
+       the next reply instead of being discarded, so back-to-back replies
+       that share one TCP segment are never lost.
+
+    Pipelined mode
+    --------------
+    By default every send_command() waits for its reply before returning,
+    so N commands cost N full round trips.  enable_pipelining() starts a
+    reader thread that resolves replies to futures in the order the
+    commands were written (the controller answers strictly in order on a
+    given port), which lets send_async()/send_many() write many commands
+    back-to-back and collect the replies afterwards.  send_command() keeps
+    its blocking signature in either mode, and still gives up on a reply
+    after REPLY_TIMEOUT (like the socket timeout does unpipelined): the
+    command and every older one still waiting are failed with
+    FAIL_TO_GET, and a late reply naming a different command than the
+    one now waiting (every reply echoes its command) is dropped.
+    Only Sync() opts out with timeout=None.
+
+    Every reply, in either mode, is timed into dobot_util.metrics.
+    command_metrics (per-command latency histogram + error counts).
     """
 
+    GREETING_TIMEOUT = 2.0   # max wait for the greeting to start
+    GREETING_IDLE = 0.15     # silence that ends a greeting already under way
+    REPLY_TIMEOUT = 10.0     # pipelined send_command() wait, same as the socket timeout
+
     def __init__(self, ip: str, port: int, consume_greeting: bool = True):
+        self._rx = b""
+        self._pipelined = False
+        self._pending = deque()            # (cmd, future, sent_at) in wire order
+        self._send_lock = threading.Lock()     # serialises writes (keeps _pending in wire order)
+        self._pending_lock = threading.Lock()  # guards _pending only; never held across I/O
+        self._reader_thread = None
+        self._stale = 0                    # replies still owed to expired commands
+        self._closed = False
+        self.remote_closed = False         # set once a read sees EOF from the controller
+
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.socket.settimeout(10.0)
         self.socket.connect((ip, port))
@@ -49,13 +101,18 @@ class DobotSocketConnection:
             # Drain the entire greeting message.
             # Older firmware sends ~512 bytes; newer firmware can send several
             # kilobytes.  We loop with a short timeout so we always read it all
-            # without blocking permanently if nothing more arrives.
+            # without blocking permanently if nothing more arrives.  The full
+            # GREETING_TIMEOUT only applies until the greeting starts; once
+            # bytes are flowing, GREETING_IDLE of silence means it's over —
+            # so a connect (or reconnect) costs one round trip plus
+            # GREETING_IDLE rather than a flat 2 s.
             try:
-                self.socket.settimeout(2.0)
+                self.socket.settimeout(self.GREETING_TIMEOUT)
                 while True:
                     chunk = self.socket.recv(4096)
                     if not chunk:
                         break  # connection closed unexpectedly
+                    self.socket.settimeout(self.GREETING_IDLE)
             except socket.timeout:
                 pass  # silence after greeting is the expected exit condition
             finally:
@@ -63,18 +120,183 @@ class DobotSocketConnection:
 
         log.debug("Connection established on port %s", port)
 
-    def send_command(self, cmd: str) -> Tuple[Optional[DobotError], str]:
+    def send_command(self, cmd: str, timeout: Optional[float] = REPLY_TIMEOUT) -> Tuple[Optional[DobotError], str]:
         """
         Send *cmd* over the socket and return (error, return_value).
 
         No newline is appended — the Dobot TCP/IP protocol specification does
         not define a command terminator, and adding one causes some firmware
         versions to return -1 for every command.
+
+        *timeout* bounds the wait for a pipelined reply (None = wait
+        forever, for Sync()); unpipelined, the socket timeout applies.
         """
+        if self._pipelined:
+            future = self.send_async(cmd)
+            try:
+                timing = future.result(timeout)
+            except FutureTimeout:
+                self._expire(future, timeout)
+                try:
+                    timing = future.result(0)   # unless the reply won the race
+                except Exception:
+                    return (DobotError.FAIL_TO_GET, "")
+            return (timing.error, timing.value)
         raw_cmd = cmd.encode("utf-8")
+        sent_at = time.perf_counter()
         self.socket.sendall(raw_cmd)
         log.debug('Sent command: "%s"', cmd)
-        return self._await_reply()
+        error, value = self._await_reply()
+        command_metrics.record(cmd, time.perf_counter() - sent_at, error)
+        return (error, value)
+
+    # ------------------------------------------------------------------
+    # Pipelined mode
+    # ------------------------------------------------------------------
+
+    def enable_pipelining(self) -> None:
+        """
+        Switch this connection to pipelined mode.  Idempotent.
+
+        Must not be called while another thread is blocked inside a
+        non-pipelined send_command() on the same connection — the reader
+        thread started here takes over every recv() on the socket.
+        """
+        with self._send_lock:
+            if self._pipelined:
+                return
+            self._pipelined = True
+            self._reader_thread = threading.Thread(
+                target=self._reader_loop, name="dobot-reply-reader", daemon=True
+            )
+            self._reader_thread.start()
+
+    def send_async(self, cmd: str) -> Future:
+        """
+        Write *cmd* immediately and return a Future that resolves to a
+        CommandTiming once its reply arrives.  Enables pipelining on first use.
+        """
+        if not self._pipelined:
+            self.enable_pipelining()
+        future = Future()
+        with self._send_lock:
+            sent_at = time.perf_counter()
+            entry = (cmd, future, sent_at)
+            with self._pending_lock:
+                self._pending.append(entry)
+            # sendall may block while the controller's receive window is
+            # full; the reader only needs _pending_lock to keep draining
+            # replies, so it can't deadlock against this.
+            try:
+                self.socket.sendall(cmd.encode("utf-8"))
+            except OSError as exc:
+                with self._pending_lock:
+                    if entry in self._pending:
+                        self._pending.remove(entry)
+                future.set_exception(exc)
+                return future
+        log.debug('Sent command (pipelined): "%s"', cmd)
+        return future
+
+    def send_many(self, cmds: List[str], timeout: Optional[float] = None) -> List[CommandTiming]:
+        """
+        Write every command in *cmds* back-to-back, then wait for all of
+        their replies.  Returns one CommandTiming per command, in order, with
+        the parsed error/return value and its send -> reply latency.
+
+        *timeout* bounds the wait for the whole batch (None = wait forever,
+        which is what a queue ending in Sync() needs).  On expiry every
+        command still waiting is failed as in send_command() and
+        concurrent.futures.TimeoutError is raised.
+        """
+        futures = [self.send_async(cmd) for cmd in cmds]
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        results = []
+        for future in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            try:
+                results.append(future.result(timeout=remaining))
+            except FutureTimeout:
+                self._expire(futures[-1], timeout)
+                raise
+        return results
+
+    def _expire(self, future: Future, timeout: float) -> None:
+        """
+        Give up on *future* and every command queued before it: their
+        replies have been lost (or are very late), and the controller
+        answers in order, so nothing older can still be in flight
+        usefully.  Each is failed with a TimeoutError and its reply, if it
+        ever arrives, is dropped by the reader.
+        """
+        with self._pending_lock:
+            index = next((i for i, entry in enumerate(self._pending) if entry[1] is future), None)
+            expired = [self._pending.popleft() for _ in range(index + 1)] if index is not None else []
+            self._stale += len(expired)
+        now = time.perf_counter()
+        for cmd, pending, sent_at in expired:
+            log.warning('No reply to "%s" within %.1f s; giving up on it', cmd, timeout)
+            command_metrics.record(cmd, now - sent_at, DobotError.FAIL_TO_GET)
+            if not pending.done():
+                pending.set_exception(FutureTimeout(f'No reply to "{cmd}" within {timeout} s'))
+
+    def _reader_loop(self) -> None:
+        while not self._closed:
+            try:
+                response = self._read_one_response()
+            except socket.timeout:
+                continue
+            except OSError as exc:
+                self._fail_pending(exc)
+                return
+            if response is None:
+                self.remote_closed = True
+                self._fail_pending(ConnectionError("Socket closed by remote"))
+                return
+
+            replied_at = time.perf_counter()
+            with self._pending_lock:
+                entry = self._pending[0] if self._pending else None
+                # A late reply to an expired command: it names a different
+                # command than the one now at the head of the queue.
+                if self._stale and (entry is None or
+                                    _reply_name(response) not in ("", _command_name(entry[0]))):
+                    self._stale -= 1
+                    entry = None
+                elif entry is not None:
+                    self._pending.popleft()
+            if entry is None:
+                log.warning('Unsolicited or late reply dropped: "%s"', response)
+                continue
+            cmd, future, sent_at = entry
+            error, value = self._parse_response(response)
+            command_metrics.record(cmd, replied_at - sent_at, error)
+            future.set_result(CommandTiming(cmd, error, value, sent_at, replied_at))
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        with self._pending_lock:
+            pending, self._pending = list(self._pending), deque()
+        for _cmd, future, _sent_at in pending:
+            if not future.done():
+                future.set_exception(exc)
+
+    # ------------------------------------------------------------------
+    # Reply framing / parsing
+    # ------------------------------------------------------------------
+
+    def _read_one_response(self) -> Optional[str]:
+        """
+        Return the next ';'-terminated reply from the receive buffer,
+        reading more from the socket as needed.  Returns None if the remote
+        closed the connection; lets socket.timeout propagate.
+        """
+        while b";" not in self._rx:
+            chunk = self.socket.recv(4096)
+            if not chunk:
+                return None
+            self._rx += chunk
+        raw, _, self._rx = self._rx.partition(b";")
+        return (raw + b";").decode("utf-8", errors="replace").strip()
 
     def _await_reply(self) -> Tuple[Optional[DobotError], str]:
         """
@@ -89,20 +311,19 @@ class DobotSocketConnection:
             0,{J1,J2,J3,J4},GetAngle();
             -10000,{},Mov(-500,100,200,150);
         """
-        raw = b""
         try:
-            while b";" not in raw:
-                chunk = self.socket.recv(4096)
-                if not chunk:
-                    # Remote closed the connection mid-response
-                    log.warning("Socket closed before response terminator received")
-                    break
-                raw += chunk
+            response = self._read_one_response()
+            if response is None:
+                # Remote closed the connection mid-response
+                log.warning("Socket closed before response terminator received")
+                self.remote_closed = True
+                response = self._rx.decode("utf-8", errors="replace").strip()
+                self._rx = b""
         except socket.timeout:
             log.warning("Timed out waiting for response terminator; parsing what we have")
+            response = self._rx.decode("utf-8", errors="replace").strip()
+            self._rx = b""
 
-        response = raw.decode("utf-8", errors="replace").strip()
-        log.debug('Raw bytes received: %s', raw)
         log.debug('Decoded response:   "%s"', response)
 
         return self._parse_response(response)
@@ -151,8 +372,15 @@ class DobotSocketConnection:
             return (DobotError.FAIL_TO_GET, return_value)
 
     def close(self):
+        self._closed = True
         try:
             if self.socket:
+                # shutdown() first so a thread blocked in recv() on this
+                # socket wakes now rather than at its next timeout.
+                try:
+                    self.socket.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
                 self.socket.close()
         except Exception:
             pass
@@ -14,20 +14,34 @@ from tkinter import messagebox, simpledialog, filedialog
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from dobot_util import Dobot
-
-from vision.config import PHOTO_STATION, NUM_VIEWS, VIEW_SETTLE_SECONDS, LIVE_FEED_FPS
+from dobot_util import Dobot, ManagedDobot, TelemetryHub, solve_ik_batch, command_metrics
+from dobot_util import commands
+from dobot_util.reachability import ReachabilityGrid
+from dobot_util.path_order import optimize_order
+from dobot_util.trajectory import TeachSession, Trajectory, list_trajectories
+from dobot_util.recorder import TelemetryRecorder, replay as replay_telemetry
+
+from vision.config import PHOTO_STATION, NUM_VIEWS, VIEW_SETTLE_SECONDS, LIVE_FEED_FPS, SWEEP_TRIGGER_DEGREES
+from vision.config import LIVE_FEED_MIN_FPS, LIVE_FEED_MAX_SIZE, LIVE_FEED_HIDDEN_POLL_MS
+from vision.config import CAMERA_SKEW_WARN_SECONDS, CAPTURE_GATE_ENABLED, IMAGE_STORE_ENABLED, THUMBNAIL_SIZES
+from vision.config import FRAME_RING_ENABLED
+from vision.camera.capture_gate import CaptureGate
+from vision.camera.frame_ring import frame_recorder
+from vision.services.rotation_engine import RotationEngine
 from vision.camera.capture import (
     capture_station_frame,
     capture_wrist_frame,
     capture_frame,
+    capture_timestamped_frame,
+    capture_all_frames,
+    image_writer,
+    close_image_writer,
     list_configured_cameras,
-    frame_to_rgb,
-    save_image,
+    frame_to_preview_rgb,
     new_sample_id,
     assign_camera,
     remove_camera_assignment,
-    list_camera_indices,
+    camera_discovery,
 )
 import requests
 from vision.config import (
@@ -40,6 +54,8 @@ from vision.messaging.publisher import publish_captured, publish_capture_status
 from vision.messaging.subscriber import subscribe
 from vision.storage import mongo_client, object_catalog, excel_export, attribute_schema, session_manager, query_safety, package_export
 from vision.storage.capture_pipeline import record_capture
+from vision.storage.image_store import get_image_store
+from vision.storage.thumbnails import request_thumbnail, close_thumbnail_service
 from vision.services import rotation_coordinator
 from vision.config import DATA_AUTHORITY_MODE
 
@@ -63,6 +79,7 @@ from vision.services.middleman_other_side import OtherSideController
 from vision.config import MQTT_BROKER_HOST, MQTT_BROKER_PORT
 from laser_control import channel_assignments
 from vision.services import hard_deck
+from vision.services.sweep_engine import SweepEngine, SweepTrigger
 
 from laser_control import RelayController
 try:
@@ -185,26 +202,30 @@ DRAWING_POINTS = np.array([
 ])
 
 
-# --- NEW: Global Robot State ---
-robot_data = {
-    "joints": [0.0, 0.0, 0.0, 0.0],
-    "cartesian": [0.0, 0.0, 0.0, 0.0],
-    
-}
+# --- Live telemetry ---
+# Every consumer of the arm's live pose reads it from telemetry_hub (see
+# dobot_util/telemetry.py), which is fed by the feedback socket at the
+# controller's native 8 ms packet rate once a robot connects. Consumers
+# that need a steady stream subscribe with their own rate limit/deadband
+# (GUI dot at 30 Hz, Middleman telemetry on change, the hard-deck jog
+# watchdog on every packet) instead of each sampling a shared dict
+# whenever they happen to run; one-off readers just call live_joints()/
+# live_cartesian() for the newest sample.
+telemetry_hub = TelemetryHub()
 is_jogging = False
 
-def feedback_loop(robot_inst):
-    """Thread function to constantly read Port 30004."""
-    while True:
-        try:
-            data = robot_inst.feedback.get_feedback()
-            if data is not None:
-                robot_data["joints"]    = data[0]['q_actual'][:4].tolist()
-                robot_data["cartesian"] = data[0]['tool_vector_actual'][:4].tolist()
-        except Exception as e:
-            # Log but don't crash — transient packet errors are expected
-            print(f"[FEEDBACK WARNING]: {e}")
-        sleep(0.02)  # 50Hz
+
+def live_joints():
+    """Newest [J1, J2, J3(Z), J4] from telemetry, or None before the
+    first packet (no robot connected / demo mode)."""
+    sample = telemetry_hub.latest()
+    return sample.joints if sample is not None else None
+
+
+def live_cartesian():
+    """Newest [X, Y, Z, R] from telemetry, or None before the first packet."""
+    sample = telemetry_hub.latest()
+    return sample.cartesian if sample is not None else None
 
 # Add this line where you initialize your robot connection:
 
@@ -224,49 +245,92 @@ class RobotManager:
 
     def run_drawing(self):
         self.boot_robot()
-        for i, pt in enumerate(DRAWING_POINTS):
-            z_height = 245.0 if i == 0 or i == (len(DRAWING_POINTS) - 1) else 220.0
-            # Ikinematics returns [[j1,j2,z,r]] — unpack with [0]
-            joints = Ikinematics(pt[0], pt[1], z=z_height)[0]
-            self.robot.movement.joint_mov_j(joints)
-            print(f"Drawing point {i+1}/{len(DRAWING_POINTS)}: {pt}")
+        # Pen up (245) on the first and last point, down (220) in between.
+        targets = np.zeros((len(DRAWING_POINTS), 4))
+        targets[:, :2] = DRAWING_POINTS
+        targets[:, 2] = 220.0
+        targets[[0, -1], 2] = 245.0
+        ik = solve_ik_batch(targets, strict=STRICT_JOINT_CHECKING)
+        if not ik.all_valid:
+            bad = ik.first_invalid()
+            raise ValueError(f"Drawing point {bad+1}: {ik.message(bad, targets)}")
+        joint_list = ik.joints.tolist()
+
+        # One pipelined burst instead of one blocking round trip per point —
+        # the controller queues every JointMovJ and answers them in order —
+        # with CP blending on so the pen flows through the points instead
+        # of stopping at each one.
+        self.robot.dashboard.set_continuous_path(STREAM_CP_RATIO)
+        timings = self.robot.movement.joint_mov_j_many(joint_list)
+        for i, t in enumerate(timings):
+            if t.error is not None:
+                print(f"Drawing point {i+1}/{len(timings)} rejected: {t.error}")
+        if timings:
+            latencies = [t.latency_ms for t in timings]
+            print(f"Queued {len(timings)} drawing points in "
+                  f"{(timings[-1].replied_at - timings[0].sent_at) * 1000:.1f} ms "
+                  f"(reply latency min/max {min(latencies):.1f}/{max(latencies):.1f} ms)")
         self.robot.movement.sync()
+        self.robot.dashboard.set_continuous_path(0)
         print("Drawing complete.")
 
 
 # Global variables for state tracking
 robot = None
 ROBOT_CONNECTED = False
+feedback_ring = None  # robot.feedback_ring (persists across reconnects), once connected
+telemetry_recorder = None  # flight recorder on telemetry_hub, once connected
 
 
 
 def initialize_robot(ip="192.168.1.6"):
-    global robot, ROBOT_CONNECTED
+    global robot, ROBOT_CONNECTED, feedback_ring, telemetry_recorder
 
     try:
-        from dobot_util import Dobot
         print(f"Attempting to connect to robot at {ip}...")
         
-        # 1. Establish Network Connection
-        robot = Dobot(ip, logging=True)
-        
-        # 2. Bootup Handshake (Critical for Physical Robot)
-        print("here2")
-        robot.dashboard.clear_error()       # Clear existing alarms/faults
-        sleep(0.3)
-        
-        robot.dashboard.continue_motion()   # Clear any active pause states
-        sleep(0.3)
-        
-        print("Here3")
-        robot.dashboard.enable()            # Power on the joints/motors
-        sleep(3.0)                          # Give the motors time to fully engage
+        # Establish the network connection and run the bootup handshake
+        # (clear alarms, clear pause, enable motors — see
+        # dobot_util.pool.default_handshake). ManagedDobot watches the
+        # feedback stream and, if the link drops, reconnects in the
+        # background and replays that same handshake; commands issued in
+        # the meantime wait for it (ROBOT_OUTAGE_POLICY).
+        robot = ManagedDobot(
+            ip,
+            policy=ROBOT_OUTAGE_POLICY,
+            hold_timeout=ROBOT_HOLD_TIMEOUT_SECONDS,
+            silence_timeout=ROBOT_SILENCE_TIMEOUT_SECONDS,
+            on_state_change=_on_robot_link_state,
+            logging=True,
+        )
         
         ROBOT_CONNECTED = True
         print("Robot connected and enabled successfully!")
         
-        # Start the background telemetry data-stream thread
-        threading.Thread(target=feedback_loop, args=(robot,), daemon=True).start()
+        # Start the background telemetry stream — the ring reads packets into
+        # preallocated memory and telemetry_hub fans each one out to its
+        # subscribers (see "Live telemetry" above). It's the same ring
+        # across reconnects, so the hub never needs re-attaching.
+        feedback_ring = robot.feedback_ring
+        telemetry_hub.attach(feedback_ring)
+
+        # Flight recorder: joints, pose, currents, temperatures and mode
+        # bits of every packet, compressed into hourly files under
+        # TELEMETRY_RECORD_DIR (oldest deleted past the size cap), so a
+        # misbehaving run can be inspected or replayed afterwards — see
+        # dobot_util/recorder.py and DOBOT_REPLAY below.
+        try:
+            telemetry_recorder = TelemetryRecorder(
+                TELEMETRY_RECORD_DIR, max_bytes=TELEMETRY_RECORD_MAX_BYTES
+            ).attach(telemetry_hub)
+        except OSError as e:
+            print(f"[TELEMETRY] Flight recorder disabled: {e}")
+
+        # Per-command latency/error stats (every dashboard/movement reply
+        # is timed into command_metrics) appended to a CSV once a minute,
+        # so slow commands and controller slowdowns over a long session
+        # show up after the fact.
+        command_metrics.start_periodic_dump(COMMAND_METRICS_PATH, interval=COMMAND_METRICS_DUMP_SECONDS)
         
         # Set to Cartesian/User coordinate system mode
         # robot.dashboard.send_command("CoordinateL(0)")
@@ -280,6 +344,27 @@ def initialize_robot(ip="192.168.1.6"):
         ROBOT_CONNECTED = False
         return False
 
+def _on_robot_link_state(state, detail):
+    """ManagedDobot link transitions (background thread) -> status label.
+    ROBOT_CONNECTED stays True through an outage: the app is still driving
+    a real arm, commands just wait for the reconnect."""
+    print(f"[ROBOT LINK] {state}: {detail}")
+
+    def show():
+        if 'status_label' not in globals() or not status_label.winfo_exists():
+            return
+        if state == "up":
+            status_label.config(text="Robot Connected", fg="green")
+        elif state == "closed":
+            status_label.config(text="Robot Disconnected", fg="red")
+        else:
+            status_label.config(text="Robot link lost — reconnecting...", fg="orange")
+
+    try:
+        root.after(0, show)
+    except (NameError, RuntimeError):
+        pass  # before the Tk root exists / after it's gone
+
 # Call the function immediately to maintain original behavior
 
 
@@ -289,57 +374,62 @@ def initialize_robot(ip="192.168.1.6"):
 # True  = Newer Way (Checks calculated J1/J2 angles against degree limits)
 STRICT_JOINT_CHECKING = True
 
-def Ikinematics(x, y, z=200.0, r=0.0):
-    L1 = 200.0  # Length of first arm segment
-    L2 = 200.0  # Length of second arm segment
+# Cell size (mm) of the cached reachability raster behind is_inside() and
+# the workspace shading — see reach_grid below. Changing it just builds
+# (and caches) a new raster on next start.
+REACH_GRID_RESOLUTION_MM = 1.0
+
+# Streaming point-queue execution (see _stream_queued_points): the CP blend
+# ratio used for runs of points between claw changes (0-100; higher = the
+# arm rounds corners more instead of stopping at each point), and how many
+# points go out per pipelined burst before the hard deck / jog state is
+# re-checked.
+STREAM_CP_RATIO = 50
+STREAM_LOOKAHEAD_POINTS = 32
+
+# Feedback-driven arrival detection (see wait_for_arm_arrival): how close
+# q_actual must be to the target (degrees for J1/J2/J4, mm for Z), how slow
+# every joint must be moving (deg/s or mm/s), and how long to wait before
+# falling back to Sync().
+ARRIVAL_TOLERANCE = 0.2
+ARRIVAL_VELOCITY_THRESHOLD = 0.5
+ARRIVAL_TIMEOUT_SECONDS = 15.0
+
+# Longest a continuous sweep's single move may take before it's given up on.
+SWEEP_TIMEOUT_SECONDS = 60.0
+
+# Where/how often dobot_util's per-command latency histograms get dumped
+# (see dobot_util/metrics.py). One CSV row per command per dump.
+COMMAND_METRICS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "command_metrics.csv")
+COMMAND_METRICS_DUMP_SECONDS = 60.0
+
+# Robot link outages (see dobot_util/pool.py). The link counts as dropped
+# after ROBOT_SILENCE_TIMEOUT_SECONDS without a feedback packet; commands
+# sent while it's down either wait up to ROBOT_HOLD_TIMEOUT_SECONDS for the
+# background reconnect ("hold") or raise DobotUnavailable at once ("fail").
+ROBOT_OUTAGE_POLICY = "hold"
+ROBOT_HOLD_TIMEOUT_SECONDS = 30.0
+ROBOT_SILENCE_TIMEOUT_SECONDS = 1.0
+
+# Telemetry flight recordings (dobot_util/recorder.py): hourly .dtr files,
+# oldest deleted once the folder passes TELEMETRY_RECORD_MAX_BYTES.
+TELEMETRY_RECORD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "telemetry_recordings")
+TELEMETRY_RECORD_MAX_BYTES = 2 * 1024 ** 3
+
+# Taught jog trajectories (see "Teach & Replay" / dobot_util/trajectory.py),
+# one JSON file per named trajectory.
+TRAJECTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "trajectories")
 
-    # Physical Joint Limits for Dobot M1 Pro
-    J1_MIN, J1_MAX = -85.0, 85.0
-    J2_MIN, J2_MAX = -135.0, 135.0
-    Z_MIN, Z_MAX = 5.0, 245.0
-
-    # --- COORDINATE CHECK (Reverted Mode) ---
-    if not STRICT_JOINT_CHECKING:
-        # This will fail for any point where X or Y > 85
-        if not (-85.0 <= x <= 85.0 and -135.0 <= y <= 135.0):
-            raise ValueError(f"Target ({x}, {y}) blocked by X/Y coordinate check (reverted mode)")
-
-    # Inverse kinematics calculations
-    D = (x**2 + y**2 - L1**2 - L2**2) / (2 * L1 * L2)
-    if abs(D) > 1:
-        raise ValueError("Target position out of reach")
-    D = max(-1,min(1,D))
-    theta2 = math.atan2(math.sqrt(1 - D**2), D)
-    theta1 = math.atan2(y, x) - math.atan2(L2 * math.sin(theta2), L1 + L2 * math.cos(theta2))
-
-    # Convert radians to degrees
-    j1 = math.degrees(theta1)
-    j2 = math.degrees(theta2)
-
-    if STRICT_JOINT_CHECKING:
-        # check if orgional position is outside limits 
-        if not (J1_MIN <= j1 <= J1_MAX and J2_MIN <= j2 <= J2_MAX):
-            # try flipping the elbow
-            theta2_alt = math.atan2(-math.sqrt(1- D**2),D)
-            theta1_alt = math.atan2(y,x) - math.atan2(L2* math.sin(theta2_alt), L1 + L2 * math.cos(theta2_alt))
-            j1_alt , j2_alt = math.degrees(theta1_alt) , math.degrees(theta2_alt)
-            # checks if flipping the elbow works
-            if ( J1_MIN <= j1_alt <= J1_MAX and J2_MIN <= j2_alt <= J2_MAX):
-                j1 , j2 = j1_alt,j2_alt
-            else:
-                # if both fail raise a value error
-                raise ValueError(f"No Valid joint configuations within limits for  ({x},{y})")
-    # even though this is mainly for the new mode this also checks for old just in case 
-    if not (J1_MIN <= j1 <= J1_MAX):
-        raise ValueError(f"J1 angle ({j1:.1f}°) exceeds hardware limit")
-    if not (J2_MIN <= j2 <= J2_MAX):
-        raise ValueError(f"J2 angle ({j2:.1f}°) exceeds hardware limit")
-
-    if not (Z_MIN <= z <= Z_MAX):
-        raise ValueError(f"Z height ({z}) out of range")
+def Ikinematics(x, y, z=200.0, r=0.0):
+    # One-point batch through dobot_util.kinematics, which owns the arm
+    # geometry, the joint limits and the STRICT_JOINT_CHECKING elbow flip.
+    point = [[x, y, z, r]]
+    ik = solve_ik_batch(point, strict=STRICT_JOINT_CHECKING)
+    if not ik.valid[0]:
+        raise ValueError(ik.message(0, point))
 
     # FIX: Return a list containing the solution list to satisfy the 'sols[0]' unpacking
-    return [[j1, j2, z, r]]
+    return [[float(v) for v in ik.joints[0]]]
 
 # Example Usage:
 # If you want to use the Cathedral points (which are > 85), 
@@ -358,8 +448,8 @@ m_claw = 0
 def sync_manual_position_from_feedback(reason: str = "") -> None:
     """
     Resyncs the "manual control state" globals (m_x, m_y, m_z, m_j4) to the
-    robot's real, live telemetry (robot_data["cartesian"]/["joints"], the
-    same 50Hz feed the red tracking dot uses).
+    robot's real, live telemetry (live_cartesian()/live_joints(), the same
+    telemetry_hub feed the red tracking dot uses).
 
     WHY THIS EXISTS: m_x/m_y/m_z/m_j4 only get updated automatically inside
     move_to_point() (used by the click-a-point-on-the-plot flow and the
@@ -379,10 +469,10 @@ def sync_manual_position_from_feedback(reason: str = "") -> None:
     direct-move code path stays consistent.
     """
     global m_x, m_y, m_z, m_j4
-    cart = robot_data.get("cartesian")
+    cart = live_cartesian()
     if cart and len(cart) >= 3:
         m_x, m_y, m_z = cart[0], cart[1], cart[2]
-    joints = robot_data.get("joints")
+    joints = live_joints()
     if joints and len(joints) >= 4:
         m_j4 = joints[3]
     if reason and (cart or joints):
@@ -390,6 +480,43 @@ def sync_manual_position_from_feedback(reason: str = "") -> None:
               f"X={m_x:.1f} Y={m_y:.1f} Z={m_z:.1f} J4={m_j4:.1f}")
 
 
+def wait_for_arm_arrival(target_joints, fallback_settle_seconds: float, reason: str = "") -> float:
+    """
+    Blocks until the arm has actually settled on target_joints
+    ([J1, J2, Z, J4]), watched from the live feedback stream via
+    telemetry_hub.wait_for_arrival — replaces the old
+    robot.movement.sync() + sleep(settle) pair in the rotation/capture
+    loops. Sync() held the movement socket until the whole motion queue
+    drained and the fixed sleep was then paid on every step even when the
+    arm had long since stopped; this returns on the packet the arm
+    settles instead.
+
+    If no settled feedback shows up within ARRIVAL_TIMEOUT_SECONDS (e.g.
+    the feedback stream dropped), falls back to exactly the old
+    behaviour — Sync() then sleep(fallback_settle_seconds) — so a missing
+    stream can never mean photographing a still-moving arm.
+    Resyncs the manual-position globals afterwards either way.
+
+    Returns the time.monotonic() the arm was known to be settled at — the
+    arrival time of the settling feedback packet (slightly *before* this
+    returns), or the end of the fallback sleep — for use as a capture's
+    newer_than.
+    """
+    sample = telemetry_hub.wait_for_arrival(
+        target_joints, tolerance=ARRIVAL_TOLERANCE, velocity_threshold=ARRIVAL_VELOCITY_THRESHOLD,
+        timeout=ARRIVAL_TIMEOUT_SECONDS)
+    if sample is None:
+        print(f"[ARRIVAL] No settled feedback within {ARRIVAL_TIMEOUT_SECONDS:.0f}s"
+              f"{' (' + reason + ')' if reason else ''} — falling back to Sync() + "
+              f"{fallback_settle_seconds}s settle.")
+        err = robot.movement.sync()
+        if err:
+            print(f"[SYNC WARNING]: {err}")
+        sleep(fallback_settle_seconds)
+    sync_manual_position_from_feedback(reason)
+    return sample.arrival if sample is not None else time.monotonic()
+
+
 
 def safe_move_to_point(x, y, z=200, r=0):
     """Non-blocking wrapper around move_to_point.
@@ -474,8 +601,8 @@ def handle_jog_press(axis_cmd, _via_remote=False):
     if not ROBOT_CONNECTED or is_jogging or not manual_active.get():
         return
         
-    # Get current joints from the background thread's latest data
-    current_j = robot_data["joints"]
+    # Get current joints from the newest telemetry sample
+    current_j = live_joints() or []
     
     # Send the safe command
     error = robot.movement.safe_move_jog(axis_cmd, current_j)
@@ -511,16 +638,15 @@ def handle_jog_release(event, _via_remote=False):
         # back toward that stale pre-jog position instead of continuing
         # from where the jog actually left it.
         #
-        # Fix: pull the robot's real, live telemetry (already tracked at
-        # 50Hz by feedback_loop() into robot_data["cartesian"], the same
-        # source the red tracking dot uses) and use it to resync m_x/m_y/m_z
-        # the moment jogging stops.
-        cart = robot_data.get("cartesian")
+        # Fix: pull the robot's real, live telemetry (live_cartesian(), the
+        # same telemetry_hub source the red tracking dot uses) and use it to
+        # resync m_x/m_y/m_z the moment jogging stops.
+        cart = live_cartesian()
         if cart and len(cart) >= 3:
             m_x, m_y, m_z = cart[0], cart[1], cart[2]
             print(f"[JOG SYNC] Manual position resynced to actual pose: "
                   f"X={m_x:.1f} Y={m_y:.1f} Z={m_z:.1f}")
-        joints = robot_data.get("joints")
+        joints = live_joints()
         if joints and len(joints) >= 4:
             m_j4 = joints[3]
 
@@ -541,6 +667,125 @@ def handle_manual_z(dz):
     # instead of clobbering it.
     safe_move_to_point(m_x, m_y, m_z, m_j4)
 
+# --- Teach & Replay ---
+# Teach mode samples the arm's joints off telemetry_hub at the full packet
+# rate while the operator jogs, then Douglas-Peucker-simplifies the path
+# into a handful of waypoints and saves it under a name (TRAJECTORY_DIR).
+# Replay sends the whole trajectory as one pipelined, CP-blended burst —
+# one continuous motion instead of a stop at every waypoint — after
+# checking every waypoint against the joint limits and the hard deck.
+teach_session = None
+
+
+def toggle_teach_mode():
+    """Start Teaching / Stop & Save button."""
+    global teach_session
+    if teach_session is None:
+        if not ROBOT_CONNECTED:
+            messagebox.showwarning("Teach Mode", "Teaching needs live telemetry from a connected robot.")
+            return
+        teach_session = TeachSession(telemetry_hub).start()
+        teach_button.config(text="Stop Teaching & Save", bg="tomato")
+        print("[TEACH] Recording — jog the arm through the path, then press Stop Teaching & Save.")
+        return
+
+    session, teach_session = teach_session, None
+    session.cancel()
+    teach_button.config(text="Start Teaching", bg="lightblue")
+    name = simpledialog.askstring("Save Trajectory", "Name for the taught trajectory:", parent=root)
+    if not name or not name.strip():
+        print(f"[TEACH] Discarded ({session.sample_count} samples).")
+        return
+    try:
+        trajectory = session.finish(name.strip())
+        try:
+            path = trajectory.save(TRAJECTORY_DIR)
+        except FileExistsError:
+            if not messagebox.askyesno("Save Trajectory",
+                                       f"A trajectory named '{trajectory.name}' already exists. Replace it?"):
+                print(f"[TEACH] Not saved: '{trajectory.name}' already exists.")
+                return
+            path = trajectory.save(TRAJECTORY_DIR, overwrite=True)
+    except (ValueError, OSError) as e:
+        messagebox.showerror("Teach Mode", f"Couldn't save the trajectory: {e}")
+        return
+    refresh_trajectory_list(select=trajectory.name)
+    print(f"[TEACH] Saved '{trajectory.name}' to {path}: {trajectory.samples} samples over "
+          f"{trajectory.duration_s:.1f} s -> {len(trajectory.waypoints)} waypoints.")
+
+
+def refresh_trajectory_list(select=None):
+    names = list_trajectories(TRAJECTORY_DIR)
+    trajectory_combo.config(values=names)
+    if select in names:
+        trajectory_var.set(select)
+    elif trajectory_var.get() not in names:
+        trajectory_var.set(names[0] if names else "")
+
+
+def replay_selected_trajectory():
+    """Replay button: the selected trajectory as one blended motion."""
+    name = trajectory_var.get()
+    if not name:
+        messagebox.showwarning("Replay", "No trajectory selected.")
+        return
+    try:
+        trajectory = Trajectory.load(os.path.join(TRAJECTORY_DIR, Trajectory.file_name(name)))
+    except (OSError, ValueError, TypeError) as e:
+        messagebox.showerror("Replay", f"Couldn't load '{name}': {e}")
+        return
+
+    # Everything is checked once, up front: nothing moves unless the
+    # whole path is within limits and above the current floor.
+    problems = trajectory.limit_violations()
+    if problems:
+        messagebox.showerror("Replay Rejected", "\n".join(problems[:10]))
+        return
+    for i, wp in enumerate(trajectory.waypoints):
+        msg = _hard_deck_violation(wp[2], f"Trajectory '{name}' waypoint {i+1}")
+        if msg:
+            messagebox.showerror("Replay Rejected", msg)
+            return
+
+    if not (ROBOT_CONNECTED and robot):
+        print(f"DEMO MODE: would replay '{name}' ({len(trajectory.waypoints)} waypoints)")
+        return
+    if is_jogging or teach_session is not None:
+        messagebox.showwarning("Replay", "Stop jogging / teaching before replaying a trajectory.")
+        return
+    if not try_start_arm_operation(f"replaying '{name}'"):
+        return
+
+    def worker():
+        error = None
+        started = time.perf_counter()
+        try:
+            robot.dashboard.set_continuous_path(STREAM_CP_RATIO)
+            timings = robot.movement.joint_mov_j_many(trajectory.waypoints)
+            for k, t in enumerate(timings):
+                if t.error is not None:
+                    robot.dashboard.reset()   # don't carry on past a rejected waypoint
+                    raise RuntimeError(f"Waypoint {k + 1} rejected: {t.error}")
+            wait_for_arm_arrival(trajectory.waypoints[-1], 0.3, f"trajectory '{name}'")
+            sync_manual_position_from_feedback(f"trajectory '{name}' replay")
+        except Exception as e:
+            error = str(e)
+        finally:
+            try:
+                robot.dashboard.set_continuous_path(0)
+            except Exception as e:
+                print(f"[CP RESET WARNING]: {e}")
+            finish_arm_operation()
+
+        if error is not None:
+            print(f"[TEACH] Replay of '{name}' failed: {error}")
+            root.after(0, lambda msg=error: messagebox.showerror("Replay Failed", msg))
+        else:
+            print(f"[TEACH] Replayed '{name}' ({len(trajectory.waypoints)} waypoints) "
+                  f"in {time.perf_counter() - started:.1f} s.")
+
+    threading.Thread(target=worker, daemon=True).start()
+
 # =====================================================================
 # CLAW DUAL-OUTPUT CONFIGURATION & HANDLER
 # =====================================================================
@@ -611,27 +856,22 @@ def handle_manual_claw():
     threading.Thread(target=set_claw_dual_output, args=(m_claw,), daemon=True).start()
 
 limit = 450
-x = np.linspace(-limit, limit, 1000)
-y = np.linspace(-limit, limit, 1000)
-X, Y = np.meshgrid(x, y)
 
-# Precompute constants
-tan_85 = np.tan(np.radians(85))
-tan_100 = np.tan(np.radians(100))
-
-# Region definitions
-r_squared = X**2 + Y**2
-region1 = (153**2 <= r_squared) & (r_squared <= 400**2) & (np.abs(X) <= tan_85 * Y)
-region2 = ((200 - X)**2 + (abs(200)/tan_85 - Y)**2 <= 200**2) & (Y <= -tan_100 * (X - 153) + 200/tan_85)
-region3 = ((200 + X)**2 + (abs(200)/tan_85 - Y)**2 <= 200**2) & (Y <= tan_100 * (X + 153) + 200/tan_85)
-final_region = region1 | (region2 | region3)
+# Reachability raster (dobot_util.reachability): the workspace outline AND
+# the Ikinematics joint limits for the current STRICT_JOINT_CHECKING mode,
+# precomputed once at REACH_GRID_RESOLUTION_MM and cached on disk keyed by
+# those limits — so clicks, the plot shading and bulk imports are table
+# lookups instead of per-point trig, and it's only rebuilt when a limit
+# changes. The hard deck is read live on each Z-aware lookup (it's
+# settable at runtime), never baked into the raster.
+reach_grid = ReachabilityGrid(
+    resolution=REACH_GRID_RESOLUTION_MM, extent=limit, strict=STRICT_JOINT_CHECKING,
+    floor_provider=lambda: _effective_hard_deck_z(),
+).load_or_build()
 
 # Function to check if a point is inside the region
 def is_inside(px, py):
-    cond1 = (153**2 <= px**2 + py**2 <= 400**2) and (abs(px) <= tan_85 * py)
-    cond2 = ((200 - px)**2 + (abs(200)/tan_85 - py)**2 <= 200**2) and (py <= -tan_100 * (px - 153) + 200/tan_85)
-    cond3 = ((200 + px)**2 + (abs(200)/tan_85 - py)**2 <= 200**2) and (py <= tan_100 * (px + 153) + 200/tan_85)
-    return cond1 or cond2 or cond3
+    return reach_grid.contains_xy(px, py)
 
 # Lists to store valid and invalid points (now with z-values and claw state)
 valid_points = []  # Will store tuples of (px, py, z, claw_state, j4)
@@ -647,7 +887,15 @@ root.title("Robotic Arm Control")
 
 # Initialize robot here — after root exists so any error dialogs can render,
 # and before status_label so ROBOT_CONNECTED is set when the label is created.
-initialize_robot("192.168.1.6")
+# DOBOT_SIMULATOR=1 runs against a local simulated controller instead (see
+# dobot_util/sim_controller.py) — the whole app, capture/rotation loops
+# included, then works end to end with no arm attached.
+if os.environ.get("DOBOT_SIMULATOR"):
+    from dobot_util.sim_controller import SimulatedController
+    simulated_controller = SimulatedController().start()
+    initialize_robot("127.0.0.1")
+else:
+    initialize_robot("192.168.1.6")
 
 # INITIALIZE HERE - This prevents the "Too early" error
 global manual_active
@@ -793,7 +1041,7 @@ tk.Label(control_mode_frame,
 # never allowed to move below, local-only settable (never remotely),
 # enforced inside move_to_point() and _handle_move_command() (the two
 # funnels every planned/absolute move already goes through), plus a
-# reactive jog watchdog in update_gui_from_feedback() for continuous
+# reactive jog watchdog (_hard_deck_jog_watchdog) for continuous
 # jogging, which has no single predictable target to check in advance.
 #
 # Two tiers, per the agreed design:
@@ -900,10 +1148,11 @@ def _set_hard_deck(tier: str):
     """tier is 'base' or 'remote'. Reads the CURRENT live Z (not a typed
     value) so the floor always matches a position the robot has
     actually reached, per the described calibration workflow."""
-    if not ROBOT_CONNECTED or "cartesian" not in robot_data or robot_data["cartesian"] is None:
+    cart = live_cartesian()
+    if not ROBOT_CONNECTED or cart is None:
         messagebox.showwarning("No Robot", "Connect the robot first to calibrate a height floor.")
         return
-    current_z = robot_data["cartesian"][2]
+    current_z = cart[2]
 
     base = hard_deck_state.get("base_hard_deck_z")
     remote = hard_deck_state.get("remote_hard_deck_z")
@@ -1068,13 +1317,10 @@ def _middleman_capture_executor(object_id: str = None):
     into one object instead of each becoming its own.
     """
     sample_id = object_id or new_sample_id()
-    frames = []
-    for camera_name in list_configured_cameras():
-        try:
-            frame = capture_frame(camera_name)
-            frames.append((camera_name, 0, frame))
-        except Exception as e:
-            print(f"[MIDDLEMAN] Capture failed for camera '{camera_name}': {e}")
+    shot = capture_all_frames()
+    frames = [(camera_name, 0, frame) for camera_name, frame in shot.frames.items()]
+    for camera_name, error in shot.errors.items():
+        print(f"[MIDDLEMAN] Capture failed for camera '{camera_name}': {error}")
     values = {"num_images": len(frames)}
     return sample_id, frames, values
 
@@ -1082,8 +1328,8 @@ def _middleman_capture_executor(object_id: str = None):
 def _middleman_telemetry_provider() -> dict:
     return {
         "robot_connected": ROBOT_CONNECTED,
-        "joints": robot_data.get("joints"),
-        "cartesian": robot_data.get("cartesian"),
+        "joints": live_joints(),
+        "cartesian": live_cartesian(),
     }
 
 
@@ -1359,6 +1605,18 @@ j4_plus_btn.grid(row=2, column=1, padx=5, pady=(4, 0))
 j4_plus_btn.bind("<ButtonPress-1>", lambda e: handle_jog_press("J4-"))
 j4_plus_btn.bind("<ButtonRelease-1>", handle_jog_release)
 
+# Teach & Replay (see toggle_teach_mode / replay_selected_trajectory)
+teach_frame = tk.Frame(overdrive_frame)
+teach_frame.grid(row=3, column=0, columnspan=3, pady=(8, 0), sticky=tk.W)
+teach_button = tk.Button(teach_frame, text="Start Teaching", width=18, bg="lightblue",
+                         command=toggle_teach_mode)
+teach_button.pack(side=tk.LEFT, padx=5)
+trajectory_var = tk.StringVar(value="")
+trajectory_combo = ttk.Combobox(teach_frame, textvariable=trajectory_var, width=22, state="readonly")
+trajectory_combo.pack(side=tk.LEFT, padx=5)
+tk.Button(teach_frame, text="Replay", width=8, command=replay_selected_trajectory).pack(side=tk.LEFT, padx=5)
+refresh_trajectory_list()
+
 # Main Title
 tk.Label(manual_frame, text="Manual Control Interface", font=("Arial", 12, "bold")).pack(pady=5)
 
@@ -1472,7 +1730,8 @@ ax.grid(which='minor', linestyle='--', linewidth=0.5)
 ax.set_aspect('equal', 'box') 
 
 # Setup the valid region plot in light grey
-ax.contourf(X, Y, final_region, levels=[0.5, 1], colors=['lightgrey'], alpha=0.5)
+ax.contourf(reach_grid.cell_centres(), reach_grid.cell_centres(), reach_grid.mask(),
+            levels=[0.5, 1], colors=['lightgrey'], alpha=0.5)
 
 # --- Photo station marker (yellow dot) ---
 # Plot coordinates (px, py) and robot coordinates (x, y) are rotated
@@ -1555,6 +1814,10 @@ def add_manual_point():
         if not (5.0 <= z_val <= 245.0):
             messagebox.showerror("Invalid Z-Value", "Z-value must be between 5 and 245 mm")
             return
+        if not reach_grid.z_ok(z_val):
+            messagebox.showerror("Invalid Z-Value",
+                                 f"Z-value {z_val:.1f} is below the height floor ({_effective_hard_deck_z():.1f})")
+            return
         
         # Check if point is in valid region
         if is_inside(x_val, y_val):
@@ -1595,14 +1858,114 @@ def remove_first_point():
         points_listbox.delete(0)
         canvas.draw()
 
+def _optimize_point_order(points, joints):
+    """Reorder queue-style points (px, py, z, claw, j4) for the shortest
+    estimated joint-space travel time (see dobot_util/path_order.py —
+    nearest neighbour + 2-opt; each claw change stays where it is, in the
+    same order). *joints* are their IK solutions, one row per point.
+
+    A point with no J4 of its own holds whatever the point before it left
+    the wrist at, which stops being the same angle once the points move
+    around — so in a reordered list each such point is given, explicitly,
+    the J4 it would have inherited in the original order.
+    Returns (PathOrder, reordered points)."""
+    j4 = m_j4
+    resolved = []
+    for p in points:
+        if p[4] is not None:
+            j4 = p[4]
+        resolved.append(j4)
+    q = np.array(joints, dtype=np.float64)[:, :4].copy()
+    q[:, 3] = resolved
+    result = optimize_order(q, [p[3] for p in points])
+    if not result.changed:
+        return result, list(points)
+    return result, [points[i][:4] + (points[i][4] if points[i][4] is not None else resolved[i],)
+                    for i in result.order]
+
+
+def optimize_queue_order():
+    """Optimize Order button: reorder valid_points in place (plot markers
+    and list entries follow) and report the estimated time saved."""
+    if len(valid_points) < 3:
+        messagebox.showinfo("Optimize Order", "Queue at least 3 points to optimize their order.")
+        return
+    if arm_operation_lock.locked():
+        messagebox.showwarning("Arm Busy", "Can't reorder the queue while the arm is running a sequence.")
+        return
+    ik, targets = _solve_plot_points(valid_points)
+    if not ik.all_valid:
+        bad = ik.first_invalid()
+        messagebox.showerror("Unreachable Point",
+                             f"Queued point {bad+1} can't be reached: {ik.message(bad, targets)}")
+        return
+
+    result, reordered = _optimize_point_order(valid_points, ik.joints)
+    if not result.changed:
+        messagebox.showinfo("Optimize Order",
+                            f"The current order is already the best found "
+                            f"(~{result.before_s:.1f} s of travel).")
+        return
+
+    # Keep each entry's " [Manual]" / " [Test]" source tag through the renumbering.
+    tags = []
+    for i in range(len(valid_points)):
+        match = re.search(r" \[\w+\]$", points_listbox.get(i))
+        tags.append(match.group(0) if match else "")
+    scatters = list(valid_scatters)
+    valid_points[:] = reordered
+    valid_scatters[:] = [scatters[i] for i in result.order]
+    points_listbox.delete(0, tk.END)
+    for n, ((px, py, pz, claw, j4_val), i) in enumerate(zip(valid_points, result.order), start=1):
+        claw_text = "ON" if claw == 1 else "OFF"
+        j4_text_display = f"{j4_val:.1f}" if j4_val is not None else "current"
+        points_listbox.insert(tk.END, f"{n}: ({px:.2f}, {py:.2f}, z={pz:.1f}, claw={claw_text}, J4={j4_text_display}){tags[i]}")
+
+    pct = 100.0 * result.saved_s / result.before_s if result.before_s else 0.0
+    print(f"Queue reordered: est. travel {result.before_s:.1f} s -> {result.after_s:.1f} s "
+          f"(saves {result.saved_s:.1f} s, {pct:.0f}%)")
+    messagebox.showinfo("Optimize Order",
+                        f"Reordered {len(valid_points)} points.\n\n"
+                        f"Estimated travel: {result.before_s:.1f} s -> {result.after_s:.1f} s\n"
+                        f"Saves ~{result.saved_s:.1f} s ({pct:.0f}%) per run.")
+
+
+def _solve_plot_points(points):
+    """Batch-IK a list of (px, py, z, ...) plot-frame points in one go (see
+    dobot_util.kinematics.solve_ik_batch) instead of one Ikinematics call
+    and possible exception per point. Applies the same plot -> robot frame
+    rotation as add_dobot_instructions (x = py, y = -px). J4 doesn't
+    affect reachability, so r is left at 0."""
+    pts = np.asarray([p[:3] for p in points], dtype=np.float64).reshape(-1, 3)
+    targets = np.zeros((len(pts), 4))
+    targets[:, 0] = np.round(pts[:, 1], 2)
+    targets[:, 1] = -np.round(pts[:, 0], 2)
+    targets[:, 2] = pts[:, 2]
+    return solve_ik_batch(targets, strict=STRICT_JOINT_CHECKING), targets
+
+
 def add_dobot_instructions():
     if not valid_points:
         messagebox.showwarning("No Points", "No valid points to send to robot!")
         return
 
+    # Reject an unreachable queue before the arm moves at all, rather than
+    # discovering it halfway through when execute_point's solve raises.
+    ik, targets = _solve_plot_points(valid_points)
+    if not ik.all_valid:
+        bad = ik.first_invalid()
+        messagebox.showerror("Unreachable Point",
+                             f"Queued point {bad+1} can't be reached: {ik.message(bad, targets)}\n\n"
+                             f"{int((~ik.valid).sum())} of {len(ik)} queued points are unreachable.")
+        return
+
     if not try_start_arm_operation("sending the queued points"):
         return
 
+    if ROBOT_CONNECTED and robot and control_mode_var.get() != "middleman_other":
+        _stream_queued_points(list(valid_points), ik, targets)
+        return
+
     def process_next_point():
         if not valid_points:
             print("All points complete.")
@@ -1681,6 +2044,112 @@ def add_dobot_instructions():
 
     process_next_point()
 
+def _stream_queued_points(points, ik, targets):
+    """Local-hardware executor for add_dobot_instructions. Instead of
+    move -> Sync() -> claw -> next for every point (a dead stop at each
+    waypoint), consecutive points with an unchanged claw state go out as
+    one pipelined burst of JointMovJ with CP blending on, so the arm flows
+    through them. It only syncs where it has to: on a point whose claw
+    state differs from the one before it (the arm must actually arrive
+    before the claw fires — the first point always counts, since the claw
+    state beforehand isn't known) and at the end of the queue.
+
+    points/ik/targets come from add_dobot_instructions' up-front batch
+    solve, so every point is already known reachable. The hard deck is
+    checked for the whole queue before anything moves, then re-checked
+    per burst of STREAM_LOOKAHEAD_POINTS (the effective floor can change
+    mid-run, e.g. when a remote session starts). Runs in a background
+    thread; the caller already holds the arm operation."""
+    n = len(points)
+
+    # Resolve each point's J4 the way the per-point path does: its own J4
+    # if set, else whatever the previous point left the wrist at.
+    joint_list = []
+    j4 = m_j4
+    for (px, py, point_z, claw_state, point_j4), row in zip(points, ik.joints):
+        if point_j4 is not None:
+            j4 = point_j4
+        joint_list.append([float(row[0]), float(row[1]), float(row[2]), j4])
+
+    claws = [p[3] for p in points]
+    fire_at = {i for i in range(n) if i == 0 or claws[i] != claws[i - 1]}
+    run_ends = sorted(fire_at | {n - 1})
+
+    for i, joints in enumerate(joint_list):
+        msg = _hard_deck_violation(joints[2], f"Queued point {i+1}")
+        if msg:
+            finish_arm_operation()
+            messagebox.showerror("Robot Error", f"{msg}\n\nNo queued points were sent.")
+            return
+
+    print(f"Streaming {n} points as {len(run_ends)} blended run(s) "
+          f"(CP {STREAM_CP_RATIO}, sync only at claw changes).")
+
+    def worker():
+        global m_x, m_y, m_z, m_j4
+        error = None
+        started = time.perf_counter()
+        try:
+            robot.dashboard.set_continuous_path(STREAM_CP_RATIO)
+            start = 0
+            for end in run_ends:
+                for burst_start in range(start, end + 1, STREAM_LOOKAHEAD_POINTS):
+                    burst = joint_list[burst_start:min(burst_start + STREAM_LOOKAHEAD_POINTS, end + 1)]
+                    if is_jogging:
+                        raise RuntimeError("Robot is currently jogging")
+                    for k, joints in enumerate(burst):
+                        msg = _hard_deck_violation(joints[2], f"Queued point {burst_start + k + 1}")
+                        if msg:
+                            raise RuntimeError(msg)
+                    timings = robot.movement.joint_mov_j_many(burst)
+                    for k, t in enumerate(timings):
+                        if t.error is not None:
+                            # Later points in the burst were queued too —
+                            # clear the motion queue rather than let the
+                            # arm carry on past a rejected waypoint.
+                            robot.dashboard.reset()
+                            raise RuntimeError(f"Point {burst_start + k + 1} rejected: {t.error}")
+
+                err = robot.movement.sync()
+                if err:
+                    print(f"[SYNC WARNING]: {err}")
+                m_x, m_y = float(targets[end, 0]), float(targets[end, 1])
+                m_z, m_j4 = joint_list[end][2], joint_list[end][3]
+
+                if end in fire_at:
+                    set_claw_dual_output(claws[end])
+                    print(f"Point {end+1} complete: claw={'ON' if claws[end] == 1 else 'OFF'}")
+
+                done = end + 1 - start
+                root.after(0, lambda done=done: [remove_first_point() for _ in range(done)])
+                start = end + 1
+        except Exception as e:
+            error = str(e)
+        finally:
+            try:
+                robot.dashboard.set_continuous_path(0)
+            except Exception as e:
+                print(f"[CP RESET WARNING]: {e}")
+            finish_arm_operation()
+
+        if error is not None:
+            print(f"Sequence failed: {error}")
+            root.after(0, lambda msg=error: messagebox.showerror(
+                "Robot Error", f"Point sequence failed: {msg}\n\nRemaining queued points were NOT sent."))
+        else:
+            print(f"All points complete ({n} points in {time.perf_counter() - started:.1f} s).")
+
+    threading.Thread(target=worker, daemon=True).start()
+
+
+def _warn_capture_skew(shot, what: str) -> None:
+    """Print a warning when a capture_all_frames() view's cameras grabbed
+    their frames further apart than CAMERA_SKEW_WARN_SECONDS."""
+    if shot.skew_s > CAMERA_SKEW_WARN_SECONDS:
+        print(f"[CAPTURE SKEW] {what}: cameras {sorted(shot.timestamps)} were "
+              f"{shot.skew_s * 1000:.0f} ms apart (capture took {shot.elapsed_s * 1000:.0f} ms).")
+
+
 def photograph_at_current_position():
     """
     Capture-only: takes NO robot action at all — grabs one frame from
@@ -1695,8 +2164,8 @@ def photograph_at_current_position():
     or the point queue were doing. Even with the arm_operation_lock
     preventing the two from sending commands at the literal same instant,
     the pipeline's target pose and the arm's actual physical joint
-    values (only updated live via the 50Hz feedback loop into
-    robot_data) could still drift apart — e.g. if the manual entries were
+    values (only known live via the feedback stream / telemetry_hub)
+    could still drift apart — e.g. if the manual entries were
     stale, or a previous jog left the arm somewhere the pipeline's
     Ikinematics call didn't account for. Taking the photo at the CURRENT
     position instead removes the motion entirely, so there's nothing
@@ -1705,9 +2174,9 @@ def photograph_at_current_position():
     """
     sample_id = new_sample_id()
 
-    if ROBOT_CONNECTED and robot_data.get("joints"):
-        pose_snapshot = {"joints": list(robot_data["joints"]),
-                          "cartesian": list(robot_data.get("cartesian") or [])}
+    if ROBOT_CONNECTED and live_joints():
+        pose_snapshot = {"joints": list(live_joints()),
+                          "cartesian": list(live_cartesian() or [])}
     else:
         pose_snapshot = {"joints": None, "cartesian": None,
                           "note": "demo mode — no live feedback available"}
@@ -1719,14 +2188,15 @@ def photograph_at_current_position():
     views = []
     failed_cameras = []
 
-    for camera_name in cameras_to_use:
-        try:
-            frame = capture_frame(camera_name)
-        except (RuntimeError, ImportError) as e:
-            print(f"[CAPTURE SKIPPED] Camera '{camera_name}' unavailable: {e}")
-            failed_cameras.append(camera_name)
-            continue
-        image_path = save_image(frame, sample_id, camera_name, 0)
+    shot = capture_all_frames(list(cameras_to_use), newer_than=time.monotonic())
+    _warn_capture_skew(shot, "capture at current position")
+    for camera_name, e in shot.errors.items():
+        print(f"[CAPTURE SKIPPED] Camera '{camera_name}' unavailable: {e}")
+        failed_cameras.append(camera_name)
+    # Encode all cameras' frames in parallel on the write pool.
+    writes = {camera_name: image_writer().submit(frame, sample_id, camera_name, 0)
+              for camera_name, frame in shot.frames.items()}
+    for camera_name, image_path in zip(writes, image_writer().flush(list(writes.values()))):
         views.append({"source": camera_name, "view_index": 0,
                       "image_path": image_path, "pose": pose_snapshot})
 
@@ -1791,17 +2261,64 @@ def run_photograph_at_current_position():
     threading.Thread(target=execute, daemon=True).start()
 
 
+def _joint_speed_at(timestamp: float):
+    """Fastest |qd_actual| over J1-J4 in the last feedback packet that had
+    arrived by *timestamp* (time.monotonic(), e.g. a frame's grab time), or
+    None without live feedback (the capture gate then checks sharpness
+    only)."""
+    if not ROBOT_CONNECTED or feedback_ring is None:
+        return None
+    record = feedback_ring.at(timestamp)
+    if record is None:
+        return None
+    return float(np.abs(record[0]['qd_actual'][:4]).max())
+
+
+# One gate for every rotation capture: each view's frame must be sharp
+# and taken with the arm steady — see vision/camera/capture_gate.py.
+# With it, interval_seconds can be cut right down (it's only the settle
+# fallback) without the blurred-photo risk that used to come with that.
+rotation_capture_gate = CaptureGate(velocity=_joint_speed_at) if CAPTURE_GATE_ENABLED else None
+
+
+def _rotation_motion(interval_seconds: float, reason: str):
+    """
+    (move, wait_settled) for a RotationEngine run: a JointMovJ to each
+    view's target plus wait_for_arm_arrival on a connected arm, or the
+    DEMO MODE print + interval_seconds sleep otherwise.
+    """
+    if ROBOT_CONNECTED and robot:
+        def move(target):
+            move_error = robot.movement.joint_to_joint_move(target)
+            if move_error is not None:
+                raise RuntimeError(f"Move to J4={target[3]:.1f} failed: {move_error}")
+
+        def wait_settled(target):
+            return wait_for_arm_arrival(target, interval_seconds, reason)
+    else:
+        def move(target):
+            print(f"DEMO MODE: rotating to J4={target[3]:.1f} deg ({reason})")
+
+        def wait_settled(target):
+            sleep(interval_seconds)
+            return time.monotonic()
+    return move, wait_settled
+
+
 def run_automatic_capture_sequence(category: str, num_images: int,
                                     degrees_per_step: float,
                                     interval_seconds: float) -> None:
     """
     [WIRED] The full "no manual clicking" capture loop: from wherever the
     arm currently is, rotate J4 by `degrees_per_step` degrees, wait
-    `interval_seconds` to settle, take a photo with a local camera, and
-    repeat `num_images` times. Once done, registers the result through
-    4DAI's own existing REST API (/collection/submission,
-    /collection/images/upload) - the exact endpoints its manual "Submit"
-    flow already used - so 4DAI needs zero code changes for this to work.
+    for it to settle (watched from live feedback; `interval_seconds` is
+    now only the fallback padding, see wait_for_arm_arrival), take a photo
+    with a local camera, and
+    repeat `num_images` times. Registers the sample through 4DAI's own
+    existing REST API (/collection/submission, then
+    /collection/images/upload per view, in view order, as each view's
+    images land) - the exact endpoints its manual "Submit" flow already
+    used - so 4DAI needs zero code changes for this to work.
 
     Runs inline on whatever thread calls it - callers (the MQTT command
     handler below) are responsible for running it off the Tkinter main
@@ -1817,61 +2334,24 @@ def run_automatic_capture_sequence(category: str, num_images: int,
                                 num_images=num_images,
                                 degrees_per_step=degrees_per_step)
 
-        base_joints = list(robot_data["joints"]) if robot_data["joints"] else [0.0, 0.0, 200.0, 0.0]
+        base_joints = list(live_joints() or [0.0, 0.0, 200.0, 0.0])
         base_j1, base_j2, base_z, base_j4 = (base_joints + [0.0, 0.0, 200.0, 0.0])[:4]
         hard_deck_error = _hard_deck_violation(base_z, "Capture rotation sequence")
         if hard_deck_error:
             raise RuntimeError(hard_deck_error)
 
-        cameras_to_use = list_configured_cameras()
-        failed_cameras = set()
-
-        for i in range(num_images):
-            j4_target = base_j4 + (i * degrees_per_step)
-
-            if ROBOT_CONNECTED and robot:
-                move_error = robot.movement.joint_to_joint_move(
-                    [base_j1, base_j2, base_z, j4_target])
-                if move_error is not None:
-                    raise RuntimeError(f"Move failed at image {i + 1}: {move_error}")
-                robot.movement.sync()
-                sync_manual_position_from_feedback("automatic capture rotation step")
-            else:
-                print(f"DEMO MODE: rotating to J4={j4_target:.1f} deg "
-                      f"(image {i + 1}/{num_images})")
-
-            sleep(interval_seconds)
-
-            captured_this_step = False
-            for camera_name in cameras_to_use:
-                if camera_name in failed_cameras:
-                    continue
-                try:
-                    frame = capture_frame(camera_name)
-                except (RuntimeError, ImportError) as e:
-                    print(f"[CAPTURE SKIPPED] '{camera_name}' unavailable: {e}")
-                    failed_cameras.add(camera_name)
-                    continue
-                image_path = save_image(frame, sample_id, camera_name, i)
-                image_paths.append(image_path)
-                captured_this_step = True
-                publish_capture_status("image", category=category,
-                                        sample_id=sample_id, image_index=i,
-                                        camera=camera_name)
-
-            if not captured_this_step:
-                print(f"[WARNING] No camera produced a frame for image {i + 1}")
-
-        if not image_paths:
-            raise RuntimeError("Automatic capture produced zero images - "
-                                "check camera connections.")
+        cameras = list_configured_cameras()
+        if not cameras:
+            raise RuntimeError("No cameras configured - nothing to capture.")
 
         # Register through 4DAI's own REST API - same endpoints its
         # "Submit" button uses - so this sample lands in the correct
         # per-category collection and shows up in 4DAI's "View
         # Collections" page identically to a manual submission. 4DAI's
-        # code is completely unmodified for this to work.
-        values = {"predicted_label": category, "num_images": len(image_paths)}
+        # code is completely unmodified for this to work. Submitted up
+        # front (the image count is known before the first move) so each
+        # view's images can be uploaded while the arm moves on.
+        values = {"predicted_label": category, "num_images": num_images * len(cameras)}
         submit_response = requests.post(
             f"{SERVER_URL}/collection/submission",
             json={"category": category, "date": str(date.today()), "data": values},
@@ -1880,7 +2360,7 @@ def run_automatic_capture_sequence(category: str, num_images: int,
         submit_response.raise_for_status()
         fourdai_sample_id = submit_response.json()["sample_id"]
 
-        for image_path in image_paths:
+        def upload(image_path):
             with open(image_path, "rb") as image_file:
                 upload_response = requests.post(
                     f"{SERVER_URL}/collection/images/upload",
@@ -1890,6 +2370,44 @@ def run_automatic_capture_sequence(category: str, num_images: int,
                 )
             upload_response.raise_for_status()
 
+        upload_errors = []
+
+        def on_capture(i, shot):
+            _warn_capture_skew(shot, f"image {i + 1}")
+            if not shot.frames:
+                print(f"[WARNING] No camera produced a frame for image {i + 1}")
+
+        def on_view(i, pairs):
+            # The engine's post step: runs once per view, in view order, off
+            # the arm thread - so 4DAI receives the images in J4 order while
+            # the arm is already on its way to the next angle.
+            for camera_name, image_path in pairs:
+                publish_capture_status("image", category=category,
+                                        sample_id=sample_id, image_index=i,
+                                        camera=camera_name)
+                if upload_errors:
+                    continue   # already failed; the sequence reports it below
+                try:
+                    upload(image_path)
+                except Exception as e:
+                    upload_errors.append(f"Upload of {image_path} failed: {e}")
+
+        move, wait_settled = _rotation_motion(interval_seconds, "automatic capture rotation step")
+        rotation = RotationEngine(
+            targets=[[base_j1, base_j2, base_z, base_j4 + i * degrees_per_step]
+                     for i in range(num_images)],
+            move=move, wait_settled=wait_settled,
+            sample_id=sample_id, cameras=cameras,
+            on_capture=on_capture, on_view=on_view,
+            gate=rotation_capture_gate, label="AUTO CAPTURE",
+        ).run()
+        image_paths = [path for _, path in rotation.images]
+        if not image_paths:
+            raise RuntimeError("Automatic capture produced zero images - "
+                                "check camera connections.")
+        if upload_errors:
+            raise RuntimeError(upload_errors[0])
+
         publish_capture_status("completed", category=category,
                                 sample_id=fourdai_sample_id,
                                 image_paths=image_paths, values=values)
@@ -1972,7 +2490,7 @@ def _handle_move_command(payload: dict):
             handle_jog_press(axis_cmd, _via_remote=True)
         return None
 
-    current = robot_data["joints"] if robot_data["joints"] else [0.0, 0.0, 200.0, 0.0]
+    current = live_joints() or [0.0, 0.0, 200.0, 0.0]
     current = (list(current) + [0.0, 0.0, 200.0, 0.0])[:4]
     j1 = float(payload.get("j1", current[0]))
     j2 = float(payload.get("j2", current[1]))
@@ -2081,8 +2599,8 @@ def pickup_photograph_and_identify_server_dependent(pickup_x, pickup_y, pickup_z
         if move_error is not None:
             print(f"[STATION MOVE ERROR]: {move_error}")
             return
-        robot.movement.sync()
-        sync_manual_position_from_feedback("pipeline photo-station move")
+        wait_for_arm_arrival([base_j1, base_j2, base_z, base_j4], VIEW_SETTLE_SECONDS,
+                             "pipeline photo-station move")
     else:
         print(f"DEMO MODE: moving to photo station {PHOTO_STATION}")
 
@@ -2096,11 +2614,11 @@ def pickup_photograph_and_identify_server_dependent(pickup_x, pickup_y, pickup_z
         j4_target = base_j4 + (i * step_deg)
         if ROBOT_CONNECTED and robot:
             robot.movement.joint_to_joint_move([base_j1, base_j2, base_z, j4_target])
-            robot.movement.sync()
-            sync_manual_position_from_feedback(f"pipeline view {i+1}/{NUM_VIEWS} rotation")
+            wait_for_arm_arrival([base_j1, base_j2, base_z, j4_target], VIEW_SETTLE_SECONDS,
+                                 f"pipeline view {i+1}/{NUM_VIEWS} rotation")
         else:
             print(f"DEMO MODE: rotating to J4={j4_target:.1f} deg (view {i+1}/{NUM_VIEWS})")
-        sleep(VIEW_SETTLE_SECONDS)
+            sleep(VIEW_SETTLE_SECONDS)
 
         try:
             trigger_payload = {
@@ -2178,71 +2696,98 @@ def run_continuous_sweep(category="default", target_j1=0.0, target_j2=0.0, targe
     """
     Executes an arm sweep and sends photo capture triggers to
     the web server instead of using local OpenCV hardware cameras.
+
+    Sweeps from the current pose to the target joints in one move and
+    fires a trigger at the start, every SWEEP_TRIGGER_DEGREES of travel
+    on J1/J2/J3 along the way, and at the end — positions detected from
+    the live feedback stream and interpolated between packets by
+    vision.services.sweep_engine, with each trigger's HTTP request sent
+    from a worker thread so a slow server never delays the next one.
     """
-    global robot
     print(f"[SWEEP START] Category: '{category}' | Target: ({target_j1}, {target_j2}, {target_j3}, {target_j4})")
 
     sample_id = f"sweep_{int(time.time())}"
+    target = [target_j1, target_j2, target_j3, target_j4]
 
-    if ROBOT_CONNECTED and robot:
-        robot.movement.sync()
+    def send_trigger(trigger):
+        frame_recorder.mark_event(f"sweep {sample_id} trigger #{trigger.index} ({trigger.reason})",
+                                  timestamp=trigger.timestamp)
+        # Send remote trigger request to website backend
+        try:
+            trigger_payload = {
+                "category": category,
+                "sample_id": sample_id,
+                "image_index": trigger.index,
+                "source": "robotic_arm_sweep",
+                "joints": trigger.joints,
+            }
 
-    SWEEP_TRIGGER_DEGREES = 15.0
-    image_index = 0
-    last_capture_joints = [0.0, 0.0, 0.0, 0.0]
-    arm_is_moving = True
+            res = requests.post(
+                f"{SERVER_URL}/collection/trigger-webcam-capture",
+                json=trigger_payload,
+                timeout=5
+            )
+            if res.status_code == 200:
+                print(f"[REMOTE TRIGGER] Sent capture trigger #{trigger.index} for category '{category}' "
+                      f"at J=({', '.join(f'{v:.2f}' for v in trigger.joints)})")
+            else:
+                print(f"[REMOTE TRIGGER] Server returned status code {res.status_code}")
 
-    while arm_is_moving:
-        if ROBOT_CONNECTED and robot:
-            current_joints = [
-                robot.get_j1_angle(),
-                robot.get_j2_angle(),
-                robot.get_j3_angle(),
-                robot.get_j4_angle()
-            ]
-        else:
-            current_joints = [target_j1, target_j2, target_j3, target_j4]
-            arm_is_moving = False  # Single pass in simulation mode
+        except Exception as err:
+            print(f"[TRIGGER ERROR] Could not reach website trigger endpoint: {err}")
 
-        delta_j1 = abs(current_joints[0] - last_capture_joints[0])
-        delta_j2 = abs(current_joints[1] - last_capture_joints[1])
-        delta_j3 = abs(current_joints[2] - last_capture_joints[2])
+        publish_capture_status("image_triggered", category=category, sample_id=sample_id,
+                               image_index=trigger.index)
 
-        if delta_j1 >= SWEEP_TRIGGER_DEGREES or delta_j2 >= SWEEP_TRIGGER_DEGREES or delta_j3 >= SWEEP_TRIGGER_DEGREES or not arm_is_moving:
+    if not (ROBOT_CONNECTED and robot):
+        # Single pass in simulation mode: one trigger at the target.
+        send_trigger(SweepTrigger(0, target, time.monotonic(), "end"))
+        triggered = 1
+    else:
+        hard_deck_error = _hard_deck_violation(target_j3, "Continuous sweep")
+        if hard_deck_error:
+            print(f"[SWEEP ABORTED]: {hard_deck_error}")
+            publish_capture_status("failed", category=category, sample_id=sample_id,
+                                   error=hard_deck_error)
+            return
 
-            # Send remote trigger request to website backend
+        try:
+            engine = SweepEngine(telemetry_hub, SWEEP_TRIGGER_DEGREES, send_trigger).start()
+        except RuntimeError as e:
+            # No telemetry to anchor the sweep on - nothing was moved.
+            print(f"[SWEEP ABORTED]: {e}")
+            publish_capture_status("failed", category=category, sample_id=sample_id, error=str(e))
+            return
+        # The engine holds a hub subscription and a thread pool: release
+        # them however this ends (close() lets the start trigger's request
+        # finish first).
+        try:
             try:
-                trigger_payload = {
-                    "category": category,
-                    "sample_id": sample_id,
-                    "image_index": image_index,
-                    "source": "robotic_arm_sweep"
-                }
-
-                res = requests.post(
-                    f"{SERVER_URL}/collection/trigger-webcam-capture",
-                    json=trigger_payload,
-                    timeout=5
-                )
-                if res.status_code == 200:
-                    print(f"[REMOTE TRIGGER] Sent capture trigger #{image_index} for category '{category}'")
-                else:
-                    print(f"[REMOTE TRIGGER] Server returned status code {res.status_code}")
-
-            except Exception as err:
-                print(f"[TRIGGER ERROR] Could not reach website trigger endpoint: {err}")
-
-            publish_capture_status("image_triggered", category=category, sample_id=sample_id, image_index=image_index)
-            image_index += 1
-            last_capture_joints = list(current_joints)
-
-        time.sleep(0.1)
-
-    if ROBOT_CONNECTED and robot:
-        robot.movement.sync()
+                move_error = robot.movement.joint_to_joint_move(target)
+            except Exception as e:   # e.g. DobotUnavailable
+                move_error = str(e)
+            if move_error is not None:
+                print(f"[SWEEP MOVE ERROR]: {move_error}")
+                frame_recorder.mark_event(f"sweep {sample_id} move error: {move_error}", kind="error")
+                publish_capture_status("failed", category=category, sample_id=sample_id,
+                                       error=f"Sweep move rejected: {move_error}")
+                return
+            if telemetry_hub.wait_for_arrival(target, tolerance=ARRIVAL_TOLERANCE,
+                                              velocity_threshold=ARRIVAL_VELOCITY_THRESHOLD,
+                                              timeout=SWEEP_TIMEOUT_SECONDS) is None:
+                error = f"Arm didn't settle on the target within {SWEEP_TIMEOUT_SECONDS:.0f}s"
+                print(f"[SWEEP TIMEOUT]: {error}")
+                frame_recorder.mark_event(f"sweep {sample_id} arrival timeout", kind="error")
+                publish_capture_status("failed", category=category, sample_id=sample_id, error=error)
+                return
+            triggers = engine.finish(timeout=10.0)
+        finally:
+            engine.close(timeout=10.0)
+        triggered = len(triggers)
+        sync_manual_position_from_feedback("continuous sweep")
 
     publish_capture_status("completed", category=category, sample_id=sample_id)
-    print(f"[SWEEP COMPLETE] Sent {image_index} trigger request(s) for category '{category}'.")
+    print(f"[SWEEP COMPLETE] Sent {triggered} trigger request(s) for category '{category}'.")
 
 
 def _handle_capture_command_server_dependent(payload: dict) -> None:
@@ -2332,6 +2877,10 @@ def add_test_points_from_list():
 
     tk.Button(dialog, text="Insert Example", command=insert_example).pack(pady=5)
 
+    optimize_import_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(dialog, text="Optimize order (shortest travel, claw changes kept in order)",
+                   variable=optimize_import_var).pack(pady=2)
+
     # Results label
     result_label = tk.Label(dialog, text="", fg="blue")
     result_label.pack(pady=5)
@@ -2356,9 +2905,11 @@ def add_test_points_from_list():
                 messagebox.showwarning("Empty List", "The list is empty")
                 return
 
-            # Validate each point
+            # Validate each point (cheap per-point checks here; IK for the
+            # survivors is solved in one batch below)
             valid_count = 0
             invalid_count = 0
+            candidates = []  # (index in points_list, point tuple)
 
             for i, point in enumerate(points_list):
                 try:
@@ -2403,26 +2954,53 @@ def add_test_points_from_list():
                         invalid_count += 1
                         continue
 
+                    if not reach_grid.z_ok(pz):
+                        print(f"Point {i+1}: Z-value {pz:.1f} is below the height floor")
+                        invalid_count += 1
+                        continue
+
                     if not is_inside(px, py):
                         print(f"Point {i+1}: ({px:.2f}, {py:.2f}) is outside valid region")
                         invalid_count += 1
                         continue
 
-                    # Add valid point
-                    valid_points.append((px, py, pz, claw, j4_val))
-                    scatter = ax.scatter(px, py, color='purple', s=50, marker='D')  # Purple diamond for test points
-                    valid_scatters.append(scatter)
-
-                    claw_text = "ON" if claw == 1 else "OFF"
-                    j4_text_display = f"{j4_val:.1f}" if j4_val is not None else "current"
-                    points_listbox.insert(tk.END, f"{len(valid_points)}: ({px:.2f}, {py:.2f}, z={pz:.1f}, claw={claw_text}, J4={j4_text_display}) [Test]")
-                    valid_count += 1
+                    candidates.append((i, (px, py, pz, claw, j4_val)))
 
                 except Exception as e:
                     print(f"Point {i+1}: Error - {e}")
                     invalid_count += 1
                     continue
 
+            # is_inside() is only the plotted workspace outline; the batch
+            # IK also catches points the joint limits can't actually reach.
+            ik, targets = (_solve_plot_points([c[1] for c in candidates])
+                           if candidates else (None, None))
+            accepted, accepted_joints = [], []
+            for k, (i, point) in enumerate(candidates):
+                if not ik.valid[k]:
+                    print(f"Point {i+1}: {ik.message(k, targets)}")
+                    invalid_count += 1
+                    continue
+                accepted.append(point)
+                accepted_joints.append(ik.joints[k])
+
+            if optimize_import_var.get() and len(accepted) >= 3:
+                result, accepted = _optimize_point_order(accepted, accepted_joints)
+                if result.changed:
+                    print(f"Imported points reordered: est. travel {result.before_s:.1f} s -> "
+                          f"{result.after_s:.1f} s (saves {result.saved_s:.1f} s)")
+
+            for px, py, pz, claw, j4_val in accepted:
+                # Add valid point
+                valid_points.append((px, py, pz, claw, j4_val))
+                scatter = ax.scatter(px, py, color='purple', s=50, marker='D')  # Purple diamond for test points
+                valid_scatters.append(scatter)
+
+                claw_text = "ON" if claw == 1 else "OFF"
+                j4_text_display = f"{j4_val:.1f}" if j4_val is not None else "current"
+                points_listbox.insert(tk.END, f"{len(valid_points)}: ({px:.2f}, {py:.2f}, z={pz:.1f}, claw={claw_text}, J4={j4_text_display}) [Test]")
+                valid_count += 1
+
             # Update plot
             canvas.draw()
 
@@ -2456,6 +3034,10 @@ def add_test_points_from_list():
 remove_button = tk.Button(frame, text="Remove First Point (FIFO)", command=remove_first_point)
 remove_button.pack(pady=5)
 
+# Button to reorder the queue for the shortest travel
+optimize_button = tk.Button(frame, text="Optimize Order", command=optimize_queue_order)
+optimize_button.pack(pady=5)
+
 # Button to send coordinates to dobot
 send_button = tk.Button(frame, text="Send Instructions", command=add_dobot_instructions, bg="lightgreen")
 send_button.pack(pady=5)
@@ -2817,6 +3399,66 @@ def clear_object_filters():
     refresh_objects_list()
 
 
+def _show_preview(label, path: str, size: int, refs: list, on_error=None):
+    """Fill *label* with the cached *size* px preview of *path* once the
+    thumbnail service has it (see vision/storage/thumbnails.py). Decoding
+    the small JPEG happens on the service's thread; only the PhotoImage
+    is created on the Tk thread, and only if the label still exists."""
+    def done(future):
+        try:
+            img = Image.open(future.result())
+            img.load()
+            err = None
+        except Exception as e:
+            img, err = None, e
+
+        def apply():
+            if not label.winfo_exists():
+                return
+            if err is not None:
+                if on_error is not None:
+                    on_error(err)
+                return
+            photo = ImageTk.PhotoImage(img)
+            refs.append(photo)
+            # width/height were text units for the placeholder; 0 = fit the image
+            label.config(image=photo, text="", width=0, height=0)
+
+        root.after(0, apply)
+
+    request_thumbnail(path, size).add_done_callback(done)
+
+
+def open_full_image(path: str, title: str = None):
+    """Full-resolution view of one image, on demand (the detail viewers
+    only ever load the cached previews)."""
+    window = tk.Toplevel(root)
+    window.title(title or os.path.basename(path))
+    status = tk.Label(window, text="Loading...", padx=20, pady=20)
+    status.pack()
+
+    def worker():
+        try:
+            img = Image.open(path)
+            img.thumbnail((window.winfo_screenwidth() - 80, window.winfo_screenheight() - 120))
+            err = None
+        except Exception as e:
+            img, err = None, e
+
+        def apply():
+            if not window.winfo_exists():
+                return
+            if err is not None:
+                status.config(text=f"Could not load '{path}': {err}", fg="red")
+                return
+            window._photo = ImageTk.PhotoImage(img)
+            status.config(image=window._photo, text="", padx=0, pady=0)
+
+        root.after(0, apply)
+
+    threading.Thread(target=worker, daemon=True).start()
+
+
 def show_object_detail(object_id: str, viewer_title_prefix: str = "Object"):
     """Pop up a window showing one object's fixed + freeform attributes
     AND every image logged against it, oldest-first — the "click an
@@ -2931,16 +3573,21 @@ def show_object_detail(object_id: str, viewer_title_prefix: str = "Object"):
                 row.pack(fill=tk.X)
                 tk.Label(row, text=f"{source} — view {view_index}  ({when})",
                          font=("Arial", 9, "bold")).pack()
-                try:
-                    img = Image.open(path)
-                    img.thumbnail((700, 525))
-                    photo = ImageTk.PhotoImage(img)
-                    viewer._photo_refs.append(photo)
-                    tk.Label(row, image=photo).pack()
-                except Exception as e:
+                # The cached 512 px preview, filled in as it becomes ready;
+                # click it for the full-resolution image.
+                image_label = tk.Label(row, text="Loading preview...", fg="gray",
+                                       wraplength=680, cursor="hand2")
+                image_label.pack()
+                image_label.bind("<Button-1>", lambda _e, p=path, s=source, v=view_index:
+                                 open_full_image(p, f"{object_id} — {s} view {v}"))
+
+                def show_error(e, label=image_label, raw_path=raw_path, path=path):
                     hint = ("" if path == raw_path else f"\n(tried: {path})")
-                    tk.Label(row, text=f"Could not load '{raw_path}': {e}{hint}",
-                             fg="red", wraplength=680).pack()
+                    label.config(text=f"Could not load '{raw_path}': {e}{hint}",
+                                 fg="red", cursor="")
+                    label.unbind("<Button-1>")
+
+                _show_preview(image_label, path, max(THUMBNAIL_SIZES), viewer._photo_refs, show_error)
 
         root.after(0, build_ui)
 
@@ -3188,6 +3835,9 @@ def refresh_inventory_list():
     threading.Thread(target=worker, daemon=True).start()
 
 
+CATALOG_PREVIEW_LIMIT = 8
+
+
 def open_catalog_detail_viewer(event=None):
     """Inventory tab double-click handler. A catalog entry can be linked
     to several captures (times_seen > 1), so this shows the catalog
@@ -3213,9 +3863,16 @@ def open_catalog_detail_viewer(event=None):
         try:
             entries = object_catalog.list_inventory(limit=200)
             entry = next((e for e in entries if e.get("_id") == catalog_id), None)
+            # First image of each of the first few linked captures, for
+            # the preview strip (128 px cached previews, not full frames).
+            previews = []
+            for linked_id in ((entry or {}).get("linked_object_ids") or [])[:CATALOG_PREVIEW_LIMIT]:
+                docs = mongo_client.get_images_for_object(linked_id)
+                if docs:
+                    previews.append((linked_id, resolve_image_path(docs[0].get("image_path", ""))))
             err = None
         except Exception as e:
-            entry, err = None, str(e)
+            entry, previews, err = None, [], str(e)
 
         def build_ui():
             loading_label.destroy()
@@ -3243,6 +3900,19 @@ def open_catalog_detail_viewer(event=None):
                          width=12, anchor="w").pack(side=tk.LEFT)
                 tk.Label(row, text=str(value), anchor="w").pack(side=tk.LEFT)
 
+            if previews and _PIL_AVAILABLE:
+                strip = tk.Frame(viewer)
+                strip.pack(fill=tk.X, padx=10, pady=(4, 0))
+                viewer._photo_refs = []
+                for linked_id, path in previews:
+                    thumb = tk.Label(strip, text="...", fg="gray", width=16, height=6,
+                                     relief=tk.GROOVE, cursor="hand2")
+                    thumb.pack(side=tk.LEFT, padx=2)
+                    thumb.bind("<Button-1>", lambda _e, oid=linked_id: show_object_detail(oid))
+
+                    _show_preview(thumb, path, min(THUMBNAIL_SIZES), viewer._photo_refs,
+                                  lambda e, thumb=thumb: thumb.config(text="(missing)"))
+
             linked_ids = entry.get("linked_object_ids", []) or []
             tk.Label(viewer, text=f"Linked captures ({len(linked_ids)}) — "
                                    f"double-click one to see its photos + attributes:",
@@ -3718,52 +4388,35 @@ def run_data_collection_rotation_local(name, category, color, size,
                      # camera contributes more than one image (every view here).
     object_id = None
     try:
-        base_joints = list(robot_data["joints"]) if robot_data["joints"] else [0.0, 0.0, 200.0, 0.0]
+        base_joints = list(live_joints() or [0.0, 0.0, 200.0, 0.0])
         base_j1, base_j2, base_z, base_j4 = (base_joints + [0.0, 0.0, 200.0, 0.0])[:4]
         hard_deck_error = _hard_deck_violation(base_z, "Data Collection rotation sequence")
         if hard_deck_error:
             raise RuntimeError(hard_deck_error)
 
-        cameras_to_use = list_configured_cameras()
-        failed_cameras = set()
         sample_id = new_sample_id()  # just a disk-folder id (images/<id>/) — unrelated
                                       # to the Mongo object_id record_capture() mints below
 
-        for i in range(num_views):
-            if dc_cancel_event.is_set():
-                raise RuntimeError("Cancelled by user.")
-
-            j4_target = base_j4 + (i * degrees_per_step)
-            if ROBOT_CONNECTED and robot:
-                move_error = robot.movement.joint_to_joint_move([base_j1, base_j2, base_z, j4_target])
-                if move_error is not None:
-                    raise RuntimeError(f"Move failed at view {i + 1}: {move_error}")
-                robot.movement.sync()
-                sync_manual_position_from_feedback("data collection rotation step")
-            else:
-                print(f"DEMO MODE: rotating to J4={j4_target:.1f} deg (view {i + 1}/{num_views})")
-
-            sleep(interval_seconds)
-
-            _dc_set_status(f"View {i + 1}/{num_views}: capturing...")
-            captured_this_step = False
-            for camera_name in list(cameras_to_use):
-                if camera_name in failed_cameras:
-                    continue
-                try:
-                    frame = capture_frame(camera_name)
-                except (RuntimeError, ImportError) as e:
-                    print(f"[DATA COLLECTION] '{camera_name}' unavailable: {e}")
-                    failed_cameras.add(camera_name)
-                    continue
-                path = save_image(frame, sample_id, camera_name, i)
-                all_pairs.append((camera_name, path))
-                captured_this_step = True
-
-            if not captured_this_step:
+        def on_capture(i, shot):
+            _warn_capture_skew(shot, f"view {i + 1}")
+            if not shot.frames:
                 print(f"[DATA COLLECTION WARNING] No camera produced a frame for view {i + 1}")
-            _dc_set_progress(i + 1, num_views)
-
+            if i + 1 < num_views:
+                _dc_set_status(f"View {i + 1}/{num_views} captured — moving to view {i + 2}...")
+
+        move, wait_settled = _rotation_motion(interval_seconds, "data collection rotation step")
+        # RotationEngine only returns once every image is on disk, so
+        # record_capture() below can read them straight away.
+        rotation = RotationEngine(
+            targets=[[base_j1, base_j2, base_z, base_j4 + i * degrees_per_step]
+                     for i in range(num_views)],
+            move=move, wait_settled=wait_settled,
+            sample_id=sample_id, cameras=list_configured_cameras(),
+            on_capture=on_capture,
+            on_view=lambda i, pairs: _dc_set_progress(i + 1, num_views),
+            cancel_event=dc_cancel_event, gate=rotation_capture_gate, label="DATA COLLECTION",
+        ).run()
+        all_pairs = rotation.images
         if not all_pairs:
             raise RuntimeError("Rotation sequence produced zero images — check camera connections.")
 
@@ -4003,6 +4656,16 @@ def delete_selected_dc_capture():
             err = None
         except Exception as e:
             err = str(e)
+        if err is None and IMAGE_STORE_ENABLED:
+            try:
+                # Image files are left on disk (as before); this only drops
+                # the store's references, and collect_garbage() reclaims any
+                # content no image file links to any more.
+                store = get_image_store()
+                store.release_object(object_id)
+                store.collect_garbage()
+            except Exception as e:
+                print(f"[DELETE] Image store release for {object_id} failed: {e}")
 
         def apply():
             if err:
@@ -4173,7 +4836,7 @@ def manual_joint_move():
         if j4_text:
             j4 = float(j4_text)
         else:
-            current_joints = robot_data.get("joints")
+            current_joints = live_joints()
             j4 = float(current_joints[3]) if current_joints and len(current_joints) >= 4 else -35.0
         claw_state = claw_var_j.get()   # read the joint-row claw radio button
 
@@ -4211,69 +4874,124 @@ def manual_joint_move():
         messagebox.showerror("Input Error", "Please enter valid numbers for joints.")
 
 
+def _log_watchdog_stop_reply(future):
+    try:
+        timing = future.result()
+        if timing.error is not None:
+            print(f"[HARD DECK] Jog stop returned {timing.error}")
+    except Exception as e:
+        print(f"[HARD DECK] Jog stop could not be sent: {e}")
+
+
+def _hard_deck_jog_watchdog(sample):
+    """Reactive hard-deck watchdog, jog only. Subscribed to telemetry_hub
+    at the full packet rate (no rate limit) so it reacts within one 8 ms
+    feedback packet rather than one GUI frame. Jogging has no single
+    predictable target to check in advance (unlike move_to_point/
+    _handle_move_command's absolute moves, which are blocked BEFORE
+    they're ever sent instead — see the hard-deck checks there), so this
+    force-stops the instant live Z crosses below the effective floor.
+    Covers local AND remote-relayed jogging alike, since both drive the
+    same is_jogging global regardless of who's driving."""
+    global is_jogging
+    if not is_jogging:
+        return
+    live_z = sample.cartesian[2]
+    floor = _effective_hard_deck_z()
+    if floor is not None and live_z < floor:
+        # Runs on the hub's pump thread while the Tk thread may be mid-jog
+        # on the same Movement link: send_async (ManagedDobot's movement
+        # link is pipelined) keeps each reply paired with its own command,
+        # and the pump thread doesn't wait for the reply.
+        try:
+            robot.movement.send_async(commands.move_jog()).add_done_callback(_log_watchdog_stop_reply)
+        finally:
+            is_jogging = False
+        print(f"[HARD DECK] Jog stopped \u2014 Z {live_z:.1f} crossed below floor ({floor:.1f}).")
+
+
+# Newest telemetry sample waiting to be drawn; None once the Tk thread has
+# taken it. One slot (not a queue) so a busy GUI thread only ever draws the
+# latest position instead of working through a backlog.
+_gui_pending_sample = [None]
+# True while a DOBOT_REPLAY recording is playing (demo mode only): the GUI
+# then draws the replayed samples even though no robot is connected.
+_replaying = False
+
+
+def _on_gui_telemetry(sample):
+    """telemetry_hub subscriber (~30Hz): hands the sample to the Tk thread.
+    Runs on the hub's pump thread, so it only stores the sample and
+    schedules a redraw — and only if one isn't already scheduled."""
+    sample.cartesian  # materialise now; the record is a view into the ring
+    already_scheduled = _gui_pending_sample[0] is not None
+    _gui_pending_sample[0] = sample
+    if not already_scheduled:
+        try:
+            root.after(0, update_gui_from_feedback)
+        except Exception:
+            # Tk not running (before mainloop / during shutdown): empty the
+            # slot again, or every later sample would think a redraw is
+            # already on its way and the dot would never move again.
+            _gui_pending_sample[0] = None
+            raise
+
+
 def update_gui_from_feedback():
     """Refreshes the plot and labels with the robot's actual hardware
-    position. Uses blitting (see _plot_background above) so only the
-    small dot region gets redrawn each tick — the expensive workspace
-    background is never touched here — which is what keeps this able to
-    actually keep up with the 50Hz feedback feed instead of lagging."""
-    global live_dot, is_jogging
-    
-    if ROBOT_CONNECTED and "cartesian" in robot_data and robot_data["cartesian"] is not None:
-        try:
-            # 1. Get Cartesian X, Y, Z from the real-time hardware telemetry
-            raw_x = robot_data["cartesian"][0]
-            raw_y = robot_data["cartesian"][1]
-            live_z = robot_data["cartesian"][2]
-
-            # Reactive hard-deck watchdog, jog only: jogging has no single
-            # predictable target to check in advance (unlike move_to_point/
-            # _handle_move_command's absolute moves, which are blocked
-            # BEFORE they're ever sent instead — see the hard-deck checks
-            # there), so this force-stops the instant live Z crosses below
-            # the effective floor. Covers local AND remote-relayed jogging
-            # alike, since both drive the same is_jogging/robot_data
-            # globals regardless of who's driving.
-            floor = _effective_hard_deck_z()
-            if floor is not None and live_z < floor and is_jogging:
-                try:
-                    robot.movement.safe_move_jog("stop", [])
-                finally:
-                    is_jogging = False
-                print(f"[HARD DECK] Jog stopped \u2014 Z {live_z:.1f} crossed below floor ({floor:.1f}).")
-            
-            # 2. Apply rotation matrix to align with your physical desk setup
-            angle_deg = 90  # Change to -90, 180, etc. based on your setup
-            theta = np.radians(angle_deg)
-            rot_x = raw_x * np.cos(theta) - raw_y * np.sin(theta)
-            rot_y = raw_x * np.sin(theta) + raw_y * np.cos(theta)
-            
-            # 3. Update the red tracking dot on the Matplotlib plot
-            if live_dot is None:
-                live_dot = ax.scatter(rot_x, rot_y, color='red', s=100, zorder=5, label="Live Robot Pos")
-                ax.legend()
-                canvas.draw()  # one full draw to establish the legend; also
-                                # triggers _capture_plot_background via draw_event
+    position. Driven by _on_gui_telemetry rather than a polling timer, so
+    it runs only when a new position exists. Uses blitting (see
+    _plot_background above) so only the small dot region gets redrawn
+    each time — the expensive workspace background is never touched
+    here — which is what keeps this able to keep up with the feed."""
+    global live_dot
+
+    sample = _gui_pending_sample[0]
+    _gui_pending_sample[0] = None
+    if sample is None or not (ROBOT_CONNECTED or _replaying):
+        return
+    try:
+        # 1. Get Cartesian X, Y, Z from the real-time hardware telemetry
+        raw_x, raw_y, live_z = sample.cartesian[:3]
+
+        # 2. Apply rotation matrix to align with your physical desk setup
+        angle_deg = 90  # Change to -90, 180, etc. based on your setup
+        theta = np.radians(angle_deg)
+        rot_x = raw_x * np.cos(theta) - raw_y * np.sin(theta)
+        rot_y = raw_x * np.sin(theta) + raw_y * np.cos(theta)
+
+        # 3. Update the red tracking dot on the Matplotlib plot
+        if live_dot is None:
+            live_dot = ax.scatter(rot_x, rot_y, color='red', s=100, zorder=5, label="Live Robot Pos")
+            ax.legend()
+            canvas.draw()  # one full draw to establish the legend; also
+                            # triggers _capture_plot_background via draw_event
+        else:
+            live_dot.set_offsets(np.c_[rot_x, rot_y])
+            if _plot_background[0] is not None:
+                fig.canvas.restore_region(_plot_background[0])
+                ax.draw_artist(live_dot)
+                fig.canvas.blit(ax.bbox)
             else:
-                live_dot.set_offsets(np.c_[rot_x, rot_y])
-                if _plot_background[0] is not None:
-                    fig.canvas.restore_region(_plot_background[0])
-                    ax.draw_artist(live_dot)
-                    fig.canvas.blit(ax.bbox)
-                else:
-                    # Background not captured yet for some reason — fall
-                    # back to a full draw rather than showing a stale dot.
-                    fig.canvas.draw_idle()
+                # Background not captured yet for some reason — fall
+                # back to a full draw rather than showing a stale dot.
+                fig.canvas.draw_idle()
+
+        # 4. Update the text status label with X, Y, and Z
+        if 'status_label' in globals() and status_label.winfo_exists():
+            prefix = "Robot Connected" if ROBOT_CONNECTED else "Replaying Recording"
+            status_label.config(text=f"{prefix} | X: {raw_x:.1f} | Y: {raw_y:.1f} | Z: {live_z:.1f}")
+    except Exception as e:
+        print(f"GUI telemetry loop warning: {e}")
 
-            # 4. Update the text status label with X, Y, and Z
-            if 'status_label' in globals() and status_label.winfo_exists():
-                status_label.config(text=f"Robot Connected | X: {raw_x:.1f} | Y: {raw_y:.1f} | Z: {live_z:.1f}")
-        except Exception as e:
-            print(f"GUI telemetry loop warning: {e}")
 
-    # ~30Hz — closely tracks the 50Hz feedback_loop() without over-driving
-    # the GUI thread. Blitting (above) is what makes this rate affordable.
-    root.after(33, update_gui_from_feedback)
+def _on_middleman_telemetry_change(sample):
+    """telemetry_hub subscriber (deadband + 10Hz cap): pushes a telemetry
+    message to the middleman the moment the arm actually moves, instead of
+    the remote side only seeing the heartbeat-rate snapshot."""
+    controller = physical_side_controller
+    if controller is not None:
+        controller.publish_telemetry()
 
 # Connect the click event
 fig.canvas.mpl_connect('button_press_event', onclick)
@@ -4350,6 +5068,7 @@ def capture_photo_and_store():
     """
     camera_names = list(live_feed_panels.keys()) or list(list_configured_cameras().keys())
     sample_label = capture_label_var.get().strip() or "manual_snapshot"
+    pressed_at = time.monotonic()   # the snapshot is of what's in view *after* the click
     capture_status_label.config(
         text=f"Capturing '{sample_label}' from {len(camera_names)} camera(s): "
              f"{', '.join(camera_names)}...",
@@ -4360,10 +5079,14 @@ def capture_photo_and_store():
         saved_paths = {}   # camera name -> image path
         cam_errors = {}    # camera name -> error message
 
-        for cam in camera_names:
+        shot = capture_all_frames(camera_names, newer_than=pressed_at)
+        _warn_capture_skew(shot, "Capture Photo")
+        cam_errors.update(shot.errors)
+        writes = {cam: image_writer().submit(frame, sample_id, cam, 0)
+                  for cam, frame in shot.frames.items()}
+        for cam, future in writes.items():
             try:
-                frame = capture_frame(cam)
-                saved_paths[cam] = save_image(frame, sample_id, cam, 0)
+                saved_paths[cam] = future.result()
             except Exception as e:
                 cam_errors[cam] = str(e)
 
@@ -4449,12 +5172,22 @@ tk.Frame(gallery_frame, height=2, bd=1, relief=tk.SUNKEN, bg="#f0f0f0").pack(fil
 # (vision.config.CAMERAS), not just a single snapshot. Runs as a
 # self-rescheduling root.after() loop: each tick grabs one frame in a
 # background thread (camera reads shouldn't block the GUI thread), then
-# marshals the resulting PhotoImage back via root.after(0, ...) before
-# scheduling the next tick. A busy-flag prevents ticks piling up if a
-# camera read is slow. Works for however many cameras are configured -
+# marshals the result back via root.after(0, ...) before scheduling the
+# next tick. A busy-flag prevents ticks piling up if a camera read is
+# slow. Works for however many cameras are configured -
 # the dropdown is populated straight from CAMERAS, so adding a third/
 # fourth camera in vision/config.py makes it selectable here with no
 # other code changes.
+#
+# Keeping the GUI thread free: the worker thread downsizes each frame to
+# preview size in OpenCV and converts it into the panel's reusable
+# buffers (frame_to_preview_rgb), and builds the small PIL image; the
+# only per-frame work left on the Tk thread is PhotoImage.paste() into
+# the panel's one long-lived PhotoImage. Each panel also measures how
+# long its frames wait in the Tk queue and backs its own rate off
+# (towards LIVE_FEED_MIN_FPS) while the GUI thread is behind, e.g. busy
+# with the 50 Hz plot; and nothing is converted at all while the Camera
+# tab is hidden or the window minimised.
 # =============================================================================
 tk.Label(gallery_frame, text="Live Camera Feed (USB, all cameras at once)",
          font=("Arial", 11, "bold"), bg="#f0f0f0").pack(pady=(10, 5))
@@ -4468,7 +5201,7 @@ tk.Label(gallery_frame, text="Live Camera Feed (USB, all cameras at once)",
 # additional USB cameras you add to CAMERAS) are all live at once.
 _camera_names = list(list_configured_cameras().keys()) or ["station"]
 
-live_feed_panels = {}  # camera name -> {"image_label", "status_label", "busy"}
+live_feed_panels = {}  # camera name -> {"image_label", "status_label", "busy", ...} (see below)
 
 live_feeds_container = tk.Frame(gallery_frame, bg="#f0f0f0")
 live_feeds_container.pack(fill=tk.BOTH, expand=1, padx=4, pady=4)
@@ -4494,6 +5227,11 @@ for _feed_i, _cam_name in enumerate(_camera_names):
 
     live_feed_panels[_cam_name] = {
         "image_label": _img_lbl, "status_label": _status_lbl, "busy": False,
+        "photo": None,          # the panel's PhotoImage, pasted into each frame
+        "buffers": {},          # frame_to_preview_rgb()'s reusable arrays
+        "last_frame_ts": None,  # grab time of the frame on screen (skip repeats)
+        "interval_ms": int(1000 / LIVE_FEED_FPS),  # current per-panel tick period
+        "paused": False,        # hidden-tab state, so the status only changes once
     }
 
 live_feed_button_row = tk.Frame(gallery_frame, bg="#f0f0f0")
@@ -4504,10 +5242,30 @@ live_feed_active = False
 
 def _schedule_next_live_feed_tick(camera_name, delay_ms=None):
     if live_feed_active:
-        root.after(delay_ms or int(1000 / LIVE_FEED_FPS),
+        root.after(delay_ms or live_feed_panels[camera_name]["interval_ms"],
                    lambda: _live_feed_tick(camera_name))
 
 
+def _live_feed_visible() -> bool:
+    try:
+        return notebook.select() == str(tab_camera) and root.state() != "iconic"
+    except tk.TclError:
+        return False
+
+
+def _adapt_live_feed_rate(panel, queue_delay_s: float) -> None:
+    """Slow a panel down while its frames wait in the Tk queue for more
+    than half a frame period; speed back up once they're handled
+    promptly again."""
+    fastest = int(1000 / LIVE_FEED_FPS)
+    slowest = int(1000 / LIVE_FEED_MIN_FPS)
+    delay_ms = queue_delay_s * 1000
+    if delay_ms > fastest * 0.5:
+        panel["interval_ms"] = min(slowest, int(panel["interval_ms"] * 1.5))
+    elif delay_ms < fastest * 0.1:
+        panel["interval_ms"] = max(fastest, int(panel["interval_ms"] * 0.9))
+
+
 def _live_feed_tick(camera_name):
     if not live_feed_active:
         return
@@ -4517,13 +5275,24 @@ def _live_feed_tick(camera_name):
         # tick rather than piling up threads.
         _schedule_next_live_feed_tick(camera_name)
         return
+    if not _live_feed_visible():
+        if not panel["paused"]:
+            panel["paused"] = True
+            panel["status_label"].config(text="Paused (tab hidden)", fg="gray")
+        _schedule_next_live_feed_tick(camera_name, delay_ms=LIVE_FEED_HIDDEN_POLL_MS)
+        return
+    panel["paused"] = False
 
     panel["busy"] = True
 
     def grab():
         try:
-            frame = capture_frame(camera_name)
-            rgb = frame_to_rgb(frame)
+            frame, frame_ts = capture_timestamped_frame(camera_name)
+            if frame_ts == panel["last_frame_ts"]:
+                img = None   # nothing new since the last tick — don't redo the work
+            else:
+                rgb = frame_to_preview_rgb(frame, LIVE_FEED_MAX_SIZE, panel["buffers"])
+                img = Image.frombuffer("RGB", (rgb.shape[1], rgb.shape[0]), rgb, "raw", "RGB", 0, 1)
         except Exception as e:
             msg = str(e)
 
@@ -4538,18 +5307,24 @@ def _live_feed_tick(camera_name):
             root.after(0, on_error)
             return
 
+        queued_at = time.monotonic()
+
         def apply():
             try:
-                if _PIL_AVAILABLE:
-                    img = Image.fromarray(rgb)
-                    img.thumbnail((480, 360))
-                    photo = ImageTk.PhotoImage(img)
-                    panel["image_label"].image = photo  # keep a reference
-                    panel["image_label"].config(image=photo, text="")
-                    panel["status_label"].config(text="Live", fg="green")
-                else:
-                    panel["image_label"].config(
-                        text="Pillow not installed.\nRun: pip install Pillow")
+                if img is not None:
+                    photo = panel["photo"]
+                    if photo is None or (photo.width(), photo.height()) != img.size:
+                        # First frame (or the camera's resolution changed).
+                        photo = panel["photo"] = ImageTk.PhotoImage(img)
+                        panel["image_label"].image = photo  # keep a reference
+                        panel["image_label"].config(image=photo, text="")
+                    else:
+                        photo.paste(img)
+                    panel["last_frame_ts"] = frame_ts
+                _adapt_live_feed_rate(panel, time.monotonic() - queued_at)
+                status = f"Live ({1000 / panel['interval_ms']:.0f} fps)"
+                if panel["status_label"].cget("text") != status:
+                    panel["status_label"].config(text=status, fg="green")
             finally:
                 panel["busy"] = False
                 _schedule_next_live_feed_tick(camera_name)
@@ -4652,9 +5427,10 @@ def _do_assign_camera(cam_name):
             fg="red")
         return
     try:
-        assign_camera(cam_name, idx)
+        device = assign_camera(cam_name, idx)
         camera_assign_status.config(
-            text=f"'{cam_name}' assigned to device index {idx}. Takes effect on the "
+            text=f"'{cam_name}' assigned to device index {idx}"
+                 f"{' (' + device.describe() + ')' if device else ''}. Takes effect on the "
                  f"next capture/live-feed frame immediately.",
             fg="green")
     except Exception as e:
@@ -4675,12 +5451,13 @@ def _do_add_camera():
             fg="red")
         return
     try:
-        assign_camera(name, idx)
+        device = assign_camera(name, idx)
         new_cam_name_var.set("")
         new_cam_index_var.set("")
         _rebuild_camera_assign_rows()
         camera_assign_status.config(
-            text=f"Added camera '{name}' at device index {idx}. It's usable now by "
+            text=f"Added camera '{name}' at device index {idx}"
+                 f"{' (' + device.describe() + ')' if device else ''}. It's usable now by "
                  f"'Capture Photo — All Cameras' and automatic capture right away; "
                  f"restart the app to also give it its own Live Feed preview panel above.",
             fg="green")
@@ -4689,33 +5466,37 @@ def _do_add_camera():
 
 
 def _do_detect_cameras():
-    camera_assign_status.config(text="Detecting cameras (probing indices 0-4)...", fg="gray")
+    # An explicit Detect always rescans (all indices at once — see
+    # CameraDiscovery); cameras already open for the live feed / captures
+    # are reported from their handles, not reopened.
+    last = camera_discovery.max_index - 1
+    camera_assign_status.config(text=f"Detecting cameras (probing indices 0-{last})...", fg="gray")
 
-    def worker():
-        try:
-            found = list_camera_indices()
-        except Exception as e:
-            found = None
-            err = str(e)
+    def on_scanned(found, error):
         def report():
             if found is None:
-                camera_assign_status.config(text=f"Detection failed: {err}", fg="red")
+                camera_assign_status.config(text=f"Detection failed: {error}", fg="red")
             elif found:
                 camera_assign_status.config(
-                    text=f"Working device indices found: {found}. Enter one of these "
-                         f"above and click Assign for the camera you want it on.",
+                    text="Working devices found: "
+                         + "; ".join(d.describe() for _, d in sorted(found.items()))
+                         + ". Enter one of these indices above and click Assign for "
+                           "the camera you want it on.",
                     fg="green")
             else:
                 camera_assign_status.config(
-                    text="No working camera devices found on indices 0-4. Check "
+                    text=f"No working camera devices found on indices 0-{last}. Check "
                          "connections and that no other program has them open.",
                     fg="orange")
         root.after(0, report)
 
-    threading.Thread(target=worker, daemon=True).start()
+    camera_discovery.scan_in_background(on_scanned, refresh=True)
 
 
 _rebuild_camera_assign_rows()
+# Warm the discovery cache in the background at startup, so the first
+# Assign / Detect has device identities on hand without blocking on a probe.
+camera_discovery.scan_in_background()
 
 camera_assign_new_row = tk.Frame(camera_assign_frame)
 camera_assign_new_row.pack(fill=tk.X, pady=(8, 0))
@@ -4730,6 +5511,60 @@ tk.Button(camera_assign_new_row, text="Add Camera", bg="lightgreen",
 tk.Button(camera_assign_new_row, text="Detect Cameras", bg="khaki",
           command=_do_detect_cameras).pack(side=tk.LEFT)
 
+# ---- Frame history (vision/camera/frame_ring.py) ----------------------
+# Only when FRAME_RING_ENABLED: the cameras' last few seconds are kept in
+# memory and the frames around a marked event (sweep trigger, rotation
+# view, camera error) are saved to images/clips/ from here - and only
+# from here.
+if FRAME_RING_ENABLED:
+    frame_history_frame = tk.LabelFrame(gallery_frame, text=" Frame History ", padx=8, pady=6)
+    frame_history_frame.pack(fill=tk.X, padx=4, pady=(0, 10))
+    frame_history_row = tk.Frame(frame_history_frame)
+    frame_history_row.pack(fill=tk.X)
+    tk.Label(frame_history_row, text="Around:").pack(side=tk.LEFT)
+    frame_history_event_var = tk.StringVar(value="Now")
+    _frame_history_events = []
+
+    def _refresh_frame_history_events():
+        global _frame_history_events
+        _frame_history_events = list(reversed(frame_recorder.events()))
+        frame_history_combo["values"] = ["Now"] + [e.describe() for e in _frame_history_events]
+
+    frame_history_combo = ttk.Combobox(frame_history_row, textvariable=frame_history_event_var,
+                                       width=48, state="readonly",
+                                       postcommand=_refresh_frame_history_events)
+    frame_history_combo.pack(side=tk.LEFT, padx=(2, 8))
+    frame_history_video_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(frame_history_row, text="Also save video",
+                   variable=frame_history_video_var).pack(side=tk.LEFT, padx=(0, 8))
+    frame_history_status = tk.Label(frame_history_frame, text="", fg="gray",
+                                    font=("Arial", 8), wraplength=520, justify=tk.LEFT)
+    frame_history_status.pack(anchor=tk.W, pady=(4, 0))
+
+    def _do_export_frame_history():
+        choice = frame_history_combo.current()
+        event = _frame_history_events[choice - 1] if choice > 0 else None
+        video = frame_history_video_var.get()
+        frame_history_status.config(text="Saving frames...", fg="gray")
+
+        def worker():
+            try:
+                clip_dir = frame_recorder.export(event, video=video)
+                msg, color = f"Saved to {clip_dir}", "green"
+            except Exception as e:
+                msg, color = f"Could not save frames: {e}", "red"
+            root.after(0, lambda: frame_history_status.config(text=msg, fg=color))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    tk.Button(frame_history_row, text="Save Frames", bg="lightblue",
+              command=_do_export_frame_history).pack(side=tk.LEFT)
+
+    try:
+        frame_recorder.start()
+    except Exception as e:
+        frame_history_status.config(text=f"Frame history unavailable: {e}", fg="red")
+
 tk.Label(tab_laser, text="Laser Control", font=("Arial", 12, "bold")).pack(pady=(10, 0))
 
 # =============================================================================
@@ -5293,7 +6128,31 @@ root.bind("<KeyRelease-e>",   handle_jog_release)
 
 
 
-update_gui_from_feedback()
+# Live-telemetry consumers. Each gets its own rate limit / deadband from the
+# hub, so the GUI, the hard-deck watchdog and the middleman mirror no longer
+# share one polling loop (or its lag).
+telemetry_hub.subscribe(_on_gui_telemetry, max_rate_hz=30, name="gui")
+telemetry_hub.subscribe(_hard_deck_jog_watchdog, name="hard-deck jog watchdog")
+telemetry_hub.subscribe(_on_middleman_telemetry_change, max_rate_hz=10, deadband=0.05,
+                        name="middleman telemetry")
+
+# DOBOT_REPLAY=<recording.dtr>[,<speed>] plays a flight recording back
+# through telemetry_hub — GUI dot, middleman mirror and all — so a past run
+# can be watched again. Demo mode only: replayed poses must never reach
+# anything that would act on a real arm.
+if os.environ.get("DOBOT_REPLAY") and not ROBOT_CONNECTED:
+    _replay_path, _, _replay_speed = os.environ["DOBOT_REPLAY"].partition(",")
+
+    def _run_replay():
+        global _replaying
+        try:
+            count = replay_telemetry(_replay_path, telemetry_hub, float(_replay_speed or 1.0))
+            print(f"[TELEMETRY] Replayed {count} packets from {_replay_path}")
+        finally:
+            _replaying = False
+
+    _replaying = True   # lets update_gui_from_feedback draw without a robot
+    threading.Thread(target=_run_replay, name="telemetry-replay", daemon=True).start()
 refresh_objects_list()
 refresh_images_list()
 
@@ -5314,12 +6173,36 @@ start_capture_command_listener_server_dependent()
 start_move_command_listener()
 
 
+def _collect_image_store_garbage():
+    """Reclaim stored content whose image files were deleted while the
+    app wasn't running (vision/storage/image_store.py)."""
+    try:
+        removed = get_image_store().collect_garbage()
+        if removed:
+            print(f"[IMAGE STORE] Reclaimed {removed} unreferenced image(s)")
+    except Exception as e:
+        print(f"[IMAGE STORE] Garbage collection failed: {e}")
+
+
+if IMAGE_STORE_ENABLED:
+    threading.Thread(target=_collect_image_store_garbage, name="image-store-gc", daemon=True).start()
+
+
 def on_app_close():
     """Release camera handles, the laser's serial connection, and the
     MQTT client cleanly on exit rather than leaving them open/locked."""
     global live_feed_active
     live_feed_active = False  # stop the self-rescheduling live feed loop
 
+    try:
+        close_image_writer()   # finish writing any images still queued
+    except Exception as e:
+        print(f"[CLEANUP] Image writer shutdown failed: {e}")
+    try:
+        close_thumbnail_service()   # queued previews are just regenerated next time
+    except Exception as e:
+        print(f"[CLEANUP] Thumbnail service shutdown failed: {e}")
+
     try:
         from vision.camera.capture import release_all
         release_all()
@@ -5363,6 +6246,12 @@ def on_app_close():
     except Exception as e:
         print(f"[CLEANUP] Other Side controller stop skipped: {e}")
 
+    try:
+        if telemetry_recorder is not None:
+            telemetry_recorder.close()   # writes out the last partial chunk
+    except Exception as e:
+        print(f"[CLEANUP] Telemetry recorder close skipped: {e}")
+
     try:
         from vision.messaging.publisher import disconnect as disconnect_mqtt
         disconnect_mqtt()
@@ -0,0 +1,191 @@
+"""
+Benchmark for dobot_util against the local simulated controller
+(dobot_util.sim_controller.SimulatedController) — no arm required.
+
+WHAT THIS MEASURES
+-------------------
+  - Command throughput: N dashboard queries sent the old blocking way
+    (one round trip each) vs. the same N as one pipelined send_many()
+    burst vs. N concurrent coroutines on dobot_util.aio.AsyncDobot, with
+    optional injected reply latency so the gap looks like it does over
+    the real network.
+  - Feedback decoding: packets/s and per-packet cost of the original
+    Feedback.get_feedback() (bytes + np.frombuffer per packet) vs.
+    FeedbackRing's recv_into() ring, plus how many packets each saw over
+    the same window — the simulator can drop packets on purpose to
+    check nothing downstream assumes a gapless stream.
+  - A rotation loop end to end: N J4 steps, each waited out with
+    TelemetryHub.wait_for_arrival(), the way main.py's capture loops now
+    do, vs. the old Sync() + fixed settle sleep.
+
+HOW TO RUN
+-----------
+    From the repo root:
+        python -m testing_scripts.bench_dobot_sim
+        python -m testing_scripts.bench_dobot_sim --latency 0.002 --drop-rate 0.01
+    (python testing_scripts/bench_dobot_sim.py works too.)
+
+    The rotation sweep is centred on J4 = 0 so it stays inside
+    Movement.SAFE_LIMITS["J4"]; a --steps/--step-deg combination wider
+    than that range is refused rather than timed.
+
+    It binds the real controller ports (29999/30003/30004) on 127.0.0.1,
+    so nothing else may be listening there (including main.py started
+    with DOBOT_SIMULATOR=1).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+if __package__ in (None, ""):
+    # Run as a plain script: make the repo root importable.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dobot_util import AsyncDobot, Dobot, FeedbackRing, TelemetryHub
+from dobot_util.api import Movement
+from dobot_util.sim_controller import SimulatedController
+
+
+def bench_commands(robot: Dobot, count: int) -> None:
+    start = time.perf_counter()
+    for _ in range(count):
+        robot.dashboard.send_command("RobotMode()")
+    blocking = time.perf_counter() - start
+
+    start = time.perf_counter()
+    timings = robot.dashboard.send_many(["RobotMode()"] * count)
+    pipelined = time.perf_counter() - start
+    errors = sum(1 for t in timings if t.error is not None)
+
+    print(f"[COMMANDS] {count} x RobotMode()")
+    print(f"    blocking  : {blocking * 1000:8.1f} ms  ({count / blocking:8.0f} cmd/s)")
+    print(f"    pipelined : {pipelined * 1000:8.1f} ms  ({count / pipelined:8.0f} cmd/s)"
+          f"  speedup x{blocking / pipelined:.1f}, {errors} error replies")
+
+
+def bench_async_commands(count: int) -> None:
+    async def run():
+        robot = await AsyncDobot.connect("127.0.0.1")
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(*(robot.dashboard.robot_mode() for _ in range(count)))
+            return time.perf_counter() - start
+        finally:
+            await robot.close()
+
+    elapsed = asyncio.run(run())
+    print(f"    asyncio   : {elapsed * 1000:8.1f} ms  ({count / elapsed:8.0f} cmd/s)"
+          f"  ({count} concurrent coroutines, one connection)")
+
+
+def _drain(feedback, seconds: float = 0.2) -> None:
+    """Throw away whatever piled up in the socket since connecting, so
+    both readers start from a live stream rather than a backlog."""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        feedback.get_feedback()
+
+
+def bench_feedback(robot: Dobot, seconds: float) -> None:
+    """Packets/s actually received plus CPU time per packet — thread_time()
+    excludes time spent blocked waiting for the next 8 ms packet, so this
+    is the decode/copy cost alone."""
+    feedback = robot.feedback
+
+    _drain(feedback)
+    got = 0
+    cpu0, deadline = time.thread_time(), time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if feedback.get_feedback() is not None:
+            got += 1
+    cpu = time.thread_time() - cpu0
+    print(f"[FEEDBACK] get_feedback() : {got / seconds:6.1f} pkt/s, "
+          f"{cpu / max(got, 1) * 1e6:6.1f} us CPU/packet")
+
+    _drain(feedback)
+    ring = FeedbackRing(feedback)
+    got = 0
+    cpu0, deadline = time.thread_time(), time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if ring.read_next():
+            got += 1
+    cpu = time.thread_time() - cpu0
+    print(f"[FEEDBACK] FeedbackRing   : {got / seconds:6.1f} pkt/s, "
+          f"{cpu / max(got, 1) * 1e6:6.1f} us CPU/packet")
+
+
+def bench_rotation(robot: Dobot, steps: int, step_deg: float, settle: float) -> None:
+    low, high = Movement.SAFE_LIMITS["J4"]
+    first = -steps * step_deg / 2.0        # centred on J4 = 0
+    if first < low or first + steps * step_deg > high:
+        raise SystemExit(f"[ROTATION] {steps} x {step_deg:g} deg doesn't fit in J4 "
+                         f"[{low:g}, {high:g}]; use fewer/smaller steps.")
+
+    robot.dashboard.enable()
+    ring = FeedbackRing(robot.feedback).start()
+    hub = TelemetryHub().attach(ring)
+    hub.wait_for_sample(0, timeout=2.0)
+
+    def move(target):
+        error = robot.movement.joint_mov_j(target)
+        if error is not None:
+            raise RuntimeError(f"JointMovJ({target}) rejected: {error}")
+
+    def run(use_feedback: bool) -> float:
+        move([0.0, 0.0, 200.0, first])
+        robot.movement.sync()
+        start = time.perf_counter()
+        for i in range(1, steps + 1):
+            target = [0.0, 0.0, 200.0, first + i * step_deg]
+            move(target)
+            if use_feedback:
+                if hub.wait_for_arrival(target, timeout=10.0) is None:
+                    print(f"    step {i}: no arrival within 10 s")
+            else:
+                robot.movement.sync()
+                time.sleep(settle)
+        return time.perf_counter() - start
+
+    old = run(use_feedback=False)
+    new = run(use_feedback=True)
+    print(f"[ROTATION] {steps} steps of {step_deg:g} deg")
+    print(f"    Sync() + {settle:g}s sleep : {old:6.2f} s")
+    print(f"    wait_for_arrival()   : {new:6.2f} s")
+    ring.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--commands", type=int, default=500)
+    parser.add_argument("--feedback-seconds", type=float, default=2.0)
+    parser.add_argument("--steps", type=int, default=8)
+    parser.add_argument("--step-deg", type=float, default=45.0)
+    parser.add_argument("--settle", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds of injected delay before every reply")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    sim = SimulatedController(latency=args.latency, error_rate=args.error_rate,
+                              drop_rate=args.drop_rate, seed=0).start()
+    try:
+        print("Connecting to simulated controller...")
+        robot = Dobot("127.0.0.1")
+        bench_commands(robot, args.commands)
+        bench_async_commands(args.commands)
+        bench_feedback(robot, args.feedback_seconds)
+        bench_rotation(robot, args.steps, args.step_deg, args.settle)
+        print(f"[SIM] {sim.commands_handled} commands handled, {sim.packets_sent} packets sent, "
+              f"{sim.packets_dropped} dropped")
+    finally:
+        sim.stop()
+
+
+if __name__ == "__main__":
+    main()
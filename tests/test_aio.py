@@ -0,0 +1,33 @@
+import pytest
+
+from dobot_util.aio import BlockingDobot
+from dobot_util.sim_controller import SimulatedController
+from dobot_util.types import RobotMode
+
+# The async clients always use the standard ports, so the simulator gets a
+# loopback address of its own instead.
+HOST = "127.0.0.77"
+
+
+@pytest.fixture
+def robot():
+    sim = SimulatedController(host=HOST).start()
+    robot = BlockingDobot(HOST)
+    yield robot
+    robot.close()
+    sim.stop()
+
+
+def test_blocking_wrapper_drives_the_async_client(robot):
+    assert robot.dashboard.enable() is None
+    assert robot.dashboard.robot_mode() == RobotMode.ENABLE
+    assert robot.movement.joint_mov_j([10, -20, 120, 30]) is None
+    assert robot.movement.sync() is None
+    assert robot.dashboard.get_angle()[:4] == pytest.approx([10, -20, 120, 30], abs=1e-3)
+
+
+def test_submit_runs_coroutines_on_the_shared_loop(robot):
+    robot.dashboard.enable()
+    timings = robot.submit(robot.aio.movement.joint_mov_j_many([[0, 0, 100, 0], [5, 5, 110, 0]])).result(5)
+    assert [t.error for t in timings] == [None, None]
+    assert robot.movement.sync() is None
@@ -0,0 +1,110 @@
+import socket
+
+import numpy as np
+
+from dobot_util.api import Feedback, FeedbackRing
+from dobot_util.types import FeedbackType
+
+
+def packet(number):
+    rec = np.zeros(1, dtype=FeedbackType)
+    rec[0]['len'] = Feedback.PACKET_SIZE
+    rec[0]['q_actual'][0] = number
+    return rec.tobytes()
+
+
+class ChunkedSocket:
+    """Serves numbered packets in *chunk*-byte pieces; socket.timeout once
+    the queued bytes run out, like the real 0.5 s read timeout."""
+
+    def __init__(self, chunk=1000):
+        self.chunk = chunk
+        self.data = bytearray()
+
+    def queue(self, first, count):
+        for number in range(first, first + count):
+            self.data += packet(number)
+
+    def recv_into(self, view):
+        if not self.data:
+            raise socket.timeout()
+        n = min(len(view), self.chunk, len(self.data))
+        view[:n] = self.data[:n]
+        del self.data[:n]
+        return n
+
+
+class FakeFeedback:
+    def __init__(self):
+        self.socket = ChunkedSocket()
+
+
+def make_ring(capacity=8):
+    feedback = FakeFeedback()
+    ring = FeedbackRing(feedback, seconds=capacity * 0.008)
+    assert ring.capacity == capacity
+    return ring, feedback.socket
+
+
+def read_all(ring):
+    while ring.read_next():
+        pass
+
+
+def numbers(records):
+    return [int(v) for v in records['q_actual'][:, 0]]
+
+
+def test_window_stays_contiguous_across_the_wrap():
+    ring, sock = make_ring()
+    sock.queue(0, 19)
+    read_all(ring)
+
+    assert ring.count == 19
+    assert numbers(ring.latest()) == [18]
+    # Capacity - 1 packets at most, oldest first, as one view.
+    window = ring.window(100)
+    assert numbers(window) == list(range(12, 19))
+    assert np.shares_memory(window, ring._records)
+    assert numbers(ring.window(3)) == [16, 17, 18]
+    assert len(ring.arrival_times(7)) == 7
+    assert np.all(np.diff(ring.arrival_times(7)) >= 0)
+
+
+def test_partial_packet_resumes_after_timeout():
+    ring, sock = make_ring()
+    sock.queue(0, 1)
+    sock.data += packet(1)[:500]
+    assert ring.read_next() is True
+    assert ring.read_next() is False     # half a packet, then timeout
+    assert ring.count == 1
+    sock.data += packet(1)[500:]
+    assert ring.read_next() is True
+    assert numbers(ring.window(2)) == [0, 1]
+
+
+def test_packets_after_across_several_laps():
+    ring, sock = make_ring()
+    sock.queue(0, 5)
+    read_all(ring)
+    # *after* is a count: everything past the first two packets.
+    records, arrival, seen = ring.packets_after(2)
+    assert numbers(records) == [2, 3, 4] and len(arrival) == 3 and seen == 5
+
+    sock.queue(5, 20)
+    read_all(ring)
+    # Fell more than a lap behind: only what the ring still holds.
+    records, _, seen = ring.packets_after(seen)
+    assert seen == 25
+    assert numbers(records) == list(range(18, 25))
+
+
+def test_at_and_since_read_the_wrapped_history():
+    ring, sock = make_ring()
+    sock.queue(0, 13)
+    read_all(ring)
+    arrival = ring.arrival_times(7)
+
+    assert numbers(ring.at(arrival[3])) == [9]
+    assert ring.at(arrival[0] - 1.0) is None
+    assert numbers(ring.since(1e6)) == list(range(6, 13))
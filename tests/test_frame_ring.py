@@ -0,0 +1,35 @@
+from vision.camera.frame_ring import FrameRing, RingFrame
+
+
+def frame(t, size=100):
+    return RingFrame(timestamp=t, wall_time=t, jpeg=b"x" * size, width=4, height=3)
+
+
+def test_ring_is_bounded_by_age():
+    ring = FrameRing(seconds=2.0, fps=1000, max_bytes=1 << 20)
+    for i in range(50):
+        ring.push(frame(i * 0.1))
+    kept = ring.frames()
+    assert kept[0].timestamp >= kept[-1].timestamp - 2.0
+    assert kept[-1].timestamp == 4.9
+    assert ring.stats()["span_s"] <= 2.0
+
+
+def test_ring_is_bounded_by_bytes():
+    ring = FrameRing(seconds=100.0, fps=1000, max_bytes=1000)
+    for i in range(30):
+        ring.push(frame(i * 0.01, size=300))
+    stats = ring.stats()
+    assert stats["bytes"] <= 1000 and stats["frames"] == 3
+    assert ring.frames()[-1].timestamp == 0.29
+
+
+def test_frame_rate_decimation_and_windows():
+    ring = FrameRing(seconds=100.0, fps=8, max_bytes=1 << 20)
+    for i in range(100):
+        t = i / 32                        # 32 fps offered
+        if ring.wants(t):
+            ring.push(frame(t))
+    assert ring.stats()["frames"] == 25
+    window = ring.frames(1.0, 1.5)
+    assert window and all(1.0 <= f.timestamp <= 1.5 for f in window)
@@ -0,0 +1,59 @@
+import os
+import time
+
+import pytest
+
+from vision.storage.image_store import ImageStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)          # _is_ours() is relative to ./images
+    os.makedirs("images/captures")
+    return ImageStore(str(tmp_path / "images" / "store"))
+
+
+def test_identical_bytes_are_stored_once(store):
+    first, existed = store.put_bytes(b"frame" * 100, "images/captures/a.jpg")
+    assert not existed
+    second, existed = store.put_bytes(b"frame" * 100, "images/captures/b.jpg")
+    assert existed and second == first
+    assert os.path.samefile("images/captures/a.jpg", "images/captures/b.jpg")
+    stats = store.stats()
+    assert stats["blobs"] == 1 and stats["saved_bytes"] == 500
+
+
+def test_foreign_files_are_copied_not_linked(store, tmp_path):
+    package = tmp_path / "package" / "img.jpg"
+    package.parent.mkdir()
+    package.write_bytes(b"imported" * 50)
+    digest = store.copy_in(str(package), "images/captures/imported.jpg")
+    assert os.stat(package).st_nlink == 1
+    assert store.contains(digest)
+    assert open("images/captures/imported.jpg", "rb").read() == b"imported" * 50
+
+
+def test_in_place_rewrite_drops_the_stale_blob(store):
+    digest, _ = store.put_bytes(b"original" * 100, "images/captures/a.jpg")
+    time.sleep(0.01)
+    with open("images/captures/a.jpg", "r+b") as f:
+        f.write(b"XX")
+    assert store.hash_for_path("images/captures/a.jpg", ingest=False) is None
+    assert not store.contains(digest)
+    again, existed = store.put_bytes(b"original" * 100, "images/captures/c.jpg")
+    assert again == digest and not existed
+    assert open("images/captures/c.jpg", "rb").read() == b"original" * 100
+
+
+def test_garbage_is_only_collected_once_unreferenced_and_unlinked(store):
+    digest, _ = store.put_bytes(b"keep me" * 10, "images/captures/a.jpg")
+    store.add_reference("images/captures/a.jpg", "object-1", "image-1")
+    assert store.find(digest) == [{"object_id": "object-1", "image_id": "image-1",
+                                   "path": os.path.abspath("images/captures/a.jpg")}]
+    assert store.collect_garbage() == 0              # referenced
+    assert store.release_object("object-1") == 1
+    assert store.collect_garbage() == 0              # a.jpg still links to it
+    os.remove("images/captures/a.jpg")
+    assert store.collect_garbage() == 1
+    assert not store.contains(digest)
+    assert store.stats()["blobs"] == 0
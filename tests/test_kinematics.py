@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from dobot_util import kinematics
+from dobot_util.kinematics import IKFailure, solve_ik_batch
+
+
+def forward(j1, j2):
+    t1, t2 = np.radians(j1), np.radians(j2)
+    x = kinematics.L1 * np.cos(t1) + kinematics.L2 * np.cos(t1 + t2)
+    y = kinematics.L1 * np.sin(t1) + kinematics.L2 * np.sin(t1 + t2)
+    return x, y
+
+
+def test_round_trip_through_forward_kinematics():
+    rng = np.random.default_rng(0)
+    j1 = rng.uniform(kinematics.J1_MIN, kinematics.J1_MAX, 2000)
+    j2 = rng.uniform(kinematics.J2_MIN, kinematics.J2_MAX, 2000)
+    x, y = forward(j1, j2)
+    batch = solve_ik_batch(np.column_stack((x, y, np.full_like(x, 100.0), np.full_like(x, 30.0))))
+
+    # Some reachable points have no elbow solution within limits, but every
+    # solution returned must land back on its target.
+    assert batch.valid.mean() > 0.9
+    fx, fy = forward(batch.joints[batch.valid, 0], batch.joints[batch.valid, 1])
+    np.testing.assert_allclose(fx, x[batch.valid], atol=1e-6)
+    np.testing.assert_allclose(fy, y[batch.valid], atol=1e-6)
+    assert np.all(batch.joints[batch.valid, 2] == 100.0)
+    assert np.all(batch.joints[batch.valid, 3] == 30.0)
+
+
+def test_solutions_stay_within_joint_limits():
+    xs, ys = np.meshgrid(np.linspace(-420, 420, 85), np.linspace(-420, 420, 85))
+    batch = solve_ik_batch(np.column_stack((xs.ravel(), ys.ravel())))
+    j = batch.joints[batch.valid]
+    assert np.all((kinematics.J1_MIN <= j[:, 0]) & (j[:, 0] <= kinematics.J1_MAX))
+    assert np.all((kinematics.J2_MIN <= j[:, 1]) & (j[:, 1] <= kinematics.J2_MAX))
+    assert np.isnan(batch.joints[~batch.valid]).all()
+
+
+def test_failure_reasons():
+    batch = solve_ik_batch([[500.0, 0.0, 100.0, 0.0],     # beyond L1 + L2
+                            [300.0, 0.0, 300.0, 0.0],     # Z too high
+                            [300.0, 0.0, 100.0, 0.0]])
+    assert batch.reason.tolist() == [IKFailure.OUT_OF_REACH, IKFailure.Z_RANGE, IKFailure.OK]
+    assert batch.first_invalid() == 0
+    assert "out of reach" in batch.message(0)
+
+
+def test_rejects_badly_shaped_input():
+    with pytest.raises(ValueError):
+        solve_ik_batch(np.zeros((3, 3)))
@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from dobot_util import metrics
+from dobot_util.metrics import CommandMetrics, LatencyHistogram, _bucket_index, _bucket_upper
+
+
+def test_buckets_round_trip_within_resolution():
+    previous_upper = -1
+    for index in range(metrics._BUCKETS - 1):
+        upper = _bucket_upper(index)
+        assert upper > previous_upper                     # buckets are contiguous...
+        assert _bucket_index(previous_upper + 1) == index
+        assert _bucket_index(upper) == index              # ...and their bounds map back
+        lower = previous_upper + 1
+        assert upper - lower <= max(1, lower // metrics._SUB) + 1
+        previous_upper = upper
+        if upper > 10 ** 9:
+            break
+
+
+def test_small_values_are_exact():
+    for us in range(metrics._LINEAR):
+        assert _bucket_index(us) == us and _bucket_upper(us) == us
+
+
+def test_percentiles_are_never_understated():
+    h = LatencyHistogram()
+    for us in range(1, 10_001):                           # 1 us .. 10 ms, uniform
+        h.record(us)
+    for pct, exact_ms in ((50, 5.0), (90, 9.0), (99, 9.9)):
+        assert exact_ms <= h.percentile(pct) <= exact_ms * (1 + 1 / metrics._SUB) + 0.001
+    assert h.percentile(100) == 10.0
+    assert h.summary()["min_ms"] == 0.001
+
+
+def test_merge_combines_counts_and_extremes():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    a.record(100)
+    b.record(5)
+    b.record(7000)
+    a.merge(b)
+    assert (a.count, a.min_us, a.max_us, a.total_us) == (3, 5, 7000, 7105)
+
+
+def test_exited_threads_shards_are_folded():
+    m = CommandMetrics()
+
+    def send():
+        m.record("JointMovJ(1, 2, 3, 4)", 0.002)
+
+    for _ in range(50):
+        t = threading.Thread(target=send)
+        t.start()
+        t.join()
+    m.record("GetAngle()", 0.001, error="FAIL_TO_GET")
+    snap = m.snapshot()
+    assert snap["JointMovJ"]["count"] == 50
+    assert snap["GetAngle"]["errors"] == {"FAIL_TO_GET": 1}
+    assert len(m._shards) == 1                            # just this thread's
+    m.reset()
+    assert m.snapshot() == {}
+
+
+@pytest.mark.parametrize("us", [0, 63, 64, 65, 1000, 123_456, 10 ** 8])
+def test_value_lies_within_its_bucket(us):
+    index = _bucket_index(us)
+    assert us <= _bucket_upper(index)
+    assert index == 0 or us > _bucket_upper(index - 1)
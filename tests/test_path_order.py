@@ -0,0 +1,39 @@
+import numpy as np
+
+from dobot_util.path_order import optimize_order, route_time, travel_time_matrix
+
+
+def random_joints(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack((rng.uniform(-80, 80, n), rng.uniform(-120, 120, n),
+                            rng.uniform(10, 240, n), rng.uniform(-180, 180, n)))
+
+
+def test_order_is_a_permutation_that_never_gets_slower():
+    joints = random_joints(40)
+    result = optimize_order(joints)
+    assert sorted(result.order) == list(range(40))
+    assert result.order[0] == 0
+    assert result.after_s <= result.before_s
+    assert np.isclose(result.after_s, route_time(result.order, travel_time_matrix(joints)))
+
+
+def test_claw_anchors_and_runs_are_preserved():
+    claws = [0] * 8 + [1] * 7 + [0] * 9 + [1] * 6
+    joints = random_joints(len(claws), seed=3)
+    order = optimize_order(joints, claws=claws).order
+
+    anchors = [i for i in range(len(claws)) if i == 0 or claws[i] != claws[i - 1]]
+    for i in anchors:
+        assert order[i] == i                         # the claw fires at the same points
+    assert [claws[i] for i in order] == claws        # and in the same sequence
+    bounds = anchors + [len(claws)]
+    for start, stop in zip(bounds, bounds[1:]):
+        assert sorted(order[start:stop]) == list(range(start, stop))
+
+
+def test_short_paths_are_left_alone():
+    joints = random_joints(2)
+    result = optimize_order(joints)
+    assert result.order == [0, 1]
+    assert not result.changed
@@ -0,0 +1,53 @@
+import numpy as np
+
+from dobot_util import reachability
+from dobot_util.kinematics import solve_ik_batch
+from dobot_util.reachability import ReachabilityGrid, workspace_outline
+
+
+def make_grid(tmp_path, monkeypatch, **kwargs):
+    monkeypatch.setattr(reachability, "_CACHE_DIR", str(tmp_path))
+    return ReachabilityGrid(resolution=5.0, **kwargs).load_or_build()
+
+
+def test_reachable_cells_are_conservative(tmp_path, monkeypatch):
+    grid = make_grid(tmp_path, monkeypatch)
+    centres = grid.cell_centres()
+    PX, PY = np.meshgrid(centres, centres)
+    inside = grid.mask()
+    assert inside.any()
+    # Every cell marked reachable is reachable at its centre, both by the
+    # drawn outline and by IK (robot x = py, robot y = -px).
+    px, py = PX[inside], PY[inside]
+    assert workspace_outline(px, py).all()
+    assert solve_ik_batch(np.column_stack((py, -px))).valid.all()
+
+
+def test_scalar_and_array_lookups_agree(tmp_path, monkeypatch):
+    grid = make_grid(tmp_path, monkeypatch)
+    rng = np.random.default_rng(1)
+    px, py = rng.uniform(-500, 500, 500), rng.uniform(-500, 500, 500)
+    vector = grid.contains_xy(px, py)
+    scalar = [grid.contains_xy(float(a), float(b)) for a, b in zip(px, py)]
+    assert vector.tolist() == scalar
+    assert grid.contains_xy(10_000.0, 0.0) is False
+
+
+def test_z_checks_follow_the_hard_deck(tmp_path, monkeypatch):
+    floor = [None]
+    grid = make_grid(tmp_path, monkeypatch, floor_provider=lambda: floor[0])
+    px, py = 0.0, 300.0
+    assert grid.contains_xy(px, py)
+    assert grid.contains(px, py, 100.0)
+    assert not grid.contains(px, py, 1.0)          # below Z_MIN
+    floor[0] = 150.0
+    assert not grid.contains(px, py, 100.0)
+    assert grid.contains(px, py, 200.0)
+
+
+def test_cache_round_trip(tmp_path, monkeypatch):
+    built = make_grid(tmp_path, monkeypatch)
+    assert len(list(tmp_path.glob("reach_*.npz"))) == 1
+    loaded = ReachabilityGrid(resolution=5.0).load_or_build()
+    assert np.array_equal(loaded.mask(), built.mask())
+    assert ReachabilityGrid(resolution=5.0, strict=False).cache_key() != built.cache_key()
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from dobot_util.recorder import TelemetryRecorder, TelemetryRecording, replay
+from dobot_util.telemetry import TelemetryHub
+from dobot_util.types import FeedbackType
+
+FIELDS = ("q_actual", "robot_mode", "running_status", "digital_output_bits")
+
+
+def packets(n):
+    rng = np.random.default_rng(0)
+    recs = np.zeros(n, dtype=FeedbackType)
+    recs["len"] = FeedbackType.itemsize
+    recs["q_actual"] = np.cumsum(rng.normal(size=(n, 6)), axis=0)
+    recs["robot_mode"] = 5
+    recs["running_status"] = np.arange(n) % 2
+    recs["digital_output_bits"] = np.arange(n)
+    recs["i_actual"] = 1.0            # not recorded
+    return recs, 100.0 + 0.008 * np.arange(n)
+
+
+def write(tmp_path, n, chunk_rows=16):
+    recs, arrival = packets(n)
+    recorder = TelemetryRecorder(str(tmp_path), fields=FIELDS, chunk_seconds=chunk_rows * 0.008)
+    for i in range(n):
+        recorder.record(recs[i:i + 1], arrival[i])
+    recorder.close()
+    return recorder, recs, arrival
+
+
+def test_write_read_round_trip(tmp_path):
+    recorder, recs, arrival = write(tmp_path, 40)
+    assert recorder.packets_recorded == 40
+    assert recorder.chunks_written == 3          # 16 + 16 + the partial 8 on close
+
+    recording = TelemetryRecording(recorder.current_path)
+    assert recording.fields == list(FIELDS)
+    data = recording.load()
+    assert set(data) == set(FIELDS) | {"arrival"}
+    for name in FIELDS:
+        np.testing.assert_array_equal(data[name], recs[name])
+    np.testing.assert_array_equal(data["arrival"], arrival)
+
+    # records() rebuilds full FeedbackType rows, zero where not recorded.
+    rebuilt = np.concatenate([r for r, _ in recording.records()])
+    np.testing.assert_array_equal(rebuilt["q_actual"], recs["q_actual"])
+    assert np.all(rebuilt["i_actual"] == 0.0)
+    assert np.all(rebuilt["len"] == FeedbackType.itemsize)
+
+
+def test_truncated_last_chunk_is_ignored(tmp_path):
+    recorder, recs, _ = write(tmp_path, 32)
+    path = recorder.current_path
+    with open(path, "r+b") as f:
+        f.seek(0, 2)
+        f.truncate(f.tell() - 10)
+
+    data = TelemetryRecording(path).load()
+    np.testing.assert_array_equal(data["q_actual"], recs["q_actual"][:16])
+
+
+def test_not_a_recording(tmp_path):
+    path = tmp_path / "other.dtr"
+    path.write_bytes(b"hello")
+    with pytest.raises(ValueError):
+        TelemetryRecording(str(path))
+
+
+def test_replay_publishes_every_packet_in_order(tmp_path):
+    recorder, recs, _ = write(tmp_path, 40)
+    hub = TelemetryHub()
+    seen = []
+    hub.subscribe(lambda s: seen.append(s.record[0]["q_actual"].copy()))
+
+    assert replay(recorder.current_path, hub, speed=None) == 40
+    np.testing.assert_array_equal(np.array(seen), recs["q_actual"])
@@ -0,0 +1,73 @@
+import threading
+
+import numpy as np
+import pytest
+
+from dobot_util.telemetry import TelemetryHub
+from dobot_util.types import FeedbackType
+from vision.services.sweep_engine import SweepEngine
+
+
+def record(joints):
+    rec = np.zeros(1, dtype=FeedbackType)
+    rec[0]['q_actual'][:4] = joints
+    return rec
+
+
+def start_engine(step=25.0, dispatch=lambda trigger: None):
+    hub = TelemetryHub()
+    hub.publish(record([0.0, 0.0, 0.0, 0.0]), arrival=0.0)
+    return hub, SweepEngine(hub, step, dispatch).start()
+
+
+def test_crossings_land_on_exact_multiples():
+    hub, engine = start_engine()
+    # Packets that straddle each crossing at uneven offsets.
+    for i, j1 in enumerate([0.0, 7.0, 31.0, 49.0, 58.0, 80.0], start=1):
+        hub.publish(record([j1, 0.0, 0.0, 0.0]), arrival=float(i))
+    triggers = engine.finish(timeout=5.0)
+    engine.close()
+
+    assert [t.reason for t in triggers] == ["start", "crossing", "crossing", "crossing", "end"]
+    assert [t.joints[0] for t in triggers[1:4]] == pytest.approx([25.0, 50.0, 75.0])
+    # 25 is 18/24 of the way from 7 (t=2) to 31 (t=3), and so on.
+    assert [t.timestamp for t in triggers[1:4]] == pytest.approx([2.75, 4.0 + 1 / 9, 5.0 + 17 / 22])
+    assert triggers[-1].joints[0] == pytest.approx(80.0)
+
+
+def test_one_packet_gap_spanning_several_steps_fires_each():
+    hub, engine = start_engine()
+    hub.publish(record([0.0, 0.0, 0.0, 0.0]), arrival=1.0)
+    hub.publish(record([100.0, 0.0, 0.0, 0.0]), arrival=2.0)
+    engine.close(timeout=5.0)
+
+    crossings = [t for t in engine.triggers if t.reason == "crossing"]
+    assert [t.joints[0] for t in crossings] == pytest.approx([25.0, 50.0, 75.0, 100.0])
+    assert [t.timestamp for t in crossings] == pytest.approx([1.25, 1.5, 1.75, 2.0])
+    assert [t.index for t in engine.triggers] == list(range(5))
+
+
+def test_crossing_on_any_watched_axis_and_in_either_direction():
+    hub, engine = start_engine(step=10.0)
+    hub.publish(record([0.0, 0.0, 0.0, 0.0]), arrival=1.0)
+    hub.publish(record([4.0, -12.0, 0.0, 0.0]), arrival=2.0)
+    # J4 isn't watched by default.
+    hub.publish(record([4.0, -12.0, 0.0, 90.0]), arrival=3.0)
+    engine.close(timeout=5.0)
+
+    crossings = [t for t in engine.triggers if t.reason == "crossing"]
+    assert len(crossings) == 1
+    assert crossings[0].joints[:2] == pytest.approx([4.0 * 10 / 12, -10.0])
+
+
+def test_close_unsubscribes_without_an_end_trigger():
+    release = threading.Event()
+    hub, engine = start_engine(dispatch=lambda trigger: release.wait(5.0))
+    release.set()
+    engine.close(timeout=5.0)
+    hub.publish(record([0.0, 0.0, 0.0, 0.0]), arrival=1.0)
+    hub.publish(record([100.0, 0.0, 0.0, 0.0]), arrival=2.0)
+
+    assert [t.reason for t in engine.triggers] == ["start"]
+    assert engine.triggers[0].dispatched_at is not None
+    engine.close()  # idempotent
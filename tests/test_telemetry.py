@@ -0,0 +1,108 @@
+import threading
+import time
+
+import numpy as np
+
+from dobot_util.telemetry import TelemetryHub
+from dobot_util.types import FeedbackType
+
+TARGET = [10.0, 20.0, 100.0, 0.0]
+
+
+def record(joints=TARGET, speed=0.0, running=0):
+    rec = np.zeros(1, dtype=FeedbackType)
+    rec[0]['q_actual'][:4] = joints
+    rec[0]['qd_actual'][:4] = speed
+    rec[0]['running_status'] = running
+    return rec
+
+
+SETTLED = record()
+MOVING = record(speed=5.0, running=1)
+
+
+def wait_in_background(hub, **kwargs):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(sample=hub.wait_for_arrival(TARGET, **kwargs)))
+    thread.start()
+    time.sleep(0.05)
+    return thread, result
+
+
+def test_arrival_needs_consecutive_settled_packets():
+    hub = TelemetryHub()
+    hub.publish(MOVING)
+    thread, result = wait_in_background(hub, timeout=5.0, settle_packets=2)
+    # Published in one burst, so the waiter lags behind; no two adjacent
+    # packets are both settled until the last pair.
+    for i in range(61):
+        hub.publish(SETTLED if i % 2 else MOVING)
+    hub.publish(SETTLED)
+    last = hub.publish(SETTLED)
+    thread.join(5)
+    assert result["sample"] is not None and result["sample"].seq == last.seq
+
+
+def test_arrival_judges_position_and_running_status():
+    hub = TelemetryHub()
+    thread, result = wait_in_background(hub, timeout=5.0, settle_packets=3)
+    for _ in range(5):
+        hub.publish(record(joints=[10.0, 20.0, 100.5, 0.0]))   # Z 0.5 mm off
+    for _ in range(5):
+        hub.publish(record(running=1))
+    done = [hub.publish(SETTLED) for _ in range(3)]
+    thread.join(5)
+    assert result["sample"].seq == done[-1].seq
+
+
+def test_arrival_times_out_without_feedback():
+    hub = TelemetryHub()
+    started = time.monotonic()
+    assert hub.wait_for_arrival(TARGET, timeout=0.2) is None
+    assert time.monotonic() - started >= 0.2
+
+
+def test_wait_for_sample_walks_every_packet_and_reports_gaps():
+    hub = TelemetryHub()
+    samples = [hub.publish(SETTLED) for _ in range(10)]
+    assert hub.wait_for_sample(3, timeout=0).seq == 4
+    for _ in range(hub.RECENT_SAMPLES):
+        hub.publish(SETTLED)
+    gap = hub.wait_for_sample(samples[0].seq, timeout=0)
+    assert gap.seq > samples[0].seq + 1
+    assert hub.wait_for_sample(hub.latest().seq, timeout=0.01) is None
+
+
+def feed(hub, records, period=0.008):
+    return [hub.publish(rec, i * period) for i, rec in enumerate(records)]
+
+
+def test_rate_limit_caps_deliveries():
+    hub = TelemetryHub()
+    seen = []
+    hub.subscribe(seen.append, max_rate_hz=10)
+    feed(hub, [record(joints=[i, 0, 100, 0]) for i in range(125)])   # 1 s at 8 ms
+    assert len(seen) == 10
+    gaps = np.diff([s.arrival for s in seen])
+    assert np.all(gaps >= 0.1 - 1e-9)
+
+
+def test_deadband_skips_small_changes():
+    hub = TelemetryHub()
+    seen = []
+    hub.subscribe(seen.append, deadband=0.5, fields=("q_actual",))
+    feed(hub, [record(joints=[10.0 + 0.01 * i, 20, 100, 0]) for i in range(120)])
+    # first packet, then each time the drift since the last delivery passes 0.5
+    assert [round(s.joints[0], 2) for s in seen] == [10.0, 10.51, 11.02]
+
+
+def test_change_inside_rate_window_is_delivered_late_not_lost():
+    hub = TelemetryHub()
+    seen = []
+    hub.subscribe(seen.append, max_rate_hz=10, deadband=0.5, fields=("q_actual",))
+    hub.publish(record(joints=[0, 0, 100, 0]), 0.0)
+    hub.publish(record(joints=[5, 0, 100, 0]), 0.05)      # moved, but too soon
+    hub.publish(record(joints=[5, 0, 100, 0]), 0.08)
+    hub.publish(record(joints=[5, 0, 100, 0]), 0.12)      # window over: delivered
+    hub.publish(record(joints=[5, 0, 100, 0]), 0.30)      # nothing new
+    assert [s.arrival for s in seen] == [0.0, 0.12]
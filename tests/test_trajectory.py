@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from dobot_util.trajectory import Trajectory, simplify_path
+
+
+def segment_distance(p, a, b):
+    seg = b - a
+    t = np.clip((p - a) @ seg / (seg @ seg), 0.0, 1.0) if seg @ seg else 0.0
+    return np.linalg.norm(p - (a + t * seg))
+
+
+def test_straight_line_keeps_only_the_ends():
+    line = np.linspace([0, 0, 10, 0], [50, -30, 200, 90], 500)
+    assert simplify_path(line) == [0, 499]
+
+
+def test_dropped_points_stay_within_tolerance():
+    t = np.linspace(0, 2 * np.pi, 800)
+    path = np.column_stack((40 * np.sin(t), 60 * np.cos(t), 100 + 50 * t, 30 * t))
+    tolerance = np.array([0.5, 0.5, 1.0, 1.0])
+    keep = simplify_path(path, tolerance)
+    assert keep[0] == 0 and keep[-1] == len(path) - 1
+    assert len(keep) < len(path) // 4
+
+    scaled = path / tolerance
+    for a, b in zip(keep, keep[1:]):
+        for i in range(a + 1, b):
+            assert segment_distance(scaled[i], scaled[a], scaled[b]) <= 1.0 + 1e-9
+
+
+def test_tiny_paths():
+    assert simplify_path([]) == []
+    assert simplify_path([[1, 2, 3, 4]]) == [0]
+    assert simplify_path([[1, 2, 3, 4], [1, 2, 3, 4]]) == [0, 1]
+
+
+def test_save_refuses_to_overwrite(tmp_path):
+    Trajectory("pick a", [[0, 0, 100, 0]]).save(str(tmp_path))
+    clash = Trajectory("pick_a", [[10, 0, 100, 0]])        # same file name
+    with pytest.raises(FileExistsError):
+        clash.save(str(tmp_path))
+    path = clash.save(str(tmp_path), overwrite=True)
+    assert Trajectory.load(path).waypoints == [[10, 0, 100, 0]]
@@ -0,0 +1,91 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from dobot_util.sim_controller import _parse_args, _split_commands
+from dobot_util.types import DobotError
+from dobot_util.util import DobotSocketConnection
+
+
+class ScriptedPort:
+    """One-connection TCP server answering in order: Echo(v) -> v,
+    Drop() -> no reply at all, Slow() -> reply after 0.5 s, Bye() -> close."""
+
+    def __init__(self):
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        conn, _ = self.server.accept()
+        buf = b""
+        with conn:
+            while True:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    return
+                cmds, buf = _split_commands(buf + chunk)
+                for cmd in cmds:
+                    name, args = _parse_args(cmd)
+                    if name == "Bye":
+                        return
+                    if name == "Drop":
+                        continue
+                    if name == "Slow":
+                        time.sleep(0.5)
+                    conn.sendall(f"0,{{{','.join(args)}}},{cmd};".encode())
+
+
+@pytest.fixture
+def conn():
+    port = ScriptedPort()
+    c = DobotSocketConnection("127.0.0.1", port.port, consume_greeting=False)
+    c.enable_pipelining()
+    yield c
+    c.socket.close()
+
+
+def test_replies_resolve_in_wire_order(conn):
+    timings = conn.send_many([f"Echo({i})" for i in range(200)], timeout=5)
+    assert [t.value for t in timings] == [str(i) for i in range(200)]
+    assert all(t.error is None for t in timings)
+
+
+def test_concurrent_callers_get_their_own_replies(conn):
+    results = {}
+
+    def worker(k):
+        results[k] = [conn.send_command(f"Echo({k}{i})")[1] for i in range(50)]
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(1, 5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for k in range(1, 5):
+        assert results[k] == [f"{k}{i}" for i in range(50)]
+
+
+def test_lost_reply_times_out_and_fails_older_commands(conn):
+    older = conn.send_async("Drop()")
+    assert conn.send_command("Drop()", timeout=0.2) == (DobotError.FAIL_TO_GET, "")
+    assert isinstance(older.exception(timeout=0), TimeoutError)
+    assert conn.send_command("Echo(7)") == (None, "7")      # link still usable
+
+
+def test_late_reply_is_not_matched_to_the_next_command(conn):
+    assert conn.send_command("Slow()", timeout=0.1) == (DobotError.FAIL_TO_GET, "")
+    assert conn.send_command("Echo(8)") == (None, "8")
+
+
+def test_remote_close_fails_every_pending_command(conn):
+    pending = [conn.send_async("Drop()") for _ in range(3)]
+    conn.send_async("Bye()")
+    for future in pending:
+        with pytest.raises(ConnectionError):
+            future.result(timeout=5)
+    assert conn.remote_closed
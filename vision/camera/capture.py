@@ -22,11 +22,17 @@ vision/config.py before relying on them in the real pipeline.
 """
 
 from __future__ import annotations
+import glob
 import os
+import time
 import uuid
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 
+import numpy as np
+
 try:
     import cv2
     _CV2_AVAILABLE = True
@@ -37,7 +43,17 @@ from vision.config import (
     CAMERAS,
     CAMERA_FRAME_WIDTH,
     CAMERA_FRAME_HEIGHT,
+    CAMERA_BACKGROUND_GRABBER,
+    CAMERA_FRAME_TIMEOUT_SECONDS,
+    CAMERA_MAX_FRAME_AGE_SECONDS,
+    CAMERA_GRABBER_IDLE_SECONDS,
+    CAMERA_DISCOVERY_MAX_INDEX,
+    CAMERA_DISCOVERY_TTL_SECONDS,
+    IMAGE_WRITE_WORKERS,
+    IMAGE_WRITE_MAX_PENDING,
+    IMAGE_STORE_ENABLED,
 )
+from vision.storage.image_store import get_image_store
 
 IMAGES_ROOT = "images/objects"
 
@@ -85,11 +101,17 @@ def _save_camera_overrides() -> None:
 _load_camera_overrides()
 
 
-def assign_camera(name: str, index: int) -> None:
+def assign_camera(name: str, index: int):
     """Assign (or reassign) a camera name to a device index at runtime and
     persist it to camera_assignments.json. Releases any cached handle
     already open under that name's *previous* index so the next capture/
     live-feed read opens the newly assigned device instead of a stale one.
+
+    Returns the device's CameraDevice identity (resolution/backend) if
+    camera_discovery has it cached, else None - it never probes. When a
+    fresh cached scan says there's no camera at that index, a warning is
+    printed (the assignment still goes through: the camera may simply
+    not be plugged in yet).
     """
     name = str(name).strip()
     if not name:
@@ -100,12 +122,14 @@ def assign_camera(name: str, index: int) -> None:
     _camera_overrides[name] = index
     _save_camera_overrides()
 
-    if old_index is not None and old_index != index and old_index in _capture_handles:
-        try:
-            _capture_handles[old_index].release()
-        except Exception:
-            pass
-        _capture_handles.pop(old_index, None)
+    if old_index is not None and old_index != index:
+        _release_index(old_index)
+
+    device = camera_discovery.lookup(index)
+    if device is None and camera_discovery.is_fresh():
+        print(f"[CAMERA CONFIG] '{name}' assigned to index {index}, but the last camera "
+              f"scan found nothing there (found: {sorted(camera_discovery.cached())}).")
+    return device
 
 
 def remove_camera_assignment(name: str) -> None:
@@ -223,6 +247,7 @@ def _capture_from_index(index: int, _retry: bool = True):
                 ok, frame = fresh_cap.read()
 
     if not ok or frame is None:
+        camera_discovery.invalidate(index)
         raise RuntimeError(
             f"Camera at index {index} did not return a frame, even after "
             f"reconnecting. Check the USB connection and that no other "
@@ -231,13 +256,240 @@ def _capture_from_index(index: int, _retry: bool = True):
     return frame
 
 
-def capture_frame(camera_name: str):
+# ---------------------------------------------------------------------------
+# BACKGROUND FRAME GRABBERS
+# ---------------------------------------------------------------------------
+# A synchronous cap.read() has two problems. UVC drivers keep a small
+# queue of already-captured frames, so the read often hands back a frame
+# from *before* the call (e.g. one taken while the arm was still moving to
+# the view), and when the queue is empty the caller blocks for up to a
+# full frame period. And the live feed and the capture paths all take the
+# same per-index lock to read, so they queue up behind each other.
+#
+# A FrameGrabber owns one camera's handle and reads it continuously on its
+# own thread, so the driver queue is always drained and the newest frame
+# (with the time it was grabbed) is always on hand. Every capture_frame()
+# caller for that camera is served from this one stream.
+# ---------------------------------------------------------------------------
+
+class FrameGrabber:
     """
-    [WIRED] Grab a single frame from any camera configured in
-    vision.config.CAMERAS (or reassigned at runtime via assign_camera(),
-    which takes priority) by name. This is the general entry point -
-    works for any number of cameras, not just station/wrist.
+    Continuously drains one camera into a double-buffered "latest frame".
+
+    The grabber thread decodes each frame into the back buffer (reused
+    from frame to frame, so the steady state allocates nothing), then
+    swaps it to the front under the condition lock. Readers copy the front
+    buffer out - a caller never holds an array the grabber will overwrite.
+
+    Timestamps are time.monotonic() taken right after cap.grab() returns,
+    i.e. as close to exposure as OpenCV lets us get.
+
+    On a failed read the handle is released and reopened in the background
+    (backing off up to 5 s between attempts) - the same recovery
+    _capture_from_index() does inline - and waiting readers get the error
+    if no frame arrives before their timeout. A camera that never opened
+    at all isn't retried: the grabber stops, and the next read starts a
+    new one (one more attempt).
+
+    Nobody reading for *idle_seconds* (live feed stopped, tab hidden, no
+    capture pending) stops the grabber and releases the camera.
     """
+
+    def __init__(self, index: int, idle_seconds: float = CAMERA_GRABBER_IDLE_SECONDS):
+        self.index = index
+        self.idle_seconds = idle_seconds
+        self._last_read = time.monotonic()
+        self._cond = threading.Condition()
+        self._front = None
+        self._back = None
+        self._timestamp = 0.0
+        self._seq = 0
+        self._error = None
+        self._running = False
+        self._thread = None
+
+    def start(self) -> "FrameGrabber":
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"camera-grabber-{self.index}",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def frames_grabbed(self) -> int:
+        return self._seq
+
+    def _run(self) -> None:
+        cap = None
+        backoff = 0.5
+        while self._running:
+            if time.monotonic() - self._last_read > self.idle_seconds and self._retire(cap):
+                print(f"[CAMERA {self.index}] No reads for {self.idle_seconds:.0f}s; grabber stopped.")
+                return
+            if cap is None:
+                with _get_lock(self.index):
+                    try:
+                        cap = _get_handle(self.index)
+                    except Exception as e:
+                        cap = None
+                        self._set_error(str(e))
+                if cap is None and self._seq == 0:
+                    self._retire(None, force=True)   # never opened: unplugged / wrong index
+                    return
+                if cap is None:
+                    self._idle(backoff)
+                    backoff = min(backoff * 2, 5.0)
+                    continue
+
+            ok = cap.grab()
+            timestamp = time.monotonic()
+            if ok:
+                ok, frame = cap.retrieve(self._back)
+            if not ok or frame is None:
+                with _get_lock(self.index):
+                    if _capture_handles.get(self.index) is cap:
+                        _capture_handles.pop(self.index, None)
+                    cap.release()
+                cap = None
+                self._set_error(f"Camera at index {self.index} stopped returning frames; reconnecting.")
+                continue
+
+            backoff = 0.5
+            with self._cond:
+                self._back, self._front = self._front, frame
+                self._timestamp = timestamp
+                self._seq += 1
+                self._error = None
+                self._cond.notify_all()
+            # Outside the lock; *frame* is the front buffer and isn't
+            # reused until after the next retrieve, so listeners may read
+            # it synchronously but must copy anything they keep.
+            for listener in _frame_listeners:
+                try:
+                    listener(self.index, frame, timestamp)
+                except Exception as e:
+                    print(f"[CAMERA {self.index}] Frame listener failed: {e}")
+
+    def _retire(self, cap, force: bool = False) -> bool:
+        """Stop from the grabber's own thread: unregister, wake readers and
+        release *cap*. False (nothing done) if a reader touched the grabber
+        since the idle check - _get_grabber refreshes _last_read under the
+        same guard, so a grabber it just handed out is never retired."""
+        with _get_lock(self.index):
+            with _locks_guard:
+                if not force and time.monotonic() - self._last_read <= self.idle_seconds:
+                    return False
+                if _grabbers.get(self.index) is self:
+                    _grabbers.pop(self.index, None)
+                with self._cond:
+                    self._running = False
+                    self._cond.notify_all()
+            if cap is not None:
+                if _capture_handles.get(self.index) is cap:
+                    _capture_handles.pop(self.index, None)
+                cap.release()
+        return True
+
+    def _set_error(self, message: str) -> None:
+        with self._cond:
+            if self._error != message:
+                print(f"[CAMERA {self.index}] {message}")
+                camera_discovery.invalidate(self.index)
+            self._error = message
+            self._cond.notify_all()
+
+    def _idle(self, seconds: float) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: not self._running, timeout=seconds)
+
+    def latest(self, newer_than: float = None, timeout: float = CAMERA_FRAME_TIMEOUT_SECONDS,
+               max_age: float = CAMERA_MAX_FRAME_AGE_SECONDS):
+        """
+        (frame, timestamp) of the newest frame - immediately, if there is
+        one grabbed after *newer_than* (a time.monotonic() value; default:
+        anything younger than *max_age*), otherwise as soon as one arrives.
+        Raises RuntimeError if none does within *timeout*.
+        """
+        self._last_read = time.monotonic()
+        if newer_than is None:
+            newer_than = time.monotonic() - max_age
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._front is None or self._timestamp <= newer_than:
+                remaining = deadline - time.monotonic()
+                # Never opened at all (unplugged / wrong index): fail now,
+                # like a direct read would, rather than wait out the timeout.
+                never_opened = self._front is None and self._error is not None
+                if remaining <= 0 or never_opened or not self._running:
+                    detail = f": {self._error}" if self._error else "."
+                    raise RuntimeError(
+                        f"Camera at index {self.index} produced no new frame within "
+                        f"{timeout:.1f}s{detail}"
+                    )
+                self._cond.wait(remaining)
+            return self._front.copy(), self._timestamp
+
+
+_grabbers = {}
+# Called as listener(index, frame, timestamp) on each grabber's thread for
+# every frame it grabs - keep them cheap (see vision/camera/frame_ring.py).
+# Copy-on-write: replaced, never mutated, so the grabbers iterate it unlocked.
+_frame_listeners = ()
+
+
+def add_frame_listener(listener) -> None:
+    global _frame_listeners
+    with _locks_guard:
+        if listener not in _frame_listeners:
+            _frame_listeners = _frame_listeners + (listener,)
+
+
+def remove_frame_listener(listener) -> None:
+    global _frame_listeners
+    with _locks_guard:
+        _frame_listeners = tuple(l for l in _frame_listeners if l is not listener)
+
+
+def _get_grabber(index: int) -> FrameGrabber:
+    with _locks_guard:
+        grabber = _grabbers.get(index)
+        if grabber is None or not grabber.running:
+            grabber = _grabbers[index] = FrameGrabber(index).start()
+        grabber._last_read = time.monotonic()
+        return grabber
+
+
+def _release_index(index: int) -> None:
+    """Stop the grabber (if any) and release the cached handle for *index*."""
+    with _locks_guard:
+        grabber = _grabbers.pop(index, None)
+    if grabber is not None:
+        grabber.stop()
+    with _get_lock(index):
+        cap = _capture_handles.pop(index, None)
+        if cap is not None:
+            try:
+                cap.release()
+            except Exception:
+                pass
+
+
+def _resolve_camera(camera_name: str) -> int:
     configured = list_configured_cameras()
     if camera_name not in configured:
         raise ValueError(
@@ -245,7 +497,124 @@ def capture_frame(camera_name: str):
             f"{list(configured.keys())}. Add it to CAMERAS in "
             f"vision/config.py, or assign it from the Camera tab."
         )
-    return _capture_from_index(configured[camera_name])
+    return configured[camera_name]
+
+
+def capture_timestamped_frame(camera_name: str, newer_than: float = None,
+                              timeout: float = CAMERA_FRAME_TIMEOUT_SECONDS):
+    """
+    [WIRED] capture_frame(), plus the time.monotonic() the frame was
+    grabbed at: returns (frame, timestamp).
+
+    newer_than (a time.monotonic() value) asks for a frame grabbed strictly
+    after that instant - e.g. the moment the arm settled on a view - so a
+    frame exposed while the arm was still moving can never be returned.
+    Without a background grabber (CAMERA_BACKGROUND_GRABBER off) frames
+    buffered in the driver carry no capture time, so one queued frame is
+    discarded first and the read's return time is used instead.
+    """
+    index = _resolve_camera(camera_name)
+    if CAMERA_BACKGROUND_GRABBER:
+        _require_cv2()
+        return _get_grabber(index).latest(newer_than=newer_than, timeout=timeout)
+    if newer_than is not None:
+        with _get_lock(index):
+            _get_handle(index).grab()
+    frame = _capture_from_index(index)
+    return frame, time.monotonic()
+
+
+def capture_frame(camera_name: str, newer_than: float = None):
+    """
+    [WIRED] Grab a single frame from any camera configured in
+    vision.config.CAMERAS (or reassigned at runtime via assign_camera(),
+    which takes priority) by name. This is the general entry point -
+    works for any number of cameras, not just station/wrist.
+
+    With background grabbers on (the default) this returns the camera's
+    newest frame immediately instead of waiting on a read; pass
+    newer_than=time.monotonic() at the moment that matters (see
+    capture_timestamped_frame()) to wait for a frame taken after it.
+    """
+    return capture_timestamped_frame(camera_name, newer_than=newer_than)[0]
+
+
+@dataclass
+class MultiCameraCapture:
+    """Result of capture_all_frames()."""
+    frames: dict = field(default_factory=dict)      # camera name -> BGR frame
+    timestamps: dict = field(default_factory=dict)  # camera name -> time.monotonic() grabbed at
+    errors: dict = field(default_factory=dict)      # camera name -> error message
+    elapsed_s: float = 0.0                          # wall time of the whole call
+    # Only filled when captured through a CaptureGate (capture_gate.py):
+    sharpness: dict = field(default_factory=dict)   # camera name -> sharpness score
+    gate_passed: dict = field(default_factory=dict) # camera name -> met the gate's thresholds
+
+    @property
+    def skew_s(self) -> float:
+        """Spread between the earliest and latest frame grabbed - how far
+        apart in time the cameras saw the scene."""
+        if len(self.timestamps) < 2:
+            return 0.0
+        return max(self.timestamps.values()) - min(self.timestamps.values())
+
+
+_capture_pool = None
+
+
+def _get_capture_pool() -> ThreadPoolExecutor:
+    global _capture_pool
+    with _locks_guard:
+        if _capture_pool is None:
+            _capture_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="camera-capture")
+        return _capture_pool
+
+
+def capture_all_frames(camera_names=None, newer_than: float = None,
+                       timeout: float = CAMERA_FRAME_TIMEOUT_SECONDS, gate=None) -> MultiCameraCapture:
+    """
+    [WIRED] One frame from each camera in camera_names (default: every
+    configured camera), all triggered at once.
+
+    Looping capture_frame() over the cameras costs the *sum* of their
+    capture times and spreads the views out in time; here every camera is
+    read on its own pool thread, so a call costs about as much as the
+    slowest single camera, and the frames' grab timestamps (and the
+    resulting skew_s) say how close together they really were.
+
+    A camera that fails (unplugged, busy, unknown name...) is recorded in
+    .errors and doesn't affect the others - the same per-camera isolation
+    the capture loops in main.py have always had. newer_than/timeout are
+    as for capture_timestamped_frame().
+
+    With a gate (vision.camera.capture_gate.CaptureGate), each camera's
+    frame is picked by gate.capture() instead - the first sharp, steady
+    frame, or the best by the gate's deadline - and the result's
+    .sharpness / .gate_passed are filled in.
+    """
+    if camera_names is None:
+        camera_names = list(list_configured_cameras())
+    started = time.monotonic()
+    pool = _get_capture_pool()
+    if gate is not None:
+        futures = {name: pool.submit(gate.capture, name, newer_than) for name in camera_names}
+    else:
+        futures = {name: pool.submit(capture_timestamped_frame, name, newer_than, timeout)
+                   for name in camera_names}
+    result = MultiCameraCapture()
+    for name, future in futures.items():
+        try:
+            if gate is not None:
+                gated = future.result()
+                result.frames[name], result.timestamps[name] = gated.frame, gated.timestamp
+                result.sharpness[name] = gated.sharpness
+                result.gate_passed[name] = gated.passed
+            else:
+                result.frames[name], result.timestamps[name] = future.result()
+        except Exception as e:
+            result.errors[name] = str(e)
+    result.elapsed_s = time.monotonic() - started
+    return result
 
 
 def capture_station_frame():
@@ -284,6 +653,35 @@ def frame_to_rgb(frame):
     return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
 
+def frame_to_preview_rgb(frame, max_size, buffers: dict):
+    """
+    Downscale a BGR frame to fit within max_size (width, height) and
+    convert it to RGB - for previews, instead of frame_to_rgb() on the
+    full frame followed by a PIL thumbnail(). Resizing first (INTER_AREA,
+    in OpenCV, off the GUI thread) means the colour conversion and
+    everything after it touch ~1/7 of the pixels of a 1280x720 frame.
+
+    *buffers* is a dict the caller keeps between calls (one per preview);
+    the resize and conversion write into arrays kept there, so a running
+    preview allocates nothing per frame. The returned array IS one of
+    those buffers - it is overwritten by the next call with the same dict.
+    """
+    _require_cv2()
+    h, w = frame.shape[:2]
+    scale = min(max_size[0] / w, max_size[1] / h, 1.0)
+    size = (max(1, int(w * scale)), max(1, int(h * scale)))
+    small, rgb = buffers.get("small"), buffers.get("rgb")
+    if rgb is None or rgb.shape[:2] != (size[1], size[0]):
+        small = buffers["small"] = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        rgb = buffers["rgb"] = np.empty((size[1], size[0], 3), dtype=np.uint8)
+    if scale < 1.0:
+        cv2.resize(frame, size, dst=small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb)
+    else:
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+    return rgb
+
+
 def save_image(frame, sample_id: str, source: str, view_index: int = 0) -> str:
     """
     [WIRED] Persist a captured frame to disk and return its path.
@@ -308,20 +706,141 @@ def save_image(frame, sample_id: str, source: str, view_index: int = 0) -> str:
     an absolute path always resolves to the same file regardless.
     """
     _require_cv2()
+    image_path = _new_image_path(sample_id, source, view_index)
+    _write_image(frame, image_path)
+    return image_path
+
+
+def _new_image_path(sample_id: str, source: str, view_index: int) -> str:
     sample_dir = ensure_sample_dir(sample_id)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    image_path = os.path.abspath(os.path.join(sample_dir, f"{timestamp}_{source}_{view_index}.jpg"))
+    return os.path.abspath(os.path.join(sample_dir, f"{timestamp}_{source}_{view_index}.jpg"))
+
+
+def _write_image(frame, image_path: str) -> None:
+    if IMAGE_STORE_ENABLED:
+        # Encoded in memory and stored by content: a frame identical to
+        # one already stored is just linked (see vision/storage/image_store.py).
+        ok, encoded = cv2.imencode(".jpg", frame)
+        if not ok:
+            raise IOError(f"Failed to encode image for {image_path}")
+        get_image_store().put_bytes(encoded.tobytes(), image_path)
+        return
     ok = cv2.imwrite(image_path, frame)
     if not ok:
         raise IOError(f"Failed to write image to {image_path}")
-    return image_path
+
+
+# ---------------------------------------------------------------------------
+# WRITE-BEHIND IMAGE SAVING
+# ---------------------------------------------------------------------------
+# save_image() JPEG-encodes and writes on the calling thread - in the
+# rotation loops, the thread that is also driving the arm, so every view
+# paid ~tens of ms per camera before the next J4 move could even be sent.
+# ImageWritePool takes the frame and hands back a Future for the path
+# instead; the encode + write happen on worker threads (cv2.imencode/
+# imwrite release the GIL, so several cameras' frames encode in
+# parallel) while the caller moves on.
+# ---------------------------------------------------------------------------
+
+class ImageWritePool:
+    """
+    Bounded write-behind pool for save_image().
+
+        futures = [image_writer().submit(frame, sample_id, cam, i) for ...]
+        ... move on to the next view ...
+        paths = image_writer().flush(futures)   # barrier before record_capture()
+
+    submit() decides the path immediately (same naming as save_image(),
+    timestamped at submit time, not write time) and returns a Future for
+    it. At most *max_pending* frames are held at once - 1280x720 frames are
+    ~2.7 MB each - and submit() blocks once that many are queued or being
+    written, so a slow disk throttles the capture loop instead of
+    buffering without limit.
+
+    flush(futures) waits for those writes and returns their paths in
+    order, raising the first write error; flush() with no argument waits
+    for everything submitted so far.
+    """
+
+    def __init__(self, workers: int = IMAGE_WRITE_WORKERS, max_pending: int = IMAGE_WRITE_MAX_PENDING):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-writer")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, frame, sample_id: str, source: str, view_index: int = 0) -> Future:
+        _require_cv2()
+        image_path = _new_image_path(sample_id, source, view_index)
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(self._write, frame, image_path)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    @staticmethod
+    def _write(frame, image_path: str) -> str:
+        _write_image(frame, image_path)
+        return image_path
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+
+    def flush(self, futures=None, timeout: float = None) -> list:
+        if futures is None:
+            with self._lock:
+                futures = list(self._pending)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        paths = []
+        for future in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            paths.append(future.result(remaining))
+        return paths
+
+    def close(self) -> None:
+        """Finish every queued write, then stop the workers."""
+        self._pool.shutdown(wait=True)
+
+
+_image_writer = None
+
+
+def image_writer() -> ImageWritePool:
+    """The shared ImageWritePool, created on first use."""
+    global _image_writer
+    with _locks_guard:
+        if _image_writer is None:
+            _image_writer = ImageWritePool()
+        return _image_writer
+
+
+def close_image_writer() -> None:
+    """Flush and stop the shared ImageWritePool. Call on app shutdown, so
+    images still queued for writing aren't lost."""
+    global _image_writer
+    with _locks_guard:
+        writer, _image_writer = _image_writer, None
+    if writer is not None:
+        writer.close()
 
 
 def release_all():
-    """Release all opened camera handles. Call on app shutdown."""
-    for cap in _capture_handles.values():
-        cap.release()
-    _capture_handles.clear()
+    """Stop all frame grabbers and release all opened camera handles.
+    Call on app shutdown."""
+    for index in set(_grabbers) | set(_capture_handles):
+        _release_index(index)
 
 
 def new_sample_id() -> str:
@@ -336,22 +855,161 @@ def ensure_sample_dir(sample_id: str) -> str:
     return path
 
 
-def list_camera_indices(max_index: int = 5):
+# ---------------------------------------------------------------------------
+# CAMERA DISCOVERY
+# ---------------------------------------------------------------------------
+# Finding which device indices have a camera used to mean opening index 0,
+# then 1, then 2 ... one after another, each through every candidate
+# backend plus a full read() - many seconds for a handful of indices, and
+# it reopened (or failed to open, on Windows) cameras this app already
+# had open for the live feed. CameraDiscovery probes all indices at once,
+# reports already-open cameras straight from their live handles instead
+# of reopening them, and caches the result with each device's identity
+# (resolution + backend) until something suggests it changed: a camera
+# read failing, the set of /dev/video* nodes changing (Linux hotplug), or
+# CAMERA_DISCOVERY_TTL_SECONDS passing.
+# ---------------------------------------------------------------------------
+
+@dataclass
+class CameraDevice:
+    index: int
+    width: int
+    height: int
+    backend: str
+    in_use: bool = False   # already open in this app (read from its handle, not re-probed)
+
+    def describe(self) -> str:
+        return (f"index {self.index}: {self.width}x{self.height} via {self.backend}"
+                + (" (in use)" if self.in_use else ""))
+
+
+def _device_signature():
+    """Cheap hotplug fingerprint - the /dev/video* nodes on Linux; None
+    (TTL and read failures only) elsewhere."""
+    if os.name == "posix" and os.path.isdir("/dev"):
+        return tuple(sorted(glob.glob("/dev/video*")))
+    return None
+
+
+def _describe_handle(index: int, cap, in_use: bool) -> CameraDevice:
+    try:
+        backend = cap.getBackendName()
+    except Exception:
+        backend = "unknown"
+    return CameraDevice(index, int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), backend, in_use)
+
+
+class CameraDiscovery:
+    """Concurrent, cached camera probing - see above. Use the shared
+    camera_discovery instance."""
+
+    def __init__(self, max_index: int = CAMERA_DISCOVERY_MAX_INDEX,
+                 ttl: float = CAMERA_DISCOVERY_TTL_SECONDS):
+        self.max_index = max_index
+        self.ttl = ttl
+        self._lock = threading.Lock()       # guards the cache fields
+        self._scan_lock = threading.Lock()  # one scan at a time; callers share its result
+        self._devices = None
+        self._scanned_at = 0.0
+        self._signature = None
+        self._stale = False
+
+    def cached(self) -> dict:
+        """Last scan's index -> CameraDevice map (possibly stale; {} if none yet)."""
+        with self._lock:
+            return dict(self._devices or {})
+
+    def lookup(self, index: int):
+        """Cached CameraDevice for *index*, or None. Never probes."""
+        with self._lock:
+            return (self._devices or {}).get(index)
+
+    def is_fresh(self) -> bool:
+        with self._lock:
+            return (self._devices is not None and not self._stale
+                    and time.monotonic() - self._scanned_at < self.ttl
+                    and _device_signature() == self._signature)
+
+    def invalidate(self, index: int = None) -> None:
+        """Mark the cache stale (the next devices() call rescans). *index*
+        - the device that failed - is dropped from it straight away."""
+        with self._lock:
+            self._stale = True
+            if index is not None and self._devices is not None:
+                self._devices.pop(index, None)
+
+    def devices(self, refresh: bool = False) -> dict:
+        """index -> CameraDevice for every working camera on indices
+        0..max_index-1: the cached map while it's fresh, else a new
+        concurrent scan (concurrent callers wait for the same scan)."""
+        if not refresh and self.is_fresh():
+            return self.cached()
+        with self._scan_lock:
+            if not refresh and self.is_fresh():
+                return self.cached()   # another caller's scan just finished
+            signature = _device_signature()
+            found = self._scan()
+            with self._lock:
+                self._devices = found
+                self._scanned_at = time.monotonic()
+                self._signature = signature
+                self._stale = False
+            return dict(found)
+
+    def scan_in_background(self, callback=None, refresh: bool = False) -> None:
+        """devices() on a daemon thread; callback(devices_or_None, error)
+        is called from that thread when it's done."""
+        def run():
+            try:
+                found, error = self.devices(refresh=refresh), None
+            except Exception as e:
+                found, error = None, e
+            if callback is not None:
+                callback(found, error)
+        threading.Thread(target=run, name="camera-discovery", daemon=True).start()
+
+    def _scan(self) -> dict:
+        _require_cv2()
+        with ThreadPoolExecutor(max_workers=max(1, self.max_index),
+                                thread_name_prefix="camera-probe") as pool:
+            results = list(pool.map(self._probe, range(self.max_index)))
+        return {device.index: device for device in results if device is not None}
+
+    @staticmethod
+    def _probe(index: int):
+        # The per-index lock keeps a probe from racing a grabber/capture
+        # opening the same device; an index this app already holds is
+        # described from its live handle rather than reopened.
+        with _get_lock(index):
+            cap = _capture_handles.get(index)
+            if cap is not None:
+                return _describe_handle(index, cap, in_use=True)
+            cap = _open_camera(index)
+            if cap is None:
+                return None
+            try:
+                return _describe_handle(index, cap, in_use=False)
+            finally:
+                cap.release()
+
+
+camera_discovery = CameraDiscovery()
+
+
+def list_camera_indices(max_index: int = 5, refresh: bool = True):
     """
     Utility: probe indices 0..max_index-1 and report which ones produce a
-    frame, trying the same backend fallback _get_handle() uses. Run
+    frame, trying the same backend fallback _get_handle() uses (all
+    indices at once - see CameraDiscovery; refresh=False accepts a fresh
+    cached scan instead). Run
     directly with:  python -m vision.camera.capture   (no .py — "-m"
     takes a module path, not a filename; including .py causes
     "Error while finding module specification").
     """
-    _require_cv2()
-    working = []
-    for i in range(max_index):
-        cap = _open_camera(i)
-        if cap is not None:
-            working.append(i)
-            cap.release()
-    return working
+    if max_index != camera_discovery.max_index:
+        return sorted(CameraDiscovery(max_index=max_index).devices())
+    return sorted(camera_discovery.devices(refresh=refresh))
 
 
 if __name__ == "__main__":
@@ -359,6 +1017,8 @@ if __name__ == "__main__":
     found = list_camera_indices()
     if found:
         print(f"Working camera indices: {found}")
+        for device in camera_discovery.cached().values():
+            print(f"  {device.describe()}")
         print(f"Currently configured cameras (vision/config.py CAMERAS): {CAMERAS}")
         for name, idx in CAMERAS.items():
             status = "OK" if idx in found else "NOT FOUND at that index"
@@ -0,0 +1,161 @@
+"""
+[WIRED] Sharpness + stability gating for rotation captures.
+
+THE PROBLEM THIS SOLVES
+-------------------------
+A rotation view used to be photographed after a fixed wait
+(interval_seconds, and later the feedback-stream settle check that
+replaced most of it). Neither looks at the picture: if the wrist camera
+is still ringing after the joints report "settled" the frame is blurred,
+and padding interval_seconds out to be safe wastes that time on every
+view where the arm was steady early.
+
+HOW
+----
+CaptureGate keeps taking frames from the camera's background grabber
+(each strictly newer than the last) and scores each one:
+
+  - sharpness: variance of the Laplacian over a downscaled, grayscale
+    central ROI (CAPTURE_GATE_ROI of the frame, resized to
+    CAPTURE_GATE_WIDTH px wide) - a standard, very cheap focus/blur
+    measure (~1 ms per 1280x720 frame); motion blur kills the high
+    frequencies it measures.
+  - stability: the arm's joint speed at the frame's grab time (max
+    |qd_actual| over J1-J4 in the last feedback packet that had arrived
+    by then), via the velocity callable passed in - not the newest
+    packet, which by the time a frame is scored may describe a later,
+    steadier (or shakier) moment than the exposure.
+
+The first frame with sharpness >= min_sharpness AND speed <=
+max_velocity is taken. If none passes before the deadline, the best one
+seen is used anyway (lowest speed first, then sharpest) and flagged, so
+a dull, low-texture scene that never reaches the sharpness threshold
+slows a view down by at most the deadline instead of failing it.
+
+Laplacian variance is scene-dependent - a plain backdrop scores far
+lower than a textured object at the same focus, and a scene that never
+reaches CAPTURE_GATE_MIN_SHARPNESS pays the full deadline on every view.
+The gate therefore ships off (CAPTURE_GATE_ENABLED). Once it's on, the
+rotation engine prints each view's score in its per-view timing line, so
+set the threshold from a first run's scores for your own scene.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+try:
+    import cv2
+    _CV2_AVAILABLE = True
+except ImportError:
+    _CV2_AVAILABLE = False
+
+from vision.config import (
+    CAPTURE_GATE_MIN_SHARPNESS,
+    CAPTURE_GATE_MAX_VELOCITY,
+    CAPTURE_GATE_DEADLINE_SECONDS,
+    CAPTURE_GATE_ROI,
+    CAPTURE_GATE_WIDTH,
+    CAMERA_FRAME_TIMEOUT_SECONDS,
+)
+from vision.camera.capture import capture_all_frames, capture_timestamped_frame
+
+
+def sharpness(frame, roi: float = CAPTURE_GATE_ROI, width: int = CAPTURE_GATE_WIDTH) -> float:
+    """Variance of the Laplacian of the central *roi* fraction of *frame*,
+    downscaled to *width* px wide. Higher = sharper."""
+    if not _CV2_AVAILABLE:
+        raise ImportError("opencv-python is not installed. Run: pip install opencv-python")
+    h, w = frame.shape[:2]
+    ch, cw = max(1, int(h * roi)), max(1, int(w * roi))
+    y0, x0 = (h - ch) // 2, (w - cw) // 2
+    crop = frame[y0:y0 + ch, x0:x0 + cw]
+    if cw > width:
+        crop = cv2.resize(crop, (width, max(1, ch * width // cw)), interpolation=cv2.INTER_AREA)
+    if crop.ndim == 3:
+        crop = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    return float(cv2.Laplacian(crop, cv2.CV_32F).var())
+
+
+@dataclass
+class GatedFrame:
+    frame: object
+    timestamp: float              # time.monotonic() the frame was grabbed at
+    sharpness: float
+    velocity: Optional[float]     # arm joint speed at *timestamp* (None = no feedback)
+    passed: bool                  # met both thresholds (False = best effort at the deadline)
+    candidates: int               # frames scored to get here
+
+
+class CaptureGate:
+    """
+    Picks a sharp, steady frame per camera - see the module docstring.
+
+        gate = CaptureGate(velocity=joint_speed_at)
+        shot = gate.capture_all(["station", "wrist"], newer_than=settled_at)
+
+    (capture_all() is capture_all_frames(..., gate=gate).) velocity(t)
+    returns the arm's joint speed (deg/s, mm/s for Z) at time.monotonic()
+    instant t, or None when there's no feedback (demo mode) - in which
+    case only sharpness is gated.
+    """
+
+    def __init__(self, velocity: Optional[Callable[[float], Optional[float]]] = None,
+                 min_sharpness: float = CAPTURE_GATE_MIN_SHARPNESS,
+                 max_velocity: float = CAPTURE_GATE_MAX_VELOCITY,
+                 deadline: float = CAPTURE_GATE_DEADLINE_SECONDS):
+        self.velocity = velocity
+        self.min_sharpness = min_sharpness
+        self.max_velocity = max_velocity
+        self.deadline = deadline
+
+    def _speed(self, timestamp: float) -> Optional[float]:
+        if self.velocity is None:
+            return None
+        try:
+            return self.velocity(timestamp)
+        except Exception:
+            return None
+
+    def capture(self, camera_name: str, newer_than: float = None) -> GatedFrame:
+        """The first frame after *newer_than* that passes, or the best one
+        seen by the deadline. Raises RuntimeError only if the camera
+        produced no frame at all."""
+        deadline = time.monotonic() + self.deadline
+        after = newer_than
+        best = None
+        candidates = 0
+        while True:
+            try:
+                frame, timestamp = capture_timestamped_frame(
+                    camera_name, newer_than=after,
+                    timeout=(max(0.05, deadline - time.monotonic()) if best is not None
+                             else CAMERA_FRAME_TIMEOUT_SECONDS))
+            except RuntimeError:
+                if best is None:
+                    raise
+                break
+            candidates += 1
+            speed = self._speed(timestamp)
+            score = sharpness(frame)
+            steady = speed is None or speed <= self.max_velocity
+            candidate = GatedFrame(frame, timestamp, score, speed,
+                                   steady and score >= self.min_sharpness, candidates)
+            if candidate.passed:
+                return candidate
+            # Best effort: steadiest first, then sharpest.
+            rank = (steady, score)
+            if best is None or rank > best[0]:
+                best = (rank, candidate)
+            after = timestamp
+            if time.monotonic() >= deadline:
+                break
+        result = best[1]
+        result.candidates = candidates
+        return result
+
+    def capture_all(self, camera_names, newer_than: float = None):
+        """Every camera gated concurrently - see capture_all_frames()."""
+        return capture_all_frames(camera_names, newer_than=newer_than, gate=self)
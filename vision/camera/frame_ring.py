@@ -0,0 +1,305 @@
+"""
+[WIRED] Rolling in-memory frame history per camera, exported only on request.
+
+THE PROBLEM THIS SOLVES
+-------------------------
+When a sweep or rotation capture goes wrong - a blurred view, an object
+knocked over between triggers, a camera that dropped out - the only
+evidence is the handful of frames that were actually saved. What the
+cameras saw between those triggers is gone, so "what happened?" turns
+into re-running the capture and watching.
+
+HOW
+----
+FrameRecorder listens to the background frame grabbers
+(vision.camera.capture.add_frame_listener) and keeps, per camera, a
+FrameRing: the last FRAME_RING_SECONDS of frames, taken at most
+FRAME_RING_FPS times a second, shrunk to FRAME_RING_WIDTH px wide and
+JPEG-compressed in memory (~10-20 KB each at 320 px). Each ring is
+bounded twice - by age and by FRAME_RING_MAX_BYTES - so memory stays
+flat however long the app runs. The downscale + encode runs on the
+grabber's thread only for the decimated frames (~1 ms each at the
+defaults); every other frame costs one timestamp comparison.
+
+Capture code marks events as they happen (mark_event: sweep triggers,
+rotation views, camera/rotation errors) - just a label and a
+time.monotonic() stamp in memory. export() then writes the frames from
+*before* seconds ahead of an event to *after* seconds past it as a frame
+set - per-camera JPEGs named by their offset from the event, plus a
+manifest.json - and optionally one MJPG .avi clip per camera, under
+images/clips/. Nothing is ever written to disk unless export() is
+called (the Camera tab's Frame History panel), so a normal run's I/O
+is unchanged.
+
+Only cameras whose background grabber is running are recorded - anything
+captured from or shown in the live feed within the last
+CAMERA_GRABBER_IDLE_SECONDS (an unread grabber stops itself).
+Off by default - set FRAME_RING_ENABLED in vision/config.py.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import cv2
+    _CV2_AVAILABLE = True
+except ImportError:
+    _CV2_AVAILABLE = False
+
+import numpy as np
+
+from vision.config import (
+    FRAME_RING_SECONDS,
+    FRAME_RING_FPS,
+    FRAME_RING_WIDTH,
+    FRAME_RING_JPEG_QUALITY,
+    FRAME_RING_MAX_BYTES,
+)
+from vision.camera.capture import add_frame_listener, remove_frame_listener, list_configured_cameras
+
+CLIPS_ROOT = os.path.join("images", "clips")
+
+
+@dataclass
+class RingFrame:
+    timestamp: float      # time.monotonic() the frame was grabbed at
+    wall_time: float      # the same instant as time.time()
+    jpeg: bytes
+    width: int
+    height: int
+
+
+@dataclass
+class FrameEvent:
+    label: str
+    kind: str             # "trigger" / "error" / "manual"
+    timestamp: float      # time.monotonic()
+    wall_time: float
+
+    def describe(self) -> str:
+        when = datetime.fromtimestamp(self.wall_time).strftime("%H:%M:%S")
+        return f"{when}  [{self.kind}]  {self.label}"
+
+
+class FrameRing:
+    """One camera's bounded frame history (oldest first). Thread-safe."""
+
+    def __init__(self, seconds: float = FRAME_RING_SECONDS, fps: float = FRAME_RING_FPS,
+                 max_bytes: int = FRAME_RING_MAX_BYTES):
+        self.seconds = seconds
+        self.min_interval = 1.0 / fps if fps > 0 else 0.0
+        self.max_bytes = max_bytes
+        self._frames = deque()
+        self._bytes = 0
+        self._last = float("-inf")
+        self._lock = threading.Lock()
+
+    def wants(self, timestamp: float) -> bool:
+        """False for frames that would exceed the ring's frame rate - check
+        before paying for the encode."""
+        return timestamp - self._last >= self.min_interval
+
+    def push(self, frame: RingFrame) -> None:
+        with self._lock:
+            self._last = frame.timestamp
+            self._frames.append(frame)
+            self._bytes += len(frame.jpeg)
+            cutoff = frame.timestamp - self.seconds
+            while self._frames and (self._frames[0].timestamp < cutoff or self._bytes > self.max_bytes):
+                self._bytes -= len(self._frames.popleft().jpeg)
+
+    def frames(self, start: float = float("-inf"), end: float = float("inf")) -> List[RingFrame]:
+        with self._lock:
+            return [f for f in self._frames if start <= f.timestamp <= end]
+
+    def stats(self) -> dict:
+        with self._lock:
+            span = self._frames[-1].timestamp - self._frames[0].timestamp if self._frames else 0.0
+            return {"frames": len(self._frames), "bytes": self._bytes, "span_s": span}
+
+
+class FrameRecorder:
+    """
+    Per-camera FrameRings fed by the frame grabbers, plus a short list of
+    marked events - see the module docstring.
+
+        frame_recorder.start()
+        frame_recorder.mark_event("rotation view 3 failed", kind="error")
+        path = frame_recorder.export(frame_recorder.events()[-1], before=5, after=1)
+    """
+
+    def __init__(self, seconds: float = FRAME_RING_SECONDS, fps: float = FRAME_RING_FPS,
+                 width: int = FRAME_RING_WIDTH, quality: int = FRAME_RING_JPEG_QUALITY,
+                 max_bytes: int = FRAME_RING_MAX_BYTES, max_events: int = 200):
+        self.seconds = seconds
+        self.fps = fps
+        self.width = width
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self._rings: Dict[int, FrameRing] = {}
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self) -> "FrameRecorder":
+        if not _CV2_AVAILABLE:
+            raise ImportError("opencv-python is not installed. Run: pip install opencv-python")
+        self._running = True
+        add_frame_listener(self._on_frame)
+        return self
+
+    def stop(self) -> None:
+        """Stop recording and drop everything held in memory."""
+        self._running = False
+        remove_frame_listener(self._on_frame)
+        with self._lock:
+            self._rings.clear()
+            self._events.clear()
+
+    # ------------------------------------------------------------------
+    # Recording (grabber threads)
+    # ------------------------------------------------------------------
+
+    def _ring(self, index: int) -> FrameRing:
+        ring = self._rings.get(index)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.setdefault(index, FrameRing(self.seconds, self.fps, self.max_bytes))
+        return ring
+
+    def _on_frame(self, index: int, frame, timestamp: float) -> None:
+        ring = self._ring(index)
+        if not ring.wants(timestamp):
+            return
+        h, w = frame.shape[:2]
+        if w > self.width:
+            frame = cv2.resize(frame, (self.width, max(1, h * self.width // w)),
+                               interpolation=cv2.INTER_AREA)
+        ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            return
+        wall_time = time.time() - (time.monotonic() - timestamp)
+        ring.push(RingFrame(timestamp, wall_time, encoded.tobytes(), frame.shape[1], frame.shape[0]))
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def mark_event(self, label: str, kind: str = "trigger", timestamp: float = None) -> Optional[FrameEvent]:
+        """Remember that *label* happened at *timestamp* (time.monotonic(),
+        default now). A no-op returning None while not recording."""
+        if not self._running:
+            return None
+        now = time.monotonic()
+        timestamp = now if timestamp is None else timestamp
+        event = FrameEvent(label, kind, timestamp, time.time() - (now - timestamp))
+        with self._lock:
+            self._events.append(event)
+        return event
+
+    def events(self) -> List[FrameEvent]:
+        """Marked events still covered by the history, oldest first."""
+        cutoff = time.monotonic() - self.seconds
+        with self._lock:
+            return [e for e in self._events if e.timestamp >= cutoff]
+
+    def stats(self) -> Dict[str, dict]:
+        names = _camera_names()
+        with self._lock:
+            rings = dict(self._rings)
+        return {names.get(i, f"index{i}"): ring.stats() for i, ring in rings.items()}
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export(self, event: FrameEvent = None, before: float = None, after: float = 1.0,
+               video: bool = False, dest_root: str = CLIPS_ROOT) -> str:
+        """
+        Write every camera's frames from *before* s ahead of *event* (default:
+        a "manual" event now; *before* defaults to the whole history) to
+        *after* s past it. Blocks until *after* has elapsed if it hasn't yet.
+        Returns the clip directory; raises RuntimeError if no camera has
+        frames in that window.
+        """
+        if event is None:
+            now = time.monotonic()
+            event = FrameEvent("manual export", "manual", now, time.time())
+        before = self.seconds if before is None else before
+        wait = event.timestamp + after - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        start, end = event.timestamp - before, event.timestamp + after
+
+        names = _camera_names()
+        with self._lock:
+            rings = dict(self._rings)
+        selected = {names.get(i, f"index{i}"): ring.frames(start, end) for i, ring in sorted(rings.items())}
+        selected = {name: frames for name, frames in selected.items() if frames}
+        if not selected:
+            raise RuntimeError("No recorded camera frames around that event - is a camera "
+                               "grabber running (capture or live feed)?")
+
+        stamp = datetime.fromtimestamp(event.wall_time).strftime("%Y%m%d_%H%M%S")
+        slug = re.sub(r"[^\w\-]+", "_", event.label).strip("_")[:40]
+        clip_dir = os.path.abspath(os.path.join(dest_root, f"{stamp}_{slug}"))
+        manifest = {
+            "event": {"label": event.label, "kind": event.kind,
+                      "time": datetime.fromtimestamp(event.wall_time).isoformat(timespec="milliseconds")},
+            "before_s": before, "after_s": after, "cameras": {},
+        }
+        for name, frames in selected.items():
+            cam_dir = os.path.join(clip_dir, name)
+            os.makedirs(cam_dir, exist_ok=True)
+            entries = []
+            for n, frame in enumerate(frames):
+                offset_ms = round((frame.timestamp - event.timestamp) * 1000)
+                file_name = f"{n:04d}_{offset_ms:+06d}ms.jpg"
+                with open(os.path.join(cam_dir, file_name), "wb") as f:
+                    f.write(frame.jpeg)
+                entries.append({"file": f"{name}/{file_name}", "offset_s": offset_ms / 1000.0,
+                                "time": datetime.fromtimestamp(frame.wall_time).isoformat(timespec="milliseconds")})
+            manifest["cameras"][name] = entries
+            if video:
+                self._write_video(os.path.join(clip_dir, f"{name}.avi"), frames)
+        with open(os.path.join(clip_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        return clip_dir
+
+    def _write_video(self, path: str, frames: List[RingFrame]) -> None:
+        size = (frames[0].width, frames[0].height)
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), self.fps, size)
+        try:
+            for frame in frames:
+                img = cv2.imdecode(np.frombuffer(frame.jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+                if (img.shape[1], img.shape[0]) != size:
+                    img = cv2.resize(img, size)
+                writer.write(img)
+        finally:
+            writer.release()
+
+
+def _camera_names() -> Dict[int, str]:
+    """device index -> configured camera name (first name wins)."""
+    names = {}
+    for name, index in list_configured_cameras().items():
+        names.setdefault(index, name)
+    return names
+
+
+# Shared instance. Started by main.py when FRAME_RING_ENABLED is set;
+# mark_event() is a no-op until then, so capture code can call it freely.
+frame_recorder = FrameRecorder()
@@ -56,10 +56,95 @@ CAMERAS = {
 CAMERA_FRAME_WIDTH = 1280
 CAMERA_FRAME_HEIGHT = 720
 
+# Background frame grabbers (vision.camera.capture.FrameGrabber). When on,
+# each camera gets one thread that reads it continuously into a "latest
+# frame" buffer, and every capture_frame() caller (live feed, rotation
+# captures, Capture Photo) is served from that one stream - instantly,
+# and never with a stale frame left sitting in the UVC driver's queue.
+# Off = the old behavior: each capture_frame() does its own cap.read().
+CAMERA_BACKGROUND_GRABBER = True
+# How long capture_frame() waits for a (fresh enough) frame before giving
+# up with RuntimeError, and how old the newest frame may be before it
+# counts as stale (camera stalled / unplugged) and a new one is awaited.
+CAMERA_FRAME_TIMEOUT_SECONDS = 2.0
+CAMERA_MAX_FRAME_AGE_SECONDS = 1.0
+# A grabber nobody has read a frame from for this long stops and releases
+# its camera (the next capture or live-feed read starts it again), so a
+# camera isn't decoded forever after the live feed is stopped or the tab
+# is hidden. A camera that can't be opened at all isn't retried in the
+# background - the next read tries once more.
+CAMERA_GRABBER_IDLE_SECONDS = 15.0
+# capture_all_frames() triggers every camera at once; a view whose frames
+# were grabbed further apart than this gets a warning printed (the object
+# may have been captured at visibly different moments).
+CAMERA_SKEW_WARN_SECONDS = 0.1
+# Frame history (vision/camera/frame_ring.py): while enabled, every
+# running camera grabber keeps its last FRAME_RING_SECONDS of frames in
+# memory - FRAME_RING_FPS of them a second, shrunk to FRAME_RING_WIDTH px
+# wide and JPEG-compressed, never more than FRAME_RING_MAX_BYTES per
+# camera - so what the cameras saw around a sweep trigger or a failed
+# rotation view can be saved afterwards (Camera tab > Frame History).
+# Nothing is written to disk unless a clip is exported.
+FRAME_RING_ENABLED = False
+FRAME_RING_SECONDS = 10.0
+FRAME_RING_FPS = 5.0
+FRAME_RING_WIDTH = 320
+FRAME_RING_JPEG_QUALITY = 70
+FRAME_RING_MAX_BYTES = 8 * 1024 * 1024
+# Camera discovery (vision.camera.capture.camera_discovery): indices
+# 0..MAX_INDEX-1 are probed concurrently; the result is reused until a
+# camera read fails, /dev/video* changes (Linux), or TTL_SECONDS pass.
+CAMERA_DISCOVERY_MAX_INDEX = 5
+CAMERA_DISCOVERY_TTL_SECONDS = 300.0
+# Write-behind image saving (vision.camera.capture.ImageWritePool): JPEG
+# encode/write threads, and how many frames may be queued or in flight
+# before submit() blocks the capture loop (~2.7 MB each at 1280x720).
+IMAGE_WRITE_WORKERS = 4
+IMAGE_WRITE_MAX_PENDING = 16
+# Content-addressed image store (vision/storage/image_store.py): every
+# saved/received/imported image is kept once under its SHA-256 in
+# images/store/, and the usual per-object paths are hard links to it, so
+# identical images (re-sent bundles, re-imported packages, exports on
+# the same drive) cost no extra disk. False = plain files, as before.
+IMAGE_STORE_ENABLED = True
+# Cached previews (vision/storage/thumbnails.py): longest side in px of
+# each preview level, generated lazily on THUMBNAIL_WORKERS threads and
+# kept under images/thumbs/. The object viewer shows the 512 px level
+# (full resolution on click); the Excel report links/embeds them.
+THUMBNAIL_SIZES = (128, 512)
+THUMBNAIL_JPEG_QUALITY = 85
+THUMBNAIL_WORKERS = 2
+
+# Capture gate for rotation views (vision/camera/capture_gate.py): each
+# view's frame is the first one that is both sharp (Laplacian variance of
+# the central ROI, downscaled, >= MIN_SHARPNESS) and taken while the arm
+# is steady (max joint speed from feedback <= MAX_VELOCITY, deg/s), or
+# else the best one seen within DEADLINE_SECONDS. Sharpness scores are
+# scene-dependent — check the per-view "sharp" figures the rotation log
+# prints before tightening MIN_SHARPNESS. Off by default: MIN_SHARPNESS is
+# an absolute score, and a low-texture backdrop that never reaches it adds
+# the whole deadline to every view - calibrate it against those logged
+# scores for your own scene before turning the gate on.
+CAPTURE_GATE_ENABLED = False
+CAPTURE_GATE_MIN_SHARPNESS = 100.0
+CAPTURE_GATE_MAX_VELOCITY = 0.5
+CAPTURE_GATE_DEADLINE_SECONDS = 1.0
+CAPTURE_GATE_ROI = 0.5          # central fraction of the frame scored
+CAPTURE_GATE_WIDTH = 320        # ROI is downscaled to this width first
+
 # How often the live preview panel grabs a new frame. Lower = smoother
 # but more CPU/USB bandwidth; 10 fps is a reasonable default for a
 # Tkinter preview (not meant to be broadcast-quality video).
 LIVE_FEED_FPS = 10
+# Each panel drops toward LIVE_FEED_MIN_FPS while the GUI thread is
+# falling behind (and climbs back to LIVE_FEED_FPS once it catches up);
+# previews are scaled down to fit LIVE_FEED_MAX_SIZE (w, h) before they
+# ever reach Tk. While the Camera tab isn't showing (or the window is
+# minimised) no preview frames are processed at all — the panels just
+# check back every LIVE_FEED_HIDDEN_POLL_MS.
+LIVE_FEED_MIN_FPS = 2
+LIVE_FEED_MAX_SIZE = (480, 360)
+LIVE_FEED_HIDDEN_POLL_MS = 500
 
 # ===========================================================================
 # ENVIRONMENT TOGGLE
@@ -267,14 +267,22 @@ class PhysicalSideController:
                 self.on_log(f"[MIDDLEMAN] Discovery publish error: {e}")
             time.sleep(MIDDLEMAN_HEARTBEAT_INTERVAL_SECONDS)
 
+    def publish_telemetry(self) -> None:
+        """Publish one telemetry snapshot right now. _telemetry_loop calls
+        this at heartbeat rate as a keep-alive; main.py also calls it from
+        an on-change telemetry_hub subscription so a moving arm is mirrored
+        live while an idle one costs nothing extra."""
+        if self.telemetry_provider is None or self._stop_event.is_set():
+            return
+        try:
+            data = self.telemetry_provider()
+            self._client.publish(self._telemetry_topic, json.dumps(data))
+        except Exception as e:
+            self.on_log(f"[MIDDLEMAN] Telemetry publish error: {e}")
+
     def _telemetry_loop(self) -> None:
         while not self._stop_event.is_set():
-            if self.telemetry_provider is not None:
-                try:
-                    data = self.telemetry_provider()
-                    self._client.publish(self._telemetry_topic, json.dumps(data))
-                except Exception as e:
-                    self.on_log(f"[MIDDLEMAN] Telemetry publish error: {e}")
+            self.publish_telemetry()
             time.sleep(MIDDLEMAN_HEARTBEAT_INTERVAL_SECONDS)
 
     def _timeout_watch_loop(self) -> None:
@@ -41,8 +41,10 @@ except ImportError:
 from vision.config import (
     MIDDLEMAN_PHOTO_TRANSFER_MAX_DIMENSION,
     MIDDLEMAN_PHOTO_TRANSFER_JPEG_QUALITY,
+    IMAGE_STORE_ENABLED,
 )
 from vision.storage.capture_pipeline import record_capture
+from vision.storage.image_store import get_image_store
 
 
 def _require_cv2():
@@ -135,8 +137,13 @@ def save_photo_bundle_files(bundle: dict, save_root: str = "images/middleman") -
         # which machine/path wrote them.
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         path = os.path.abspath(os.path.join(sample_dir, f"{timestamp}_{source}_{view_index}.jpg"))
-        with open(path, "wb") as f:
-            f.write(jpeg_bytes)
+        if IMAGE_STORE_ENABLED:
+            # A bundle re-sent after a lost ack carries the same bytes:
+            # stored once, the second path is just a link.
+            get_image_store().put_bytes(jpeg_bytes, path)
+        else:
+            with open(path, "wb") as f:
+                f.write(jpeg_bytes)
         paths_by_source[source] = path
 
     return paths_by_source
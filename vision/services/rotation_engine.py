@@ -0,0 +1,230 @@
+"""
+[WIRED] Pipelined J4 rotation capture: the move/settle/grab/save loop
+behind main.run_data_collection_rotation_local and
+main.run_automatic_capture_sequence.
+
+THE PROBLEM THIS SOLVES
+-------------------------
+Both rotation sequences used to run every view strictly in series -
+move, wait for the arm, grab from each camera, JPEG-encode and write
+each frame, publish the per-image status - and only then send the next
+move. The arm sat still for the whole encode/write/publish tail of every
+view, and on a 36-view collection with several cameras that tail was
+most of the run.
+
+HOW
+----
+Per view, only what physically has to happen with the arm parked stays
+on the calling (arm) thread:
+
+    move   - send the JointMovJ for this view's J4 angle
+    settle - wait for the feedback stream to report the arm settled
+    grab   - capture_all_frames(newer_than=<settle time>) - every camera
+             at once, and because the background grabbers have been
+             reading all along, a frame exposed just after the settle
+             packet is usually already there: the grab overlaps the
+             settle detection instead of starting after it. With a
+             CaptureGate (vision/camera/capture_gate.py) each camera's
+             frame must also be sharp and taken with the arm steady.
+    queue  - hand the frames to the ImageWritePool (returns immediately
+             unless the pool is full - see its backpressure)
+
+and the arm is sent to the next angle straight away. Meanwhile, off the
+arm thread:
+
+    write  - the frames are encoded and written by the pool's workers
+    post   - once a view's writes land, on_view(index, pairs) runs on the
+             engine's post thread (status publishes, progress updates,
+             anything slow that needs the paths), in view order
+
+run() returns once every view's writes and post step have finished, so
+callers can go straight on to record_capture()/uploads.
+
+Each view's settle moment (and any camera failure or abort) is marked
+on the frame recorder (vision/camera/frame_ring.py), so when frame
+history is on, what the cameras saw around it can be exported later.
+
+Every view gets a ViewTiming with all six stage durations, printed as
+the view completes and summarised at the end, so it's visible where a
+run's time actually goes.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from vision.camera.capture import capture_all_frames, image_writer
+from vision.camera.frame_ring import frame_recorder
+
+
+@dataclass
+class ViewTiming:
+    index: int
+    j4: float
+    move_s: float = 0.0
+    settle_s: float = 0.0
+    grab_s: float = 0.0
+    queue_s: float = 0.0
+    write_s: Optional[float] = None   # submit -> last of the view's images on disk
+    post_s: Optional[float] = None    # on_view callback
+    cameras: int = 0
+    skew_s: float = 0.0
+    sharpness: Optional[float] = None  # lowest gate score across cameras (gated runs only)
+
+    @property
+    def arm_s(self) -> float:
+        """Time the arm thread spent on this view (move + settle + grab + queue)."""
+        return self.move_s + self.settle_s + self.grab_s + self.queue_s
+
+    def describe(self) -> str:
+        def ms(v):
+            return "-" if v is None else f"{v * 1000:.0f}"
+        sharp = "" if self.sharpness is None else f", sharp {self.sharpness:.0f}"
+        return (f"view {self.index + 1} J4={self.j4:.1f}: move {ms(self.move_s)} / "
+                f"settle {ms(self.settle_s)} / grab {ms(self.grab_s)} / queue {ms(self.queue_s)} ms "
+                f"| write {ms(self.write_s)} / post {ms(self.post_s)} ms "
+                f"({self.cameras} cam, skew {ms(self.skew_s)} ms{sharp})")
+
+
+@dataclass
+class RotationResult:
+    images: List[Tuple[str, str]] = field(default_factory=list)  # (camera, path), capture order
+    timings: List[ViewTiming] = field(default_factory=list)
+    failed_cameras: set = field(default_factory=set)
+    elapsed_s: float = 0.0
+
+    def summary(self) -> str:
+        """Per-stage mean / max over all views, plus the wall time."""
+        if not self.timings:
+            return f"0 views in {self.elapsed_s:.1f} s"
+        lines = [f"{len(self.timings)} views, {len(self.images)} images in {self.elapsed_s:.1f} s"]
+        for stage in ("move_s", "settle_s", "grab_s", "queue_s", "write_s", "post_s"):
+            values = [getattr(t, stage) for t in self.timings if getattr(t, stage) is not None]
+            if values:
+                lines.append(f"  {stage[:-2]:<6} mean {sum(values) / len(values) * 1000:7.1f} ms   "
+                             f"max {max(values) * 1000:7.1f} ms   total {sum(values):6.1f} s")
+        return "\n".join(lines)
+
+
+class RotationEngine:
+    """
+    Runs one rotation sequence - see the module docstring.
+
+        engine = RotationEngine(
+            targets=[[j1, j2, z, base_j4 + i * step] for i in range(n)],
+            move=send_move,                 # target -> None, raises on failure
+            wait_settled=wait_for_arrival,  # target -> time.monotonic() it settled at
+            sample_id=sample_id,
+            cameras=list_configured_cameras(),
+            on_view=lambda i, pairs: ...,   # post stage, optional
+        )
+        result = engine.run()
+
+    A camera that fails a grab is dropped for the rest of the run
+    (failed_cameras), as the old loops did. on_capture(index, shot), if
+    given, runs on the arm thread right after each grab - keep it cheap
+    (status text, a skew warning). With a *gate* every grab goes through
+    it (see CaptureGate). A set cancel_event stops the run
+    before the next move with RuntimeError("Cancelled by user."); images
+    already queued are still written.
+    """
+
+    def __init__(self, targets: Sequence[Sequence[float]],
+                 move: Callable[[Sequence[float]], None],
+                 wait_settled: Callable[[Sequence[float]], float],
+                 sample_id: str, cameras: Sequence[str],
+                 on_capture: Optional[Callable] = None,
+                 on_view: Optional[Callable[[int, List[Tuple[str, str]]], None]] = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 gate=None, writer=None, label: str = "ROTATION"):
+        self.targets = [list(t) for t in targets]
+        self.move = move
+        self.wait_settled = wait_settled
+        self.sample_id = sample_id
+        self.cameras = list(cameras)
+        self.on_capture = on_capture
+        self.on_view = on_view
+        self.cancel_event = cancel_event
+        self.gate = gate
+        self.writer = writer or image_writer()
+        self.label = label
+
+    def run(self) -> RotationResult:
+        result = RotationResult()
+        started = time.monotonic()
+        post_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rotation-post")
+        posts = []
+        try:
+            for i, target in enumerate(self.targets):
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    raise RuntimeError("Cancelled by user.")
+                timing = ViewTiming(i, float(target[3]))
+                result.timings.append(timing)
+
+                t = time.monotonic()
+                self.move(target)
+                timing.move_s = time.monotonic() - t
+
+                t = time.monotonic()
+                settled_at = self.wait_settled(target)
+                timing.settle_s = time.monotonic() - t
+
+                t = time.monotonic()
+                shot = capture_all_frames([c for c in self.cameras if c not in result.failed_cameras],
+                                          newer_than=settled_at, gate=self.gate)
+                timing.grab_s = time.monotonic() - t
+                frame_recorder.mark_event(f"{self.label} view {i + 1} (J4={target[3]:.1f})",
+                                          timestamp=settled_at)
+                timing.cameras = len(shot.frames)
+                timing.skew_s = shot.skew_s
+                if shot.sharpness:
+                    timing.sharpness = min(shot.sharpness.values())
+                for camera_name, passed in shot.gate_passed.items():
+                    if not passed:
+                        print(f"[{self.label}] View {i + 1}: no frame from '{camera_name}' passed the "
+                              f"capture gate in time; using the best one "
+                              f"(sharpness {shot.sharpness[camera_name]:.0f}).")
+                for camera_name, error in shot.errors.items():
+                    print(f"[{self.label}] '{camera_name}' unavailable: {error}")
+                    frame_recorder.mark_event(f"{self.label} view {i + 1}: '{camera_name}' failed",
+                                              kind="error")
+                    result.failed_cameras.add(camera_name)
+                if self.on_capture is not None:
+                    self.on_capture(i, shot)
+
+                t = time.monotonic()
+                writes = [(camera_name, self.writer.submit(frame, self.sample_id, camera_name, i))
+                          for camera_name, frame in shot.frames.items()]
+                timing.queue_s = time.monotonic() - t
+
+                posts.append(post_pool.submit(self._post, timing, writes, t))
+        except Exception as e:
+            frame_recorder.mark_event(f"{self.label} stopped: {e}", kind="error")
+            raise
+        finally:
+            # Every queued write and post step finishes either way - a
+            # cancelled or failed run still leaves its images on disk.
+            post_pool.shutdown(wait=True)
+
+        for post in posts:
+            result.images.extend(post.result())
+        result.elapsed_s = time.monotonic() - started
+        print(f"[{self.label}] {result.summary()}")
+        return result
+
+    def _post(self, timing: ViewTiming, writes, submitted_at: float) -> List[Tuple[str, str]]:
+        pairs = [(camera_name, future.result()) for camera_name, future in writes]
+        timing.write_s = time.monotonic() - submitted_at
+        if self.on_view is not None:
+            t = time.monotonic()
+            try:
+                self.on_view(timing.index, pairs)
+            except Exception as e:
+                print(f"[{self.label}] View {timing.index + 1} post step failed: {e}")
+            timing.post_s = time.monotonic() - t
+        print(f"[{self.label}] {timing.describe()}")
+        return pairs
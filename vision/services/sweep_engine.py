@@ -0,0 +1,206 @@
+"""
+[WIRED] Position-triggered capture for continuous sweeps: fires a
+trigger every time the arm has moved a fixed number of degrees (mm, for
+J3) since the last one, detected from the full-rate feedback stream
+rather than by polling.
+
+THE PROBLEM THIS SOLVES
+-------------------------
+main.run_continuous_sweep used to poll joint angles every 100 ms (via
+robot.get_j1_angle() and friends — methods dobot_util never had) and
+fire when some joint had moved past SWEEP_TRIGGER_DEGREES since the last
+photo, then made the blocking requests.post for that trigger right there
+in the loop. So where a trigger actually landed depended on where the
+arm happened to be when the poll came round (on a fast sweep, easily
+several degrees past the threshold), and a slow HTTP round trip pushed
+every later check back further still.
+
+HOW
+----
+SweepEngine subscribes to dobot_util's TelemetryHub at the full 8 ms
+packet rate. For each new packet it treats the motion since the previous
+packet as a straight line in joint space and solves for the exact point
+along it where some watched joint first gets *step* away from the last
+trigger position — so triggers land at last + step precisely (0, 25,
+50, ... for a pure J1 sweep), however fast the arm is moving or however
+the packets happen to fall, and a packet gap that spans several steps
+yields every one of them. Each trigger's arrival time is interpolated
+the same way.
+
+The crossing maths runs on the hub's pump thread and takes microseconds;
+the trigger itself (the HTTP call to 4DAI, an MQTT status publish, ...)
+is handed to a small thread pool, so a slow server never delays the next
+crossing check — it only delays that trigger's own request.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+
+@dataclass
+class SweepTrigger:
+    index: int
+    joints: List[float]          # interpolated [J1, J2, J3, J4] at the crossing
+    timestamp: float             # time.monotonic() of the crossing (interpolated)
+    reason: str = "crossing"     # "start" / "crossing" / "end"
+    dispatched_at: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def dispatch_delay_ms(self) -> Optional[float]:
+        """How long after the crossing the trigger callback actually ran."""
+        if self.dispatched_at is None:
+            return None
+        return (self.dispatched_at - self.timestamp) * 1000.0
+
+
+class SweepEngine:
+    """
+    Fires dispatch(trigger) every *step* degrees/mm of travel on any of
+    *axes* (indices into [J1, J2, J3, J4]; J1/J2/J3 by default, same as
+    the old polling loop) — see the module docstring.
+
+        engine = SweepEngine(telemetry_hub, 25.0, send_trigger)
+        engine.start()          # fires trigger 0 at the current position
+        ... move the arm, wait for it to arrive ...
+        engine.finish()         # fires a final trigger, waits for dispatch
+        engine.close()          # always (e.g. in a finally): unsubscribes, frees the pool
+
+    dispatch runs on one of *max_workers* pool threads; exceptions it
+    raises are printed and otherwise ignored, so one failed request
+    doesn't end the sweep.
+    """
+
+    def __init__(self, hub, step: float, dispatch: Callable[[SweepTrigger], None],
+                 axes: Sequence[int] = (0, 1, 2), max_workers: int = 4):
+        if step <= 0:
+            raise ValueError("step must be positive")
+        self.hub = hub
+        self.step = float(step)
+        self.dispatch = dispatch
+        self.axes = list(axes)
+        self.triggers: List[SweepTrigger] = []
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sweep-trigger")
+        self._futures = []
+        self._lock = threading.Lock()
+        self._sub = None
+        self._anchor = None      # joint position of the last trigger
+        self._prev = None        # (joints, arrival) of the previous packet
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self, origin: Optional[Sequence[float]] = None) -> "SweepEngine":
+        """Fire trigger 0 at *origin* (default: the latest live position)
+        and start watching the stream."""
+        if origin is None:
+            latest = self.hub.latest()
+            if latest is None:
+                raise RuntimeError("No live telemetry yet — can't anchor the sweep.")
+            origin = latest.joints
+        origin = np.asarray(origin, dtype=np.float64)[:4]
+        with self._lock:
+            self._anchor = origin.copy()
+            self._prev = None
+            self._fire(origin, time.monotonic(), "start")
+        self._sub = self.hub.subscribe(self._on_sample, name="sweep engine")
+        return self
+
+    def finish(self, final_joints: Optional[Sequence[float]] = None, timeout: Optional[float] = None) -> List[SweepTrigger]:
+        """Stop watching, fire one last trigger at the end position, then
+        wait up to *timeout* for every outstanding dispatch. Returns all
+        triggers fired, in order."""
+        self.stop_watching()
+        if final_joints is None:
+            latest = self.hub.latest()
+            final_joints = latest.joints if latest is not None else self._anchor
+        with self._lock:
+            self._fire(np.asarray(final_joints, dtype=np.float64)[:4], time.monotonic(), "end")
+        self.wait(timeout)
+        self._pool.shutdown(wait=False)
+        return list(self.triggers)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop watching, wait up to *timeout* for dispatches already
+        started, and release the pool - without firing an end trigger.
+        Safe to call after finish(), and more than once."""
+        self.stop_watching()
+        self.wait(timeout)
+        self._pool.shutdown(wait=False)
+
+    def stop_watching(self) -> None:
+        if self._sub is not None:
+            self._sub.cancel()
+            self._sub = None
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until every trigger dispatched so far has finished."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            futures = list(self._futures)
+        for f in futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                f.result(timeout=remaining)
+            except Exception:
+                pass  # already reported by _run_dispatch
+
+    # ------------------------------------------------------------------
+    # Crossing detection
+    # ------------------------------------------------------------------
+
+    def _on_sample(self, sample) -> None:
+        q = np.asarray(sample.joints, dtype=np.float64)
+        with self._lock:
+            if self._anchor is None:
+                return
+            if self._prev is None:
+                self._prev = (q, sample.arrival)
+                return
+            p0, t0 = self._prev
+            self._prev = (q, sample.arrival)
+            self._crossings(p0, t0, q, sample.arrival)
+
+    def _crossings(self, p0, t0, p1, t1) -> None:
+        """Fire every trigger crossed on the straight segment p0 -> p1.
+        Caller holds _lock."""
+        delta = p1 - p0
+        start = 0.0            # fraction of the segment already consumed
+        while True:
+            best = None
+            for k in self.axes:
+                d = delta[k]
+                if d == 0.0:
+                    continue
+                # Where along the segment does |p(s)[k] - anchor[k]| reach
+                # step? Solve for both signs and keep the first one ahead.
+                for target in (self._anchor[k] + self.step, self._anchor[k] - self.step):
+                    s = (target - p0[k]) / d
+                    if start < s <= 1.0 and (best is None or s < best):
+                        best = s
+            if best is None:
+                return
+            point = p0 + best * delta
+            self._anchor = point.copy()
+            self._fire(point, t0 + best * (t1 - t0), "crossing")
+            start = best
+
+    def _fire(self, joints, timestamp: float, reason: str) -> None:
+        """Record a trigger and hand it to the pool. Caller holds _lock."""
+        trigger = SweepTrigger(len(self.triggers), [float(v) for v in joints], timestamp, reason)
+        self.triggers.append(trigger)
+        self._futures.append(self._pool.submit(self._run_dispatch, trigger))
+
+    def _run_dispatch(self, trigger: SweepTrigger) -> None:
+        trigger.dispatched_at = time.monotonic()
+        try:
+            self.dispatch(trigger)
+        except Exception as e:
+            print(f"[SWEEP] Trigger #{trigger.index} dispatch failed: {e}")
@@ -33,7 +33,8 @@ import uuid
 from datetime import datetime
 from typing import Dict, List, Tuple
 
-from vision.storage import attribute_schema, csv_logger, excel_export, mongo_client, object_catalog, session_manager
+from vision.config import IMAGE_STORE_ENABLED
+from vision.storage import attribute_schema, csv_logger, excel_export, image_store, mongo_client, object_catalog, session_manager
 
 
 def build_object_data(name: str, category: str = None, color: str = None,
@@ -130,6 +131,13 @@ def record_capture(name: str, image_paths_by_source, category: str = None,
             session_id=session_id, captured_at=captured_at,
         )
         image_paths.append(path)
+        if IMAGE_STORE_ENABLED:
+            # Best effort: the Mongo record is what matters; the store's
+            # reference only feeds dedupe lookups and garbage collection.
+            try:
+                image_store.get_image_store().add_reference(path, object_id, image_id)
+            except Exception as e:
+                warnings.append(f"Image store reference for {path} failed: {e}")
 
     catalog_id = object_catalog.match_or_create(
         object_id, name=name, category=category, color=color, size=size,
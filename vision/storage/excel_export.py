@@ -18,6 +18,8 @@ any row count. Embedding real thumbnails with openpyxl is possible but
 bloats the file and slows Excel down noticeably past a few hundred
 rows, since every regenerate re-embeds every image — deliberately not
 the default; see EMBED_THUMBNAILS below if you want to turn it on.
+It embeds the cached 128 px previews from vision/storage/thumbnails.py,
+so nothing full-size is decoded for it.
 
 FILE-LOCK SAFETY
 -----------------
@@ -48,18 +50,20 @@ from __future__ import annotations
 import json
 import os
 import tempfile
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 try:
     import openpyxl
     from openpyxl.styles import Font
     from openpyxl.utils import get_column_letter
+    from openpyxl.drawing.image import Image as XLImage
     _OPENPYXL_AVAILABLE = True
 except ImportError:
     _OPENPYXL_AVAILABLE = False
 
-from vision.config import EXCEL_EXPORT_DIR, EXCEL_EXPORT_FILENAME
+from vision.config import EXCEL_EXPORT_DIR, EXCEL_EXPORT_FILENAME, THUMBNAIL_SIZES
 from vision.storage import attribute_schema, mongo_client, object_catalog
+from vision.storage.thumbnails import request_thumbnail
 
 # Off by default — see module docstring. Flip to True if you specifically
 # want a small thumbnail embedded per object (first/primary image only).
@@ -108,6 +112,30 @@ def _log_row(obj: dict, image_docs: list) -> list:
     )
 
 
+def _previews(paths: List[str], size: int) -> Dict[str, str]:
+    """{image path: its cached *size* px preview}, generated in parallel on
+    the thumbnail service's workers where missing (only new images cost
+    anything on a refresh). Images whose preview can't be made are left
+    out - callers fall back to the full image."""
+    futures = {p: request_thumbnail(p, size) for p in set(paths)}
+    previews = {}
+    for path, future in futures.items():
+        try:
+            previews[path] = future.result()
+        except Exception:
+            pass
+    return previews
+
+
+def _embed_thumbnail(ws, row_idx: int, column: int, preview_path: str) -> None:
+    try:
+        img = XLImage(preview_path)
+    except Exception:
+        return  # Pillow missing or unreadable preview - the link still works
+    ws.add_image(img, f"{get_column_letter(column)}{row_idx}")
+    ws.row_dimensions[row_idx].height = img.height * 0.75  # px -> points
+
+
 def _inventory_headers() -> List[str]:
     return ["Catalog ID", "Name", "Category", "Color", "Size",
             "First Seen", "Last Seen", "Times Seen", "Linked Object IDs"]
@@ -158,17 +186,21 @@ def build_report(session_id: str | None = None) -> str:
     for cell in log_ws[1]:
         cell.font = Font(bold=True)
 
-    for obj in objects:
-        image_docs = mongo_client.get_images_for_object(obj["_id"])
-        row_values = _log_row(obj, image_docs)
+    rows = [_log_row(obj, mongo_client.get_images_for_object(obj["_id"])) for obj in objects]
+    primary_paths = [row_values[-3] for row_values in rows if row_values[-3]]
+    embedded = _previews(primary_paths, min(THUMBNAIL_SIZES)) if EMBED_THUMBNAILS else {}
+
+    primary_col = len(_log_headers()) - 2  # "Primary Image" column index (1-based)
+    for row_values in rows:
         log_ws.append(row_values)
         row_idx = log_ws.max_row
-        primary_col = len(_log_headers()) - 2  # "Primary Image" column index (1-based)
         primary_path = row_values[-3]
         if primary_path:
             cell = log_ws.cell(row=row_idx, column=primary_col)
             cell.hyperlink = primary_path
             cell.style = "Hyperlink"
+        if primary_path in embedded:
+            _embed_thumbnail(log_ws, row_idx, len(_log_headers()) + 1, embedded[primary_path])
 
     _autosize_and_freeze(log_ws, len(_log_headers()))
 
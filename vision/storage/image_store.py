@@ -0,0 +1,441 @@
+"""
+[WIRED] Content-addressed image store: every distinct image's bytes are
+kept exactly once, under their SHA-256, however many places refer to
+them.
+
+WHY THIS EXISTS
+----------------
+Images are written to images/objects/<sample_id>/ (vision.camera.capture.
+save_image) and images/middleman/<sample_id>/ (vision.services.
+photo_transfer.save_photo_bundle_files), then copied again by
+vision.storage.package_export — on export into the package folder, and
+on import into images/imported/<object_id>/. So the same bytes piled up
+as separate files: a middleman bundle re-sent after a dropped ack, a
+package imported twice, a package exported on the same disk it was
+captured on, a frame grabbed twice from a camera that hadn't produced a
+new one yet.
+
+HOW
+----
+    images/store/ab/cd/abcd...ef.jpg      one blob per distinct content
+    images/store/index.sqlite             the index (below)
+
+The paths everything else already uses (and that Mongo stores) don't
+change: each one is a HARD LINK to its blob — same inode, no extra
+bytes on disk, and the file opens/copies/deletes like any other file.
+Writing bytes that are already stored just links the existing blob (no
+write at all), and importing a package stores each image once - the
+package's own files are copied in, never linked, since the app doesn't
+own them (and exported packages are plain copies for the same reason).
+Where hard links aren't possible (another drive, a FAT/exFAT volume,
+...) it falls back to a normal copy, so nothing ever fails for lack of
+link support — it just isn't deduplicated.
+
+A hard-linked path IS the blob, so rewriting one of those files in
+place would change the blob's bytes under its old hash. The index keeps
+each blob's and each path's size + mtime; anything whose stat no longer
+matches is re-hashed before it's trusted, and a blob that no longer
+matches its hash is dropped from the store (the files keep their new
+content, they just stop being deduplicated against it).
+
+The sqlite index maps:
+    blobs  - hash -> size, extension, reference count
+    paths  - every linked path -> its hash (so "what's the hash of this
+             file" never has to re-read the file)
+    refs   - hash <-> object_id / image_id, from record_capture(), so
+             "was this exact frame already stored, and for which
+             object?" is one indexed query: find(hash) / find_bytes(data)
+
+Reference counts come from refs (record_capture adds one per image,
+mongo_client.delete_object's caller releases an object's). A blob is
+only garbage once nothing refers to it AND no linked path still exists
+(link count 1 = just the store's own copy) — collect_garbage() runs
+after an object is deleted and once in the background at startup, so
+content whose image files have been removed is reclaimed.
+
+Only index updates hold the store's lock; hashing, writing blobs and
+linking happen outside it, so the ImageWritePool's workers store
+frames in parallel.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+IMAGE_STORE_ROOT = os.path.join("images", "store")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash       TEXT PRIMARY KEY,
+    size       INTEGER NOT NULL,
+    mtime_ns   INTEGER NOT NULL,
+    ext        TEXT NOT NULL,
+    refcount   INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS paths (
+    path     TEXT PRIMARY KEY,
+    hash     TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS paths_hash ON paths(hash);
+CREATE TABLE IF NOT EXISTS refs (
+    image_id  TEXT PRIMARY KEY,
+    object_id TEXT NOT NULL,
+    hash      TEXT NOT NULL,
+    path      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS refs_hash ON refs(hash);
+CREATE INDEX IF NOT EXISTS refs_object ON refs(object_id);
+"""
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _tmp_name(path: str) -> str:
+    return f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+
+
+def link_or_copy(src: str, dest: str) -> bool:
+    """Hard-link src to dest (replacing dest atomically if it exists),
+    falling back to a copy. Returns True if it linked."""
+    os.makedirs(os.path.dirname(os.path.abspath(dest)), exist_ok=True)
+    tmp = _tmp_name(dest)
+    try:
+        os.link(src, tmp)
+        linked = True
+    except OSError:
+        shutil.copy2(src, tmp)
+        linked = False
+    os.replace(tmp, dest)
+    return linked
+
+
+def _publish(tmp: str, blob: str) -> None:
+    """Move a fully written *tmp* into place as *blob* unless another
+    writer got there first (same hash = same bytes, either copy will do)."""
+    try:
+        os.link(tmp, blob)          # fails if blob exists - never swaps an inode others link to
+    except FileExistsError:
+        pass
+    except OSError:
+        os.replace(tmp, blob)       # no hard links on this volume
+        return
+    os.remove(tmp)
+
+
+class ImageStore:
+    """See the module docstring. Thread-safe; use the shared instance
+    from get_image_store()."""
+
+    def __init__(self, root: str = IMAGE_STORE_ROOT):
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.root, "index.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def blob_path(self, digest: str, ext: str = ".jpg") -> str:
+        """Sharded two levels deep (256 x 256 dirs) so no directory ever
+        holds more than a few entries per thousand images."""
+        return os.path.join(self.root, digest[:2], digest[2:4], digest + ext)
+
+    # ------------------------------------------------------------------
+    # Storing
+    # ------------------------------------------------------------------
+
+    def put_bytes(self, data: bytes, dest_path: str, ext: str = None) -> Tuple[str, bool]:
+        """
+        Store *data* and make *dest_path* a link to it. Returns (hash,
+        already_stored) - already_stored means nothing was written, the
+        existing blob was just linked.
+        """
+        ext = ext or os.path.splitext(dest_path)[1] or ".jpg"
+        digest = hash_bytes(data)
+        blob = self.blob_path(digest, ext)
+        for attempt in range(2):
+            existed = self._stored_intact(digest)
+            if not existed:
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                tmp = _tmp_name(blob)
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                _publish(tmp, blob)
+            try:
+                link_or_copy(blob, dest_path)
+                break
+            except FileNotFoundError:
+                if attempt:   # collected between the check and the link - store it again
+                    raise
+        self._index(digest, ext, blob, dest_path)
+        return digest, existed
+
+    def put_file(self, path: str) -> str:
+        """
+        Bring an existing file of ours (under images/) into the store. If
+        its content is already stored, the file is replaced by a link to
+        the blob - reclaiming its space; otherwise the blob becomes a link
+        to it. Returns its hash.
+        """
+        path = os.path.abspath(path)
+        known = self.hash_for_path(path, ingest=False)
+        if known is not None:
+            return known
+        digest = hash_file(path)
+        ext = os.path.splitext(path)[1] or ".jpg"
+        blob = self.blob_path(digest, ext)
+        if self._stored_intact(digest):
+            if not os.path.samefile(blob, path):
+                link_or_copy(blob, path)
+        else:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            tmp = _tmp_name(blob)
+            link_or_copy(path, tmp)
+            _publish(tmp, blob)
+        self._index(digest, ext, blob, path)
+        return digest
+
+    def link(self, digest: str, dest_path: str) -> bool:
+        """Materialise stored content *digest* at *dest_path* (hard link,
+        or copy if that's impossible). Returns True if it linked. Raises
+        KeyError if the content isn't (intact) in the store."""
+        if not self._stored_intact(digest):
+            raise KeyError(f"No stored image with hash {digest}")
+        with self._lock:
+            ext = self._db.execute("SELECT ext FROM blobs WHERE hash = ?", (digest,)).fetchone()[0]
+        blob = self.blob_path(digest, ext)
+        linked = link_or_copy(blob, dest_path)
+        self._index(digest, ext, blob, dest_path)
+        return linked
+
+    def copy_in(self, src: str, dest_path: str) -> str:
+        """What shutil.copy2(src, dest_path) was used for: src's content is
+        stored (once) and dest_path linked to it. Returns the hash."""
+        digest = self.put_file(src) if self._is_ours(src) else self._ingest_foreign(src)
+        self.link(digest, dest_path)
+        return digest
+
+    def _ingest_foreign(self, src: str) -> str:
+        # A file we don't own (e.g. inside a package folder being
+        # imported): its content is COPIED in - linking would let the
+        # package's owner rewrite a blob under its hash.
+        digest = hash_file(src)
+        ext = os.path.splitext(src)[1] or ".jpg"
+        blob = self.blob_path(digest, ext)
+        if not self._stored_intact(digest):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            tmp = _tmp_name(blob)
+            shutil.copy2(src, tmp)
+            if hash_file(tmp) != digest:
+                os.remove(tmp)
+                raise IOError(f"{src} changed while it was being imported")
+            _publish(tmp, blob)
+            self._index(digest, ext, blob)
+        return digest
+
+    @staticmethod
+    def _is_ours(path: str) -> bool:
+        """Files under this app's images/ folder are ours to relink."""
+        images_root = os.path.abspath("images")
+        return os.path.abspath(path).startswith(images_root + os.sep)
+
+    # ------------------------------------------------------------------
+    # References
+    # ------------------------------------------------------------------
+
+    def add_reference(self, path: str, object_id: str, image_id: str) -> str:
+        """Record that image_id of object_id is the content at *path*
+        (ingesting the file if it isn't stored yet). Returns the hash."""
+        digest = self.hash_for_path(path)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO refs (image_id, object_id, hash, path) VALUES (?, ?, ?, ?)",
+                             (image_id, object_id, digest, os.path.abspath(path)))
+            self._recount(digest)
+            self._db.commit()
+        return digest
+
+    def release_object(self, object_id: str) -> int:
+        """Drop every reference held by object_id (e.g. after
+        mongo_client.delete_object). Files are left alone. Returns how
+        many references were dropped."""
+        with self._lock:
+            hashes = [r[0] for r in self._db.execute("SELECT hash FROM refs WHERE object_id = ?", (object_id,))]
+            self._db.execute("DELETE FROM refs WHERE object_id = ?", (object_id,))
+            for digest in set(hashes):
+                self._recount(digest)
+            self._db.commit()
+        return len(hashes)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def hash_for_path(self, path: str, ingest: bool = True) -> Optional[str]:
+        """Hash of the content at *path*: from the index if the path was
+        stored through here and hasn't changed since, else (ingest=True)
+        by storing it now."""
+        path = os.path.abspath(path)
+        with self._lock:
+            row = self._db.execute("SELECT hash, size, mtime_ns FROM paths WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            try:
+                st = os.stat(path)
+                if (st.st_size, st.st_mtime_ns) == (row[1], row[2]):
+                    return row[0]
+            except FileNotFoundError:
+                pass
+            with self._lock:
+                self._db.execute("DELETE FROM paths WHERE path = ?", (path,))
+                self._db.commit()
+        if not ingest or not os.path.exists(path):
+            return None
+        return self.put_file(path)
+
+    def contains(self, digest: str) -> bool:
+        return self._stored_intact(digest)
+
+    def find(self, digest: str) -> List[dict]:
+        """Every recorded image with this content: [{object_id, image_id, path}]."""
+        with self._lock:
+            rows = self._db.execute("SELECT object_id, image_id, path FROM refs WHERE hash = ?",
+                                    (digest,)).fetchall()
+        return [{"object_id": o, "image_id": i, "path": p} for o, i, p in rows]
+
+    def find_bytes(self, data: bytes) -> List[dict]:
+        """find() for raw encoded bytes - "was this exact frame already stored?"."""
+        return self.find(hash_bytes(data))
+
+    def stats(self) -> dict:
+        with self._lock:
+            blobs, stored = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            paths = self._db.execute("SELECT COUNT(*) FROM paths").fetchone()[0]
+            logical = self._db.execute(
+                "SELECT COALESCE(SUM(b.size), 0) FROM paths p JOIN blobs b ON b.hash = p.hash").fetchone()[0]
+        return {"blobs": blobs, "paths": paths, "stored_bytes": stored,
+                "logical_bytes": logical, "saved_bytes": max(0, logical - stored)}
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def collect_garbage(self) -> int:
+        """Delete blobs nothing refers to and no linked path still uses
+        (the store's copy is the only link left). Returns how many."""
+        removed = 0
+        with self._lock:
+            rows = self._db.execute("SELECT hash, ext FROM blobs WHERE refcount = 0").fetchall()
+            for digest, ext in rows:
+                blob = self.blob_path(digest, ext)
+                try:
+                    if os.stat(blob).st_nlink > 1:
+                        continue
+                    live = [p for (p,) in self._db.execute("SELECT path FROM paths WHERE hash = ?", (digest,))
+                            if os.path.exists(p) and not os.path.samefile(p, blob)]
+                    if live:
+                        continue   # a copied (not linked) path still has it
+                    os.remove(blob)
+                except FileNotFoundError:
+                    pass
+                self._db.execute("DELETE FROM blobs WHERE hash = ?", (digest,))
+                self._db.execute("DELETE FROM paths WHERE hash = ?", (digest,))
+                removed += 1
+            self._db.commit()
+        return removed
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _stored_intact(self, digest: str) -> bool:
+        """True if *digest* is indexed and its blob still holds exactly
+        that content. A blob whose size/mtime moved (one of its linked
+        paths was rewritten in place) is re-hashed; if it no longer
+        matches, it's dropped from the store so the content is written
+        afresh."""
+        with self._lock:
+            row = self._db.execute("SELECT ext, size, mtime_ns FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            return False
+        ext, size, mtime_ns = row
+        blob = self.blob_path(digest, ext)
+        try:
+            st = os.stat(blob)
+        except FileNotFoundError:
+            self._forget_blob(digest)
+            return False
+        if (st.st_size, st.st_mtime_ns) == (size, mtime_ns):
+            return True
+        if hash_file(blob) == digest:   # touched, not changed
+            with self._lock:
+                self._db.execute("UPDATE blobs SET size = ?, mtime_ns = ? WHERE hash = ?",
+                                 (st.st_size, st.st_mtime_ns, digest))
+                self._db.commit()
+            return True
+        print(f"[IMAGE STORE] {blob} no longer matches its hash (a linked file was "
+              f"modified in place); dropping it from the store.")
+        try:
+            os.remove(blob)   # the linked paths keep the modified content
+        except FileNotFoundError:
+            pass
+        self._forget_blob(digest)
+        return False
+
+    def _forget_blob(self, digest: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM blobs WHERE hash = ?", (digest,))
+            self._db.execute("DELETE FROM paths WHERE hash = ?", (digest,))
+            self._db.commit()
+
+    def _index(self, digest: str, ext: str, blob: str, path: str = None) -> None:
+        """Record the blob (and *path* linked to it) - the only part of a
+        store operation done under the lock."""
+        blob_st = os.stat(blob)
+        path_st = os.stat(path) if path is not None else None
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO blobs (hash, size, mtime_ns, ext, refcount, created_at) "
+                "VALUES (?, ?, ?, ?, (SELECT COUNT(*) FROM refs WHERE hash = ?), ?) "
+                "ON CONFLICT(hash) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns",
+                (digest, blob_st.st_size, blob_st.st_mtime_ns, ext, digest, time.time()))
+            if path is not None:
+                self._db.execute("INSERT OR REPLACE INTO paths (path, hash, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                                 (os.path.abspath(path), digest, path_st.st_size, path_st.st_mtime_ns))
+            self._db.commit()
+
+    def _recount(self, digest: str) -> None:
+        # caller holds _lock
+        self._db.execute("UPDATE blobs SET refcount = (SELECT COUNT(*) FROM refs WHERE hash = ?) WHERE hash = ?",
+                         (digest, digest))
+
+
+_store = None
+_store_guard = threading.Lock()
+
+
+def get_image_store() -> ImageStore:
+    """The shared ImageStore under IMAGE_STORE_ROOT, opened on first use."""
+    global _store
+    with _store_guard:
+        if _store is None:
+            _store = ImageStore()
+        return _store
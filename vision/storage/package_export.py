@@ -54,8 +54,10 @@ import uuid
 from datetime import datetime
 from typing import List, Tuple
 
+from vision.config import IMAGE_STORE_ENABLED
 from vision.storage import attribute_schema, mongo_client, session_manager
 from vision.storage.capture_pipeline import record_capture
+from vision.storage.image_store import get_image_store
 
 IMPORTED_IMAGES_ROOT = os.path.join("images", "imported")
 
@@ -72,6 +74,15 @@ class PackageExportError(Exception):
     error message rather than crashing the GUI."""
 
 
+def _import_image(src: str, dest: str) -> None:
+    """Stored by content, so importing the same package (or an image
+    this machine already has) again costs no disk."""
+    if IMAGE_STORE_ENABLED:
+        get_image_store().copy_in(src, dest)
+    else:
+        shutil.copy2(src, dest)
+
+
 def export_package(dest_dir: str, session_id: str = None, all_history: bool = False) -> Tuple[str, int, List[str]]:
     """
     Writes dest_dir/images/<object_id>/<file>.jpg for every matching
@@ -190,7 +201,7 @@ def import_package(package_dir: str) -> Tuple[int, int, List[str]]:
                     continue
                 filename = os.path.basename(src)
                 dest_path = os.path.abspath(os.path.join(dest_dir, filename))
-                shutil.copy2(src, dest_path)
+                _import_image(src, dest_path)
                 # Source camera name isn't in the CSV as its own column
                 # (only bundled into primary_image/all_images), so it's
                 # recovered from the filename's own
@@ -0,0 +1,187 @@
+"""
+[WIRED] Cached preview pyramid (128 / 512 px) for every stored image.
+
+WHY THIS EXISTS
+----------------
+The object viewer (main.show_object_detail, also reached from the
+Inventory tab's open_catalog_detail_viewer) decoded every full
+1280x720 JPEG of an object - on the Tk thread - just to shrink it to
+a preview, and did it again every time the viewer opened. An object
+with a few dozen rotation views froze the GUI for seconds.
+
+HOW
+----
+Previews are generated once, on demand, and kept under images/thumbs/:
+
+    images/thumbs/<size>/<aa>/<key>.jpg
+
+  - <size> is one of THUMBNAIL_SIZES - the longest side in px, aspect
+    ratio kept, never upscaled.
+  - <key> is the image's content hash when the image store
+    (vision/storage/image_store.py) already knows the path - so identical
+    images share one preview and a preview can never go stale - and
+    otherwise a hash of the absolute path + mtime + size, so an image
+    rewritten in place simply gets a new preview.
+
+Generation is lazy and runs on a small worker pool: request() returns a
+Future straight away (an already-cached preview resolves immediately,
+and two requests for the same preview share one job). The decode uses
+OpenCV's reduced-resolution JPEG decoding (IMREAD_REDUCED_COLOR_2/4/8),
+which skips most of the full-size decode work for the small sizes.
+The previews are a disposable cache - nothing links to them except
+through cached_path()/request(), and deleting images/thumbs/ is safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Tuple
+
+try:
+    import cv2
+    _CV2_AVAILABLE = True
+except ImportError:
+    _CV2_AVAILABLE = False
+
+from vision.config import (
+    IMAGE_STORE_ENABLED,
+    THUMBNAIL_JPEG_QUALITY,
+    THUMBNAIL_WORKERS,
+)
+from vision.storage.image_store import get_image_store
+
+THUMBNAIL_ROOT = os.path.join("images", "thumbs")
+
+
+def _require_cv2():
+    if not _CV2_AVAILABLE:
+        raise ImportError("opencv-python is not installed. Run: pip install opencv-python")
+
+
+def _cache_key(path: str) -> str:
+    if IMAGE_STORE_ENABLED:
+        try:
+            digest = get_image_store().hash_for_path(path, ingest=False)
+        except Exception:
+            digest = None
+        if digest is not None:
+            return digest
+    st = os.stat(path)
+    return hashlib.sha1(f"{path}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8")).hexdigest()
+
+
+def cached_path(path: str, size: int) -> str:
+    """Where the *size* px preview of *path* lives (whether or not it has
+    been generated yet). Raises OSError if *path* doesn't exist."""
+    key = _cache_key(os.path.abspath(path))
+    return os.path.abspath(os.path.join(THUMBNAIL_ROOT, str(size), key[:2], key + ".jpg"))
+
+
+def _decode_for(path: str, size: int):
+    """Decode *path* at the largest power-of-two reduction whose longer
+    side still covers *size* (probed from a cheap 1/8 decode)."""
+    probe = cv2.imread(path, cv2.IMREAD_REDUCED_COLOR_8)
+    if probe is None:
+        raise IOError(f"Could not read image {path}")
+    longest = max(probe.shape[:2]) * 8
+    if longest // 8 >= size:
+        return probe
+    for factor, flag in ((4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2),
+                         (1, cv2.IMREAD_COLOR)):
+        if factor == 1 or longest // factor >= size:
+            img = cv2.imread(path, flag)
+            if img is None:
+                raise IOError(f"Could not read image {path}")
+            return img
+
+
+def generate(path: str, size: int, dest: str = None) -> str:
+    """Write the *size* px preview of *path* (to *dest*, default its
+    cache path) and return where it went. Always regenerates."""
+    _require_cv2()
+    path = os.path.abspath(path)
+    dest = dest or cached_path(path, size)
+    img = _decode_for(path, size)
+    h, w = img.shape[:2]
+    scale = size / float(max(h, w))
+    if scale < 1.0:
+        img = cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))),
+                         interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_JPEG_QUALITY])
+    if not ok:
+        raise IOError(f"Failed to encode preview of {path}")
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp = f"{dest}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(encoded.tobytes())
+    os.replace(tmp, dest)
+    return dest
+
+
+class ThumbnailService:
+    """Lazily generates previews on a worker pool - see the module
+    docstring. Use the shared instance from thumbnail_service()."""
+
+    def __init__(self, workers: int = THUMBNAIL_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, int], Future] = {}
+
+    def request(self, path: str, size: int) -> Future:
+        """Future for the preview's path. Already-cached previews resolve
+        immediately; concurrent requests for one preview share a job."""
+        future: Future = Future()
+        try:
+            dest = cached_path(path, size)
+        except OSError as e:
+            future.set_exception(e)
+            return future
+        if os.path.exists(dest):
+            future.set_result(dest)
+            return future
+        key = (dest, size)
+        with self._lock:
+            running = self._inflight.get(key)
+            if running is not None:
+                return running
+            future = self._pool.submit(generate, path, size, dest)
+            self._inflight[key] = future
+        future.add_done_callback(lambda _f: self._forget(key))
+        return future
+
+    def _forget(self, key) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_service = None
+_service_guard = threading.Lock()
+
+
+def thumbnail_service() -> ThumbnailService:
+    global _service
+    with _service_guard:
+        if _service is None:
+            _service = ThumbnailService()
+        return _service
+
+
+def close_thumbnail_service() -> None:
+    """Drop queued preview jobs and stop the workers. Call on app shutdown."""
+    global _service
+    with _service_guard:
+        service, _service = _service, None
+    if service is not None:
+        service.close()
+
+
+def request_thumbnail(path: str, size: int) -> Future:
+    """thumbnail_service().request(path, size)."""
+    return thumbnail_service().request(path, size)